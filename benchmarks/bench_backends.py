@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare the wnck and xcb geometry backends on a virtual X server
+
+Maps test windows, then reads their decorations and size hints and sends
+each a new geometry through both backends, timing the reads and the
+configures separately and counting X round trips.
+
+Requires Xvfb, xrandr, a window manager (xfwm4 by default) and xcffib.
+
+Usage:
+    python benchmarks/bench_backends.py [--windows 200] [--wm xfwm4] [--display :99]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xvfb_hotplug import MONITOR_HEIGHT, MONITOR_WIDTH, create_windows, pump_events, start_server
+
+
+def parse_benchmark_arguments():
+    parser = argparse.ArgumentParser(description='Compare the wnck and xcb geometry backends')
+    parser.add_argument('--windows', type=int, default=200, help='Number of test windows')
+    parser.add_argument('--wm', default='xfwm4', help='Window manager command')
+    parser.add_argument('--display', default=':99', help='Display of the virtual X server')
+    return parser.parse_args()
+
+
+def targets(windows, shift):
+    """Tile the windows in a grid over the left monitor, moved by shift pixels per run"""
+    columns = 10
+    width = MONITOR_WIDTH // columns
+    height = max(50, MONITOR_HEIGHT // (len(windows) // columns + 1))
+    return [(window, ((index % columns) * width + shift, (index // columns) * height % MONITOR_HEIGHT,
+                      width - 20, height, 0))
+            for index, window in enumerate(windows)]
+
+
+def run(name, windows, shift):
+    """Read properties and configure all windows with the selected backend"""
+    from src.batch import GeometryBatch
+    from src.metrics import metrics
+    from src.window_manager import GeometryCorrector
+    
+    for window in windows:
+        GeometryCorrector.frame_extents.invalidate(window.get_xid())
+        GeometryCorrector.size_hints.invalidate(window.get_xid())
+    metrics.reset()
+    GeometryBatch.use_backend(name)
+    
+    start = time.perf_counter()
+    if GeometryBatch.backend is not None:
+        GeometryCorrector.prime_caches(windows, GeometryBatch.backend)
+    for window in windows:
+        GeometryCorrector.frame_extents.get(window.get_xid())
+        GeometryCorrector.size_hints.get(window.get_xid())
+    read = time.perf_counter()
+    
+    batch = GeometryBatch()
+    for window, target in targets(windows, shift):
+        batch.add(window, target)
+    sent = batch.flush()
+    done = time.perf_counter()
+    
+    print(f"{name:5} reads {(read - start) * 1000:8.1f} ms   configures {(done - read) * 1000:8.1f} ms "
+          f"({sent} windows, {metrics.get('x.round_trips')} round trips)")
+
+
+def main():
+    options = parse_benchmark_arguments()
+    for tool in ('Xvfb', 'xrandr', options.wm.split()[0]):
+        if shutil.which(tool) is None:
+            print(f"Error: {tool} not found")
+            return 1
+    
+    from src.xcb_backend import xcb_available
+    if not xcb_available():
+        print("Error: xcffib not installed")
+        return 1
+    
+    server, manager = start_server(options.display, options.wm)
+    try:
+        import gi
+        gi.require_version("Wnck", "3.0")
+        from gi.repository import Wnck
+        
+        from src.x_connection import XConnection
+        
+        created = create_windows(XConnection.shared(), options.windows)
+        pump_events(1)
+        wnck_screen = Wnck.Screen.get_default()
+        wnck_screen.force_update()
+        windows = [Wnck.Window.get(window.id) for window in created]
+        windows = [window for window in windows if window is not None]
+        
+        for shift, name in enumerate(['wnck', 'xcb', 'wnck', 'xcb']):
+            run(name, windows, shift * 10)
+            pump_events(0.5)
+        return 0
+    finally:
+        manager.terminate()
+        server.terminate()
+        manager.wait()
+        server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
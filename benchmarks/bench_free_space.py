@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark the largest free rectangle search against a brute force over all edge combinations
+
+Usage:
+    python benchmarks/bench_free_space.py
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.free_space import largest_free_rectangle
+
+
+AREA = (0, 0, 2560, 1400)
+
+
+def brute_force_area(area, obstacles):
+    """Reference implementation checking every rectangle spanned by obstacle edges"""
+    left, top, right, bottom = area[0], area[1], area[0] + area[2], area[1] + area[3]
+    xs = sorted({left, right} | {min(max(edge, left), right)
+                                 for x, y, w, h in obstacles for edge in (x, x + w)})
+    ys = sorted({top, bottom} | {min(max(edge, top), bottom)
+                                 for x, y, w, h in obstacles for edge in (y, y + h)})
+    best = 0
+    for x1, x2 in itertools.combinations(xs, 2):
+        for y1, y2 in itertools.combinations(ys, 2):
+            size = (x2 - x1) * (y2 - y1)
+            if size <= best:
+                continue
+            if all(not (x < x2 and x + w > x1 and y < y2 and y + h > y1) for x, y, w, h in obstacles):
+                best = size
+    return best
+
+
+def random_windows(count, area=AREA):
+    """Windows of typical sizes, getting smaller as there are more of them"""
+    scale = max(1, count ** 0.5 / 3)
+    windows = []
+    for _ in range(count):
+        w = int(random.randint(200, 1200) / scale) + 1
+        h = int(random.randint(150, 900) / scale) + 1
+        windows.append((random.randint(area[0], area[2] - w), random.randint(area[1], area[3] - h), w, h))
+    return windows
+
+
+def main():
+    random.seed(42)
+    
+    # correctness against the brute force on small inputs
+    for _ in range(200):
+        obstacles = random_windows(random.randint(0, 8))
+        result = largest_free_rectangle(AREA, obstacles)
+        assert (result[2] * result[3] if result else 0) == brute_force_area(AREA, obstacles)
+    
+    runs = 20
+    print(f"{'windows':>8} {'search ms':>10} {'free area %':>12}")
+    for count in (10, 50, 100, 500, 1000):
+        layouts = [random_windows(count) for _ in range(runs)]
+        anchors = [random.choice(layout) for layout in layouts]
+        
+        start = time.perf_counter()
+        results = [largest_free_rectangle(AREA, layout, anchor) for layout, anchor in zip(layouts, anchors)]
+        elapsed = (time.perf_counter() - start) / runs
+        
+        sizes = [result[2] * result[3] if result else 0 for result in results]
+        share = 100 * sum(sizes) / runs / (AREA[2] * AREA[3])
+        print(f"{count:>8} {elapsed * 1e3:>10.2f} {share:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory and lookups of the geometry model against the former dictionaries
+
+Measures the memory of many tile records (WindowRecord vs dict), of screens
+(Screen vs dict) and the time of find_window_screen() over a screen list.
+
+Usage:
+    python benchmarks/bench_geometry_model.py
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.geometry import Screen, WindowRecord
+from src.screen_detection import find_window_screen
+
+
+def dict_find_window_screen(window_x, window_y, window_width, window_height, screens):
+    """Reference implementation on screen dictionaries, as before the geometry model"""
+    best_match = screens[0]
+    best_percentage = -1000
+    for screen in screens:
+        monitor_x = screen.get('monitor_x', screen['x'])
+        monitor_y = screen.get('monitor_y', screen['y'])
+        monitor_width = screen.get('monitor_width', screen['width'])
+        monitor_height = screen.get('monitor_height', screen['height'])
+        if (window_x > monitor_x + monitor_width or window_x + window_width < monitor_x or
+                window_y > monitor_y + monitor_height or window_y + window_height < monitor_y):
+            continue
+        x1 = max(window_x, monitor_x)
+        y1 = max(window_y, monitor_y)
+        x2 = min(window_x + window_width, monitor_x + monitor_width)
+        y2 = min(window_y + window_height, monitor_y + monitor_height)
+        percentage_on_screen = (x2 - x1) * (y2 - y1) * 100 / (window_width * window_height)
+        if best_percentage < percentage_on_screen:
+            best_percentage = percentage_on_screen
+            best_match = screen
+    return best_match
+
+
+def measure_memory(build):
+    """Bytes allocated by build() that are still referenced afterwards"""
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def tile_dicts(count):
+    return {xid: {'position': 'ne', 'factor': 2.0, 'screen': 'screen-1', 'horizontal_only': False,
+                  'vertical_only': False, 'frame': (xid % 2000, xid % 1000, 640, 480)}
+            for xid in range(count)}
+
+
+def tile_records(count):
+    return {xid: WindowRecord('ne', 2.0, 'screen-1', False, False, (xid % 2000, xid % 1000, 640, 480))
+            for xid in range(count)}
+
+
+def screen_grid(count):
+    """Screens in rows of four 1920x1080 monitors with a 32 px panel"""
+    return [Screen.create(f"screen-{index + 1}",
+                          ((index % 4) * 1920, (index // 4) * 1080 + 32, 1920, 1048),
+                          ((index % 4) * 1920, (index // 4) * 1080, 1920, 1080))
+            for index in range(count)]
+
+
+def main():
+    random.seed(42)
+    print(f"{'tiles':>8} {'dict KiB':>10} {'record KiB':>11} {'saved':>6}")
+    for count in (1000, 10000, 50000):
+        as_dicts = measure_memory(lambda: tile_dicts(count))
+        as_records = measure_memory(lambda: tile_records(count))
+        print(f"{count:>8} {as_dicts / 1024:>10.0f} {as_records / 1024:>11.0f} "
+              f"{100 * (1 - as_records / as_dicts):>5.0f}%")
+    
+    screens = screen_grid(16)
+    screen_dicts = [dict(screen._asdict()) for screen in screens]
+    print(f"\n16 screens: dict {measure_memory(lambda: [dict(s) for s in screen_dicts])} bytes, "
+          f"Screen {measure_memory(lambda: [Screen(*s) for s in screens])} bytes")
+    
+    windows = [(random.randint(0, 7000), random.randint(0, 4000), random.randint(200, 1200), random.randint(150, 900))
+               for _ in range(20000)]
+    print(f"\n{'screens':>8} {'dict us/lookup':>15} {'Screen us/lookup':>17}")
+    for count in (2, 4, 16):
+        screens = screen_grid(count)
+        screen_dicts = [dict(screen._asdict()) for screen in screens]
+        
+        start = time.perf_counter()
+        for window in windows:
+            dict_find_window_screen(*window, screen_dicts)
+        as_dicts = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for window in windows:
+            find_window_screen(*window, screens)
+        as_screens = time.perf_counter() - start
+        
+        print(f"{count:>8} {as_dicts * 1e6 / len(windows):>15.2f} {as_screens * 1e6 / len(windows):>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark placement rule lookups of RuleSet against a linear scan
+
+Also checks that both agree, including duplicate and overlapping rules.
+
+Usage:
+    python benchmarks/bench_rules.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rules import RuleSet, parse_rule_line
+
+
+CLASSES = ['xterm', 'firefox', 'code', 'thunderbird', 'gimp', 'mpv', 'slack', 'signal']
+ROLES = ['', 'browser', 'compose', 'dialog', 'toolbox']
+TITLES = ['', 'inbox - mail', 'untitled', 'x.y', 'main.py - code', 'mozilla firefox', 'a b']
+
+
+def linear_match(rules, properties):
+    """Reference implementation checking every rule in file order"""
+    for rule in rules:
+        if rule.matches(properties):
+            return rule
+    return None
+
+
+def random_rule_line(index):
+    """Rule line with one to three random exact or regex conditions"""
+    conditions = []
+    for key in random.sample(['class', 'role', 'title'], random.randint(1, 3)):
+        values = {'class': CLASSES, 'role': ROLES[1:], 'title': TITLES[1:]}[key]
+        value = random.choice(values)
+        if random.random() < 0.4:
+            value = f"/{value[:random.randint(1, len(value))]}/"
+        conditions.append(f"{key}='{value}'")
+    return f"{' '.join(conditions)} -> -p {random.choice('nesw')}"
+
+
+def random_properties():
+    return {'class': random.choice(CLASSES + ['unknown']), 'role': random.choice(ROLES),
+            'title': random.choice(TITLES)}
+
+
+def check_agreement():
+    """Duplicate and overlapping rules resolve to the first rule of the file"""
+    lines = ['class=xterm -> -p sw', 'class=xterm -> -p e',
+             'class=/term/ -> -p n', 'title=/mail/ -> -p s', 'class=thunderbird title=/mail/ -> -p w',
+             'class=/fire/ role=browser -> -p ne', 'class=firefox role=browser -> -p nw']
+    rules = [parse_rule_line(line, index) for index, line in enumerate(lines)]
+    rule_set = RuleSet(rules)
+    assert rule_set.match({'class': 'xterm', 'role': '', 'title': ''}) is rules[0]
+    assert rule_set.match({'class': 'thunderbird', 'role': '', 'title': 'inbox - mail'}) is rules[3]
+    assert rule_set.match({'class': 'firefox', 'role': 'browser', 'title': ''}) is rules[5]
+    
+    # an inline flag cannot be combined, the fallbacks are scanned in order instead
+    rules.append(parse_rule_line("title='/(?i)untitled/' -> -p e", len(rules)))
+    rule_set = RuleSet(rules)
+    assert rule_set.matcher is None
+    assert rule_set.match({'class': 'xterm', 'role': '', 'title': 'untitled'}) is rules[0]
+    assert rule_set.match({'class': 'gimp', 'role': '', 'title': 'untitled'}) is rules[-1]
+    
+    for _ in range(200):
+        rules = [parse_rule_line(random_rule_line(index), index) for index in range(random.randint(1, 30))]
+        rules += [parse_rule_line(random_rule_line(len(rules)), len(rules))]
+        rules += [parse_rule_line(lines[0], len(rules)), parse_rule_line(lines[0], len(rules) + 1)]
+        rule_set = RuleSet(rules)
+        for _ in range(50):
+            properties = random_properties()
+            assert rule_set.match(properties) is linear_match(rules, properties), properties
+
+
+def main():
+    random.seed(42)
+    check_agreement()
+    
+    queries = 5000
+    print(f"{'rules':>8} {'set us/match':>13} {'scan us/match':>14}")
+    for count in (10, 100, 500, 1000):
+        rules = [parse_rule_line(random_rule_line(index), index) for index in range(count)]
+        rule_set = RuleSet(rules)
+        windows = [random_properties() for _ in range(queries)]
+        
+        start = time.perf_counter()
+        for properties in windows:
+            rule_set.match(properties)
+        set_time = (time.perf_counter() - start) / queries
+        
+        start = time.perf_counter()
+        for properties in windows:
+            linear_match(rules, properties)
+        scan_time = (time.perf_counter() - start) / queries
+        
+        for properties in windows[:200]:
+            assert rule_set.match(properties) is linear_match(rules, properties)
+        
+        print(f"{count:>8} {set_time * 1e6:>13.2f} {scan_time * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
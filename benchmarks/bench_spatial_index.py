@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark directional queries of the spatial window index against a linear scan
+
+Usage:
+    python benchmarks/bench_spatial_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.spatial_index import SpatialIndex, DIRECTIONS, PINNED
+
+
+def linear_nearest(rects, xid, direction, workspaces=None, workspace=0):
+    """Reference implementation scanning every window (of the workspace and pinned ones)"""
+    source = rects[xid]
+    center_x = source[0] + source[2] / 2
+    center_y = source[1] + source[3] / 2
+    step_x, step_y = DIRECTIONS[direction]
+    best, best_score = None, float('inf')
+    for candidate, rect in rects.items():
+        if candidate == xid or (workspaces is not None and workspaces[candidate] not in (workspace, PINNED)):
+            continue
+        delta_x = rect[0] + rect[2] / 2 - center_x
+        delta_y = rect[1] + rect[3] / 2 - center_y
+        distance = delta_x * step_x + delta_y * step_y
+        if distance <= 0:
+            continue
+        score = distance + 2 * abs(delta_y if step_x else delta_x)
+        if score < best_score or (score == best_score and candidate < best):
+            best, best_score = candidate, score
+    return best
+
+
+def random_rects(count, width=7680, height=2160):
+    rects = {}
+    for xid in range(count):
+        w = random.randint(200, 1200)
+        h = random.randint(150, 900)
+        rects[xid] = (random.randint(0, width - w), random.randint(0, height - h), w, h)
+    return rects
+
+
+def main():
+    random.seed(42)
+    queries = 2000
+    print(f"{'windows':>8} {'index us/query':>15} {'scan us/query':>14} {'update us':>10}")
+    for count in (10, 100, 500, 1000, 5000):
+        rects = random_rects(count)
+        index = SpatialIndex()
+        for xid, rect in rects.items():
+            index.update(xid, rect, 0)
+        
+        sources = [random.randrange(count) for _ in range(queries)]
+        directions = [random.choice('wens') for _ in range(queries)]
+        
+        start = time.perf_counter()
+        for xid, direction in zip(sources, directions):
+            index.nearest(xid, direction)
+        index_time = (time.perf_counter() - start) / queries
+        
+        start = time.perf_counter()
+        for xid, direction in zip(sources, directions):
+            linear_nearest(rects, xid, direction)
+        scan_time = (time.perf_counter() - start) / queries
+        
+        moved = random_rects(count)
+        start = time.perf_counter()
+        for xid, rect in moved.items():
+            index.update(xid, rect, 0)
+        update_time = (time.perf_counter() - start) / count
+        
+        for xid, direction in zip(sources[:100], directions[:100]):
+            assert index.nearest(xid, direction) == linear_nearest(moved, xid, direction)
+        
+        print(f"{count:>8} {index_time * 1e6:>15.1f} {scan_time * 1e6:>14.1f} {update_time * 1e6:>10.1f}")
+    
+    check_pinned()
+
+
+def check_pinned():
+    """Pinned windows and windows of other workspaces, sources anywhere"""
+    for _ in range(400):
+        rects = random_rects(random.randint(2, 60))
+        workspaces = {xid: random.choice((0, 0, 1, PINNED)) for xid in rects}
+        index = SpatialIndex()
+        for xid, rect in rects.items():
+            index.update(xid, rect, workspaces[xid])
+        for _ in range(40):
+            xid = random.choice(list(rects))
+            direction = random.choice('wens')
+            assert index.nearest(xid, direction, 0) == linear_nearest(rects, xid, direction, workspaces, 0)
+    print("pinned and multi-workspace queries agree with the linear scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Measure re-tiling after a monitor is unplugged, on a virtual X server
+
+Starts Xvfb with two RandR monitors and a window manager, tiles a number of
+test windows, removes the right monitor and times XFCETilingApp.retile_all()
+until every window has its new geometry.
+
+Requires Xvfb, xrandr and a window manager (xfwm4 by default).
+
+Usage:
+    python benchmarks/xvfb_hotplug.py [--windows 50] [--wm xfwm4] [--display :99]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+MONITOR_WIDTH = 1920
+MONITOR_HEIGHT = 1080
+
+# Positions cycled through by the test windows
+POSITIONS = ['n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', 'center']
+
+
+def parse_harness_arguments():
+    parser = argparse.ArgumentParser(description='Time re-tiling after a monitor is unplugged')
+    parser.add_argument('--windows', type=int, default=50, help='Number of test windows')
+    parser.add_argument('--wm', default='xfwm4', help='Window manager command')
+    parser.add_argument('--display', default=':99', help='Display of the virtual X server')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds to wait for the new geometries')
+    return parser.parse_args()
+
+
+def run_xrandr(*args):
+    subprocess.run(['xrandr'] + list(args), check=True)
+
+
+def start_server(display_name, wm):
+    """Start Xvfb with two side by side monitors and a window manager"""
+    server = subprocess.Popen([
+        'Xvfb', display_name, '-screen', '0', f'{2 * MONITOR_WIDTH}x{MONITOR_HEIGHT}x24', '+extension', 'RANDR'
+    ])
+    os.environ['DISPLAY'] = display_name
+    time.sleep(1)
+    
+    run_xrandr('--setmonitor', 'left', f'{MONITOR_WIDTH}/508x{MONITOR_HEIGHT}/286+0+0', 'none')
+    run_xrandr('--setmonitor', 'right', f'{MONITOR_WIDTH}/508x{MONITOR_HEIGHT}/286+{MONITOR_WIDTH}+0', 'none')
+    
+    manager = subprocess.Popen(wm.split())
+    time.sleep(2)
+    return server, manager
+
+
+def create_windows(connection, count):
+    """Map plain X windows spread over both monitors"""
+    from Xlib import X
+    
+    screen = connection.display.screen()
+    windows = []
+    for index in range(count):
+        window = screen.root.create_window(
+            (index * 37) % (2 * MONITOR_WIDTH - 400), (index * 23) % (MONITOR_HEIGHT - 300), 400, 300, 0,
+            screen.root_depth, X.InputOutput, X.CopyFromParent,
+            background_pixel=screen.white_pixel
+        )
+        window.set_wm_class(f'hotplug{index}', 'HotplugTest')
+        window.set_wm_name(f'hotplug test {index}')
+        window.map()
+        windows.append(window)
+    connection.sync()
+    return windows
+
+
+def pump_events(seconds):
+    """Let GDK and WNCK process pending events"""
+    from gi.repository import GLib
+    
+    context = GLib.MainContext.default()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        while context.iteration(False):
+            pass
+        time.sleep(0.01)
+
+
+def wait_for_tiles(app, timeout):
+    """Wait until every tracked window has the frame of its tile"""
+    from gi.repository import Wnck
+    
+    wnck_screen = Wnck.Screen.get_default()
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        pump_events(0.01)
+        wnck_screen.force_update()
+        pending = [xid for xid, tile in app.tiles.items()
+                   if Wnck.Window.get(xid) is not None and
+                   tuple(Wnck.Window.get(xid).get_geometry()) != tile.frame]
+        if not pending:
+            return 0
+    return len(pending)
+
+
+def main():
+    options = parse_harness_arguments()
+    for tool in ('Xvfb', 'xrandr', options.wm.split()[0]):
+        if shutil.which(tool) is None:
+            print(f"Error: {tool} not found")
+            return 1
+    
+    server, manager = start_server(options.display, options.wm)
+    try:
+        import gi
+        gi.require_version("Wnck", "3.0")
+        from gi.repository import Wnck
+        
+        from main import XFCETilingApp
+        from src.config import parse_arguments
+        from src.metrics import metrics
+        from src.x_connection import XConnection
+        
+        connection = XConnection.shared()
+        windows = create_windows(connection, options.windows)
+        pump_events(1)
+        
+        app = XFCETilingApp()
+        for index, window in enumerate(windows):
+            Wnck.Screen.get_default().force_update()
+            wnck_window = Wnck.Window.get(window.id)
+            if wnck_window is None:
+                continue
+            app.execute(parse_arguments(['-p', POSITIONS[index % len(POSITIONS)]]), window=wnck_window)
+        wait_for_tiles(app, options.timeout)
+        print(f"Tiled {len(app.tiles)} windows on two monitors")
+        
+        # unplug the right monitor
+        run_xrandr('--delmonitor', 'right')
+        run_xrandr('--fb', f'{MONITOR_WIDTH}x{MONITOR_HEIGHT}')
+        pump_events(0.5)
+        
+        metrics.reset()
+        start = time.perf_counter()
+        retiled = app.retile_all()
+        sent = time.perf_counter()
+        pending = wait_for_tiles(app, options.timeout)
+        done = time.perf_counter()
+        
+        print(f"Re-tiled {retiled} windows: computed and sent in {(sent - start) * 1000:.1f} ms, "
+              f"applied after {(done - start) * 1000:.1f} ms")
+        if pending:
+            print(f"Warning: {pending} windows did not reach their tile within {options.timeout} s")
+        metrics.report()
+        return 1 if pending else 0
+    finally:
+        manager.terminate()
+        server.terminate()
+        manager.wait()
+        server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+XFCE Window Tiling - layout snapshots
+
+Saves geometry, workspace, screen and tile state of all windows into a
+file and restores it later in one batched pass.
+
+Usage:
+    python layout.py save ~/layouts/work.json
+    python layout.py restore ~/layouts/work.json
+"""
+
+import sys
+import gi
+
+gi.require_version("Wnck", "3.0")
+from gi.repository import Wnck
+
+from src.config import Config, parse_layout_arguments
+from src.layouts import capture_layout, save_layout, load_layout, LayoutRestorer
+from src.metrics import metrics
+from src.screen_detection import ScreenDetector
+from src.shared_table import read_shared_table
+from src.utils import StatefulWindowManager
+
+
+def main():
+    """Layout tool entry point"""
+    args = parse_layout_arguments()
+    
+    wnck_screen = Wnck.Screen.get_default()
+    if wnck_screen is None:
+        print("Error: No X11 display found. This script requires XFCE/X11 environment.")
+        return 1
+    wnck_screen.force_update()
+    
+    try:
+        if args.command == 'save':
+            # a running daemon publishes its screens and tiles, no need to detect them again
+            table = read_shared_table()
+            if table is not None and table['screens']:
+                screens = table['screens']
+            elif Config.AUTO_DISCOVER_SCREENS:
+                screens = ScreenDetector(verbose=args.verbose).discover_screens()
+            else:
+                screens = Config.DEFAULT_SCREENS
+            tiles = {xid: (None, factor) for xid, factor in StatefulWindowManager().known_factors().items()}
+            if table is not None:
+                tiles.update({xid: (tile.position, tile.factor) for xid, tile in table['tiles'].items()})
+            snapshot = capture_layout(wnck_screen, screens, tiles)
+            save_layout(args.file, snapshot)
+            print(f"Saved {len(snapshot['windows'])} windows to {args.file}")
+        else:
+            records = load_layout(args.file)
+            restorer = LayoutRestorer(wnck_screen, verbose=args.verbose)
+            changed = restorer.restore(records)
+            # continue stateful factor cycling where the snapshot left off
+            StatefulWindowManager().store_factors({
+                window.get_xid(): record['factor'] for window, record in restorer.matched
+                if record['factor'] is not None
+            })
+            print(f"Restored {changed} windows from {args.file}")
+    except (IOError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        if args.verbose:
+            metrics.report()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
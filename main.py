@@ -12,8 +12,10 @@ Examples:
     python main.py -p sw           # Position window in south-west
     python main.py -p e -f 1.5     # Position east with 1.5x scaling
     python main.py -p center -s    # Center with stateful scaling
+    python main.py --batch cmds    # One command per line, geometries sent together
 """
 
+import shlex
 import sys
 import gi
 
@@ -21,9 +23,17 @@ gi.require_version("Wnck", "3.0")
 from gi.repository import Wnck
 
 from src.config import Config, parse_arguments, get_factor_list
-from src.screen_detection import ScreenDetector, find_window_screen
+from src.screen_detection import ScreenDetector, find_window_screen, find_screen_by_key, find_screen_by_name
 from src.window_manager import ApplicationDetector, WindowPositioner, GeometryCorrector
 from src.utils import MouseController, StatefulWindowManager, get_window_id
+from src.metrics import metrics
+from src.batch import GeometryBatch, client_target, expected_frame
+from src.spatial_index import SpatialIndex, window_entry
+from src.monitor_graph import MonitorGraph, map_to_screen, topology_signature
+from src.tiles import TileRegistry
+from src.slots import SlotCycler
+from src.window_index import WindowIndex
+from src.pending_layouts import is_shown
 
 
 class XFCETilingApp:
@@ -35,13 +45,95 @@ class XFCETilingApp:
         self.screen_detector = None
         self.window_positioner = None
         self.stateful_manager = None
+        self.last_placement = None
+        self.spatial_index = None
+        self.monitor_graph = None
+        self.tiles = TileRegistry()
+        self.slots = SlotCycler()
+        self.window_index = None
+        self.open_batch = None
+        self._batch_screens = None
+        self.event_time = 0
         
-    def run(self):
+    def run(self, argv=None):
         """Main application entry point"""
+        args = parse_arguments(argv)
+        GeometryBatch.use_backend(args.backend, verbose=args.verbose)
+        if args.batch:
+            return self.run_batch(args)
+        return self.execute(args)
+    
+    def run_batch(self, args):
+        """
+        Execute many commands with one connection, one screen discovery and one flush
+        
+        Commands see the window geometries from before the batch, all
+        geometries are sent together at the end.
+        
+        Args:
+            args (argparse.Namespace): Arguments with the command file in 'batch'
+            
+        Returns:
+            int: Exit code (0 if every command succeeded)
+        """
+        self.verbose = args.verbose
+        try:
+            if args.batch == '-':
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(args.batch) as command_file:
+                    lines = command_file.read().splitlines()
+        except OSError as e:
+            print(f"Error: could not read commands: {e}")
+            return 1
+        commands = [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+        
+        results = []
+        self.open_batch = GeometryBatch(verbose=self.verbose)
         try:
-            # Parse arguments
-            self.args = parse_arguments()
-            self.verbose = self.args.verbose
+            if self._validate_environment():
+                self._batch_screens = self.discover_screens()
+            for command in commands:
+                try:
+                    command_args = parse_arguments(shlex.split(command) + (['--verbose'] if args.verbose else []))
+                except SystemExit:
+                    results.append(2)
+                    continue
+                if command_args.batch:
+                    print("Error: nested --batch is not supported")
+                    results.append(2)
+                    continue
+                results.append(self.execute(command_args))
+            configured = self.open_batch.flush()
+        finally:
+            self.open_batch = None
+            self._batch_screens = None
+        
+        failed = sum(1 for result in results if result != 0)
+        print(f"Batch: {len(commands)} commands, {len(commands) - failed} ok, {failed} failed, "
+              f"{configured} windows configured")
+        for number, (command, result) in enumerate(zip(commands, results), 1):
+            print(f"  {number:>3} {'ok' if result == 0 else 'failed':<7} {command}")
+        return 0 if failed == 0 else 1
+    
+    def execute(self, args, placement=None, window=None):
+        """
+        Tile the active window according to parsed arguments
+        
+        Components are created once, so the same instance can execute
+        many commands (e.g. when driven by the tiling daemon).
+        
+        Args:
+            args (argparse.Namespace): Parsed command arguments
+            placement (dict): Prefetched result of plan_placement() to apply directly
+            window: WNCK window to place instead of the active window
+            
+        Returns:
+            int: Exit code (0 on success)
+        """
+        try:
+            self.args = args
+            self.verbose = args.verbose
             
             # Initialize components
             self._initialize_components()
@@ -50,8 +142,33 @@ class XFCETilingApp:
             if not self._validate_environment():
                 return 1
             
+            if args.match:
+                matches = self.find_windows(args.match)
+                if not matches:
+                    if self.verbose:
+                        print(f"No window matches {args.match}")
+                    return 1
+                if args.all_matches and args.position is not None:
+                    placed = self.apply_placements([(match, args, None) for match in matches])
+                    if self.verbose:
+                        print(f"Placed {placed} of {len(matches)} matching windows")
+                    return 0
+                window = matches[0]
+            
+            if args.monitor:
+                return self._execute_monitor_move(window)
+            
+            if args.cycle:
+                return self._execute_cycle(window)
+            
+            if args.position is None:
+                return self._execute_directional(window)
+            
+            if placement is not None:
+                return self._execute_prefetched(placement)
+            
             # Get active window and screen information
-            active_window, current_geometry, target_screen = self._get_window_info()
+            active_window, current_geometry, target_screen = self._get_window_info(window)
             
             # Analyze application type
             app_info = ApplicationDetector.analyze_window(active_window)
@@ -66,11 +183,12 @@ class XFCETilingApp:
             )
             
             # Apply new position
-            self._apply_window_position(active_window, new_position, app_info)
+            target, frame = self._apply_window_position(active_window, new_position, app_info)
+            self._remember_placement(active_window, target_screen, factor, frame)
             
             # Move cursor if requested
             if self.args.move_cursor:
-                self._move_cursor_to_window(new_position)
+                self._move_cursor_to_window(active_window, target)
             
             return 0
             
@@ -84,14 +202,325 @@ class XFCETilingApp:
                 import traceback
                 traceback.print_exc()
             return 1
+        finally:
+            if self.verbose:
+                metrics.report()
     
     def _initialize_components(self):
-        """Initialize application components"""
-        self.screen_detector = ScreenDetector(verbose=self.verbose)
-        self.window_positioner = WindowPositioner(verbose=self.verbose)
+        """Initialize application components (only once per instance)"""
+        if self.screen_detector is None:
+            self.screen_detector = ScreenDetector(verbose=self.verbose)
+            self.window_positioner = WindowPositioner(verbose=self.verbose)
+            self.stateful_manager = StatefulWindowManager(verbose=self.verbose)
+    
+    def _execute_prefetched(self, placement):
+        """Send a prefetched geometry, then commit the factor cycle"""
+        window = placement['window']
+        self._send_geometry(window, placement['target'], placement['frame'])
+        self._remember_placement(window, placement['screen'], placement['factor'], placement['frame'])
         
         if self.args.stateful:
-            self.stateful_manager = StatefulWindowManager(verbose=self.verbose)
+            self._determine_scaling_factor(window)
+        
+        if self.args.move_cursor:
+            self._move_cursor_to_window(window, placement['target'])
+        
+        return 0
+    
+    def _execute_monitor_move(self, window=None):
+        """Move the active window to the adjacent screen, keeping its tile"""
+        wnck_screen = Wnck.Screen.get_default()
+        wnck_screen.force_update()
+        
+        active_window = window or wnck_screen.get_active_window()
+        if active_window is None:
+            raise RuntimeError("No active window found")
+        
+        current_geometry = tuple(active_window.get_geometry())
+        screens = self.discover_screens()
+        source = find_window_screen(
+            max(0, current_geometry[0]), max(0, current_geometry[1]),
+            current_geometry[2], current_geometry[3], screens
+        )
+        target_screen = self.get_monitor_graph(screens).neighbour(source.name, self.args.monitor)
+        if target_screen is None:
+            if self.verbose:
+                print(f"No screen in direction '{self.args.monitor}' of {source.name}")
+            return 0
+        
+        if self.verbose:
+            print(f"Moving window from {source.name} to {target_screen.name}")
+        
+        tile = self.tiles.get(active_window.get_xid(), current_geometry)
+        if tile is not None:
+            # re-tile with the same position and factor on the other screen
+            args = self.tile_arguments(tile, target_screen.name)
+            placement = self.plan_placement(active_window, args, screens, tile.factor)
+            target = placement['target']
+            self._send_geometry(active_window, target, placement['frame'])
+            self.last_placement = self.track_tile(
+                active_window, args, target_screen, tile.factor, placement['frame']
+            )
+        else:
+            # not tiled by us, keep the relative geometry
+            app_info = ApplicationDetector.analyze_window(active_window)
+            x, y, width, height = map_to_screen(current_geometry, source, target_screen)
+            target, frame = self._correct_geometry(
+                active_window, (x, y, width, height, Wnck.WindowGravity.NORTHWEST), app_info, None, self.verbose
+            )
+            self._send_geometry(active_window, target, frame)
+        
+        if self.args.move_cursor:
+            self._move_cursor_to_window(active_window, target)
+        return 0
+    
+    def retile_all(self, deferred=None):
+        """
+        Re-apply all tracked tiles after the screen topology changed
+        
+        Screens are discovered once. A tile stays on its screen if that still
+        exists, otherwise it moves to the screen now holding most of the window.
+        All geometries are sent in one batch.
+        
+        Args:
+            deferred (PendingLayouts): Keep tiles of windows on hidden workspaces
+                                       here instead of applying them now
+        
+        Returns:
+            int: Number of reconfigured windows
+        """
+        wnck_screen = Wnck.Screen.get_default()
+        wnck_screen.force_update()
+        active_workspace = wnck_screen.get_active_workspace()
+        
+        with metrics.timer('retile'):
+            screens = self.discover_screens()
+            self.get_monitor_graph(screens)
+            
+            entries = []
+            for xid, tile in self.tiles.items():
+                window = Wnck.Window.get(xid)
+                if window is None:
+                    self.tiles.forget(xid)
+                    continue
+                if window.is_minimized() or window.is_maximized():
+                    continue
+                
+                # names are renumbered when a monitor goes away, keys are not
+                screen = find_screen_by_key(screens, tile.screen_key)
+                if screen is None:
+                    x, y, width, height = window.get_geometry()
+                    screen = find_window_screen(max(0, x), max(0, y), width, height, screens)
+                
+                args = self.tile_arguments(tile, screen.name)
+                if deferred is not None and not is_shown(window, active_workspace):
+                    deferred.defer(window, args, tile.factor, tile)
+                else:
+                    entries.append((window, args, tile.factor))
+            
+            retiled = self.apply_placements(entries, screens)
+        
+        metrics.increment('retile.windows', retiled)
+        return retiled
+    
+    def apply_placements(self, entries, screens=None):
+        """
+        Plan placements of several windows and send them in one batch
+        
+        Args:
+            entries (list): (window, args, factor) - factor None uses the window's next factor
+            screens (list): Current screens, discovered if not given
+            
+        Returns:
+            int: Number of reconfigured windows
+        """
+        if not entries:
+            return 0
+        if screens is None:
+            screens = self.discover_screens()
+        
+        if GeometryBatch.backend is not None:
+            GeometryCorrector.prime_caches([entry[0] for entry in entries], GeometryBatch.backend)
+        
+        batch = GeometryBatch(verbose=self.verbose)
+        for window, args, factor in entries:
+            try:
+                if factor is None:
+                    factor = self.peek_scaling_factor(window, args)
+                placement = self.plan_placement(window, args, screens, factor)
+            except Exception as e:
+                if self.verbose:
+                    print(f"Could not place window {window.get_xid()}: {e}")
+                continue
+            batch.add(window, placement['target'], placement['frame'])
+            self.track_tile(window, args, placement['screen'], factor, placement['frame'])
+        return self._flush(batch)
+    
+    def find_windows(self, criteria):
+        """
+        Find windows by --match criteria
+        
+        The daemon keeps a window index up to date, a single run builds one.
+        
+        Args:
+            criteria (list): (key, value) pairs, e.g. [('class', 'firefox')]
+            
+        Returns:
+            list: Matching WNCK windows, newest first
+        """
+        index = self.window_index
+        if index is None:
+            wnck_screen = Wnck.Screen.get_default()
+            wnck_screen.force_update()
+            index = WindowIndex()
+            index.rebuild(wnck_screen.get_windows())
+        with metrics.timer('window_index.find'):
+            return index.find(criteria)
+    
+    def _execute_cycle(self, window=None):
+        """Activate the next window tiled to the same slot as the active window"""
+        wnck_screen = Wnck.Screen.get_default()
+        wnck_screen.force_update()
+        
+        active_window = window or wnck_screen.get_active_window()
+        if active_window is None:
+            raise RuntimeError("No active window found")
+        
+        xid = active_window.get_xid()
+        slot = self.slots.slot_of(xid)
+        if slot is None:
+            # not tiled by this process, cycle windows with the same frame instead
+            candidate = self._find_stacked_twin(wnck_screen, active_window)
+        else:
+            candidate = None
+            candidate_xid = self.slots.next(xid)
+            while candidate_xid is not None:
+                candidate = Wnck.Window.get(candidate_xid)
+                if candidate is not None and self.tiles.get(candidate_xid, candidate.get_geometry()) is not None:
+                    break
+                # closed, or moved away so its tile was dropped
+                self.slots.remove(candidate_xid)
+                candidate, candidate_xid = None, self.slots.next(xid)
+        
+        if candidate is None:
+            if self.verbose:
+                print("No other window in this tile")
+            return 0
+        
+        if self.verbose:
+            print(f"Cycling to: {candidate.get_name()}")
+        candidate.activate(self.event_time)
+        self.slots.touch(candidate.get_xid())
+        
+        if self.args.move_cursor:
+            MouseController.place_cursor_over_window(tuple(candidate.get_geometry()), self.verbose)
+        return 0
+    
+    def _find_stacked_twin(self, wnck_screen, window):
+        """Get the lowest stacked visible window with the same frame geometry"""
+        geometry = tuple(window.get_geometry())
+        workspace = wnck_screen.get_active_workspace()
+        for other in wnck_screen.get_windows_stacked():
+            if (other.get_xid() != window.get_xid() and not other.is_minimized() and
+                    is_shown(other, workspace) and tuple(other.get_geometry()) == geometry):
+                return other
+        return None
+    
+    def get_monitor_graph(self, screens):
+        """Get the monitor adjacency graph, rebuilt only when the topology changed"""
+        if self.monitor_graph is None or self.monitor_graph.signature != topology_signature(screens):
+            with metrics.timer('monitor_graph.build'):
+                self.monitor_graph = MonitorGraph(screens)
+        return self.monitor_graph
+    
+    def tile_arguments(self, tile, screen_name):
+        """
+        Get tiling arguments reproducing a tile on a screen
+        
+        Args:
+            tile (WindowRecord): Tile of the TileRegistry
+            screen_name (str): Screen to place the tile on
+            
+        Returns:
+            argparse.Namespace: Parsed arguments
+        """
+        argv = ['-p', tile.position, '-f', str(tile.factor), '--screen', screen_name]
+        if tile.horizontal_only:
+            argv.append('-o')
+        if tile.vertical_only:
+            argv.append('-e')
+        if self.verbose:
+            argv.append('--verbose')
+        return parse_arguments(argv)
+    
+    def _execute_directional(self, window=None):
+        """Focus or swap with the closest window in the requested direction"""
+        wnck_screen = Wnck.Screen.get_default()
+        wnck_screen.force_update()
+        
+        active_window = window or wnck_screen.get_active_window()
+        if active_window is None:
+            raise RuntimeError("No active window found")
+        
+        # the daemon keeps an index up to date, a single run builds one
+        index = self.spatial_index
+        if index is None:
+            index = SpatialIndex()
+            index.rebuild(wnck_screen.get_windows())
+        else:
+            index.update_window(active_window)
+        
+        workspace = wnck_screen.get_active_workspace()
+        direction = self.args.focus or self.args.swap
+        with metrics.timer('spatial_index.query'):
+            neighbour_xid = index.nearest(
+                active_window.get_xid(), direction,
+                workspace.get_number() if workspace is not None else None
+            )
+        
+        neighbour = Wnck.Window.get(neighbour_xid) if neighbour_xid is not None else None
+        if neighbour is None:
+            if self.verbose:
+                print(f"No window found in direction '{direction}'")
+            return 0
+        
+        if self.verbose:
+            print(f"Neighbour in direction '{direction}': {neighbour.get_name()}")
+        
+        if self.args.focus:
+            neighbour.activate(self.event_time)
+        else:
+            self._swap_windows(active_window, neighbour)
+        return 0
+    
+    def _swap_windows(self, window, other):
+        """Exchange the frame geometries of two windows in one batch"""
+        frames = {window.get_xid(): tuple(window.get_geometry()),
+                  other.get_xid(): tuple(other.get_geometry())}
+        
+        batch = GeometryBatch(verbose=self.verbose)
+        for source, destination in ((window, other), (other, window)):
+            batch.add(source, *self.target_for_frame(source, frames[destination.get_xid()]))
+        self._flush(batch)
+    
+    def target_for_frame(self, window, frame):
+        """
+        Get the geometry to send for a window to end up with a frame geometry
+        
+        Args:
+            window: WNCK window object
+            frame (tuple): Wanted frame geometry (x, y, width, height)
+            
+        Returns:
+            tuple: (target, frame) - geometry to send and the expected frame
+        """
+        app_info = ApplicationDetector.analyze_window(window)
+        correction_x, correction_y = GeometryCorrector.calculate_window_corrections(
+            window, app_info, None, self.verbose
+        )
+        extents = GeometryCorrector.decoration_sizes(window, app_info['window_class'])
+        target = client_target(frame, correction_x, correction_y, extents, Wnck.WindowGravity.NORTHWEST)
+        return target, expected_frame(target, correction_x, correction_y, extents)
     
     def _validate_environment(self):
         """Validate that we're running in a suitable environment"""
@@ -102,14 +531,14 @@ class XFCETilingApp:
             return False
         return True
     
-    def _get_window_info(self):
-        """Get active window and determine target screen"""
+    def _get_window_info(self, window=None):
+        """Get active (or given) window and determine target screen"""
         # Get window manager screen
         wnck_screen = Wnck.Screen.get_default()
         wnck_screen.force_update()
         
         # Get active window
-        active_window = wnck_screen.get_active_window()
+        active_window = window or wnck_screen.get_active_window()
         if active_window is None:
             raise RuntimeError("No active window found")
         
@@ -117,18 +546,142 @@ class XFCETilingApp:
         current_geometry = active_window.get_geometry()
         
         # Discover screens and find target screen
-        if Config.AUTO_DISCOVER_SCREENS:
-            screens = self.screen_detector.discover_screens()
-        else:
-            screens = Config.DEFAULT_SCREENS
+        screens = self.discover_screens()
+        target_screen = self._select_screen(screens, current_geometry, self.args, self.verbose)
+        
+        return active_window, current_geometry, target_screen
+    
+    def _select_screen(self, screens, current_geometry, args, verbose=False):
+        """Get the screen requested by --screen or the one holding most of the window"""
+        if args.screen:
+            screen = find_screen_by_name(screens, args.screen)
+            if screen is not None:
+                return screen
+            if verbose:
+                print(f"Screen {args.screen} not found, using current screen")
         
-        target_screen = find_window_screen(
+        return find_window_screen(
             max(0, current_geometry[0]), max(0, current_geometry[1]),
             current_geometry[2], current_geometry[3],
-            screens, verbose=self.verbose
+            screens, verbose=verbose
         )
+    
+    def _remember_placement(self, window, screen, factor, frame):
+        """Keep what was placed last, for callers like the daemon, and track the tile"""
+        self.last_placement = self.track_tile(window, self.args, screen, factor, frame)
+    
+    def track_tile(self, window, args, screen, factor, frame):
+        """
+        Record the tile a window was placed in
         
-        return active_window, current_geometry, target_screen
+        Args:
+            window: WNCK window object
+            args (argparse.Namespace): Arguments the window was placed with
+            screen (Screen): Screen the window was placed on
+            factor (float): Scaling factor used
+            frame (tuple): Expected frame geometry after placing
+            
+        Returns:
+            dict: Placement description
+        """
+        placement = {
+            'window': window,
+            'position': args.position,
+            'factor': factor,
+            'screen': screen.name,
+            'screen_key': screen.key,
+            'horizontal_only': args.horizontal_only,
+            'vertical_only': args.vertical_only,
+        }
+        self.tiles.record(window.get_xid(), placement, frame)
+        
+        entry = window_entry(window)
+        if entry is not None:
+            app_info = ApplicationDetector.analyze_window(window)
+            self.slots.add(window.get_xid(), (entry[1], screen.name, args.position), app_info['window_class'])
+        return placement
+    
+    def discover_screens(self):
+        """Get current screens with their work areas"""
+        self._initialize_components()
+        if self._batch_screens is not None:
+            return self._batch_screens
+        if Config.AUTO_DISCOVER_SCREENS:
+            return self.screen_detector.discover_screens()
+        return Config.DEFAULT_SCREENS
+    
+    def peek_scaling_factor(self, window, args):
+        """
+        Get the factor the next command would use, without cycling it
+        
+        Args:
+            window: WNCK window object
+            args (argparse.Namespace): Command arguments
+            
+        Returns:
+            float: Scaling factor
+        """
+        self._initialize_components()
+        if args.stateful:
+            factors = get_factor_list(args.custom_factors)
+            return self.stateful_manager.peek_next_factor(get_window_id(window), factors)
+        return args.factor
+    
+    def plan_placement(self, window, args, screens, factor):
+        """
+        Compute the final geometry of a command without touching the window
+        
+        Args:
+            window: WNCK window object (not maximized)
+            args (argparse.Namespace): Command arguments
+            screens (list): Screens as returned by discover_screens()
+            factor (float): Scaling factor to use
+            
+        Returns:
+            dict: Placement with 'window', 'screen', 'factor', 'new_position',
+                  corrected 'target' and the expected 'frame'
+        """
+        self._initialize_components()
+        current_geometry = window.get_geometry()
+        screen = self._select_screen(screens, current_geometry, args)
+        app_info = ApplicationDetector.analyze_window(window)
+        
+        new_position = self.window_positioner.calculate_position(
+            screen=screen,
+            position=args.position,
+            factor=factor,
+            current_geometry=current_geometry,
+            vertical_only=args.vertical_only,
+            horizontal_only=args.horizontal_only,
+            obstacles=self._get_obstacles(window, args.position)
+        )
+        target, frame = self._correct_geometry(window, new_position, app_info, args.position)
+        
+        return {
+            'window': window,
+            'screen': screen,
+            'factor': factor,
+            'new_position': new_position,
+            'target': target,
+            'frame': frame
+        }
+    
+    def _get_obstacles(self, window, position):
+        """Get geometries of the other visible windows on the window's workspace (only for 'fill')"""
+        if position not in Config.DYNAMIC_POSITIONS:
+            return None
+        
+        workspace = window.get_workspace()
+        if workspace is None:
+            workspace = Wnck.Screen.get_default().get_active_workspace()
+        workspace = workspace.get_number() if workspace is not None else None
+        
+        # the daemon keeps an index up to date, a single run scans the windows once
+        index = self.spatial_index
+        if index is None:
+            index = SpatialIndex()
+            index.rebuild(Wnck.Screen.get_default().get_windows())
+        return index.rects(workspace, exclude=window.get_xid())
     
     def _log_window_info(self, window, app_info):
         """Log window and application information"""
@@ -156,9 +709,6 @@ class XFCETilingApp:
     
     def _calculate_new_position(self, screen, window, current_geometry, factor, app_info):
         """Calculate new window position"""
-        # Get window decoration geometry for corrections
-        geometry_raw = window.get_client_window_geometry()
-        
         # Calculate new position
         new_position = self.window_positioner.calculate_position(
             screen=screen,
@@ -166,7 +716,8 @@ class XFCETilingApp:
             factor=factor,
             current_geometry=current_geometry,
             vertical_only=self.args.vertical_only,
-            horizontal_only=self.args.horizontal_only
+            horizontal_only=self.args.horizontal_only,
+            obstacles=self._get_obstacles(window, self.args.position)
         )
         
         if self.verbose:
@@ -176,59 +727,67 @@ class XFCETilingApp:
     
     def _apply_window_position(self, window, new_position, app_info):
         """Apply the calculated position to the window"""
-        # Unmaximize window first
-        window.unmaximize()
-        
-        # Get current and raw geometry for corrections
-        current_geometry = window.get_geometry()
-        geometry_raw = window.get_client_window_geometry()
-        
-        # Calculate geometry corrections
-        correction_x, correction_y = GeometryCorrector.calculate_corrections(
-            geometry_raw, current_geometry, app_info, self.args.position, self.verbose
-        )
+        target, frame = self._correct_geometry(window, new_position, app_info, self.args.position, self.verbose)
+        self._send_geometry(window, target, frame)
+        return target, frame
+    
+    def _correct_geometry(self, window, new_position, app_info, position, verbose=False):
+        """
+        Turn a calculated position into the geometry to send
         
-        # Apply geometry with corrections
-        flags = (Wnck.WindowMoveResizeMask.X | Wnck.WindowMoveResizeMask.Y | 
-                Wnck.WindowMoveResizeMask.WIDTH | Wnck.WindowMoveResizeMask.HEIGHT)
-        
-        window.set_geometry(
-            gravity=new_position[4],
-            geometry_mask=flags,
-            x=round(new_position[0] - correction_x),
-            y=round(new_position[1] - correction_y),
-            width=round(new_position[2]),
-            height=round(new_position[3])
+        Returns:
+            tuple: (target, frame) - corrected geometry to send and the frame it results in
+        """
+        # Calculate geometry corrections from (cached) frame extents
+        correction_x, correction_y = GeometryCorrector.calculate_window_corrections(
+            window, app_info, position, verbose
         )
         
-        if self.verbose:
-            print(f"Applied geometry: x={round(new_position[0] - correction_x)}, "
-                  f"y={round(new_position[1] - correction_y)}, "
-                  f"w={round(new_position[2])}, h={round(new_position[3])}")
+        # Size the frame as the application accepts it, then send the client geometry
+        extents = GeometryCorrector.decoration_sizes(window, app_info['window_class'])
+        frame = GeometryCorrector.fit_size_hints(window, (
+            round(new_position[0]),
+            round(new_position[1]),
+            round(new_position[2]),
+            round(new_position[3]),
+            new_position[4]
+        ), position, verbose, extents)
+        target = client_target(frame, correction_x, correction_y, extents, new_position[4])
+        return target, expected_frame(target, correction_x, correction_y, extents)
     
-    def _move_cursor_to_window(self, new_position):
-        """Move cursor to window center if requested"""
-        # Calculate window rectangle with corrections
-        current_geometry = Wnck.Screen.get_default().get_active_window().get_geometry()
-        geometry_raw = Wnck.Screen.get_default().get_active_window().get_client_window_geometry()
+    def _send_geometry(self, window, target, frame=None):
+        """
+        Send final geometry (x, y, width, height, gravity) to the window manager
         
-        correction_x = geometry_raw[0] - current_geometry[0]
-        correction_y = geometry_raw[1] - current_geometry[1]
+        Nothing is sent if the window already has the expected frame geometry.
+        """
+        batch = GeometryBatch(verbose=self.verbose)
+        batch.add(window, target, frame)
+        if self._flush(batch) and self.verbose:
+            print(f"Applied geometry: x={target[0]}, y={target[1]}, w={target[2]}, h={target[3]}")
+    
+    def _flush(self, batch):
+        """Send a batch now, or add it to the open batch of --batch mode"""
+        if self.open_batch is not None:
+            queued = len(batch)
+            self.open_batch.merge(batch)
+            return queued
+        return batch.flush()
+    
+    def _move_cursor_to_window(self, window, target):
+        """
+        Move cursor to window center if requested
         
+        Args:
+            window: WNCK window object that was placed
+            target (tuple): Geometry sent to the window (x, y, width, height, gravity)
+        """
         # Keep window above others temporarily
-        window = Wnck.Screen.get_default().get_active_window()
         window.make_above()
         window.unmake_above()
         
         # Move cursor
-        window_rect = (
-            round(new_position[0] - correction_x),
-            round(new_position[1] - correction_y),
-            round(new_position[2]),
-            round(new_position[3])
-        )
-        
-        MouseController.place_cursor_over_window(window_rect, self.verbose)
+        MouseController.place_cursor_over_window(target[:4], self.verbose)
 
 
 def main():
@@ -13,37 +13,39 @@ from __future__ import print_function
 #
 # reads a direction from touchpad/pointer and invokes pywin.py to tile the window
 #
+# Runs either once per gesture (default) or as a resident service (--durable).
+# A resident service arms recognition on a hotkey (--hotkey) or a button chord
+# (--button) grabbed through XInput and keeps its gesture state in memory.
+#
 # requires: XLib, filelock
 
 import os
+import sys
 
 # minimum distance the pointer must have been moved until a direction is discovered
 min_distance = 100
 # the cmd to execute
 base = os.path.dirname(os.path.realpath(__file__))
-cmd = "python " + base + "/pywin.py -s --with-cursor -p "
+cmd = [sys.executable, base + "/pywin.py", "-s", "--with-cursor", "-p"]
 # wait timeout. Stops program after timeout without input or final decision (e.g. distance was to short)
 blocktime = 0.5
 
 
-import _thread
-import sys
-from builtins import int, KeyboardInterrupt
-
 import argparse
 import math
-from Xlib.display import Display
+import select
+import subprocess
+import time
+from Xlib import X
 from Xlib.ext import xinput
 from argparse import RawTextHelpFormatter
-from filelock import FileLock
-from threading import Timer
+from filelock import FileLock, Timeout
 
-# ===========
-x1 = None
-y1 = None
-blocked = False
-is_run_active = True
-timer = None
+from src.config import Config
+from src.hotkeys import parse_accelerator, lookup_keycode, modifier_variants
+from src.metrics import metrics
+from src.utils import get_runtime_path
+from src.x_connection import XConnection
 
 
 def read_args():
@@ -51,164 +53,218 @@ def read_args():
                                      formatter_class=RawTextHelpFormatter)
 
     parser.add_argument('-d', '--durable', dest='durable', action='store_true',
-                        help='scale only horizontal')
+                        help='keep running and recognize gestures until terminated')
+
+    parser.add_argument('-k', '--hotkey', dest='hotkey', metavar="accelerator",
+                        help='arm recognition while this key is held, e.g. "<Super>g"')
+
+    parser.add_argument('-b', '--button', dest='button', metavar="chord",
+                        help='arm recognition while this pointer button is held, e.g. "<Super>3"')
 
     parser.add_argument('-v', '--verbose', dest='verbose', action='store_true',
                         help='print some debugging output')
 
-    parser.add_argument('-t', '--track-distance', dest='distance', metavar="distance", type=int, default=100,
+    parser.add_argument('-t', '--track-distance', dest='distance', metavar="distance", type=int, default=min_distance,
                         help='minimum distance to move pointer before direction is decided')
 
-    args = parser.parse_args()
-    return args
-
+    return parser.parse_args()
 
-def log(arg, *vargs):
-    if args.verbose:
-        print(arg, *vargs)
 
+class GestureRecognizer:
+    """Turns a pointer movement into one of the tiling directions"""
 
-def reset():
-    global blocked, x, y, is_run_active
-    blocked = False
-    x = None
-    y = None
-    if not args.durable:
-        log("exit program due to timeout")
-        is_run_active = False
-        _thread.interrupt_main()  # interrupt main thread
-    ##print("reset")
+    def __init__(self, distance):
+        self.distance = distance
+        self.origin = None
 
+    def start(self, x, y):
+        self.origin = (x, y)
 
-def mouse_to(xp, yp):
-    d = Display()
-    s = d.screen()
-    root = s.root
-    root.warp_pointer(xp, yp)
-    d.sync()
+    def reset(self):
+        self.origin = None
 
+    def update(self, x, y):
+        """
+        Feed a pointer position
 
-def run(direction):
-    os.system(cmd + direction)
+        Returns:
+            str: Direction (n, ne, e, ...) once the pointer moved far enough, else None
+        """
+        if self.origin is None:
+            self.start(x, y)
+            return None
 
+        diff_x = x - self.origin[0]
+        diff_y = self.origin[1] - y
+        if math.hypot(diff_x, diff_y) <= self.distance:
+            return None
 
-def start_reset_timer():
-    global timer
-    if timer is not None:
-        timer.cancel()
-    timer = Timer(blocktime, reset)
-    timer.start()
-
-
-def handle(x, y):
-    global x1, y1, blocked, timer
-    if blocked or not is_run_active:
-        log("program was ended", is_run_active)
-        return
-
-    if x1 is None:
-        x1 = x
-        y1 = y
-        start_reset_timer()
-        return
-    diff_x = x - x1
-    diff_y = y1 - y
-    distance = math.sqrt(math.fabs(diff_x * diff_x - diff_y * diff_y))
-
-    if distance > min_distance:
         if diff_x == 0:
             diff_x = 0.0001  # avoid division my zero
 
-        slope = diff_y / diff_x
-        location = None
-
-        stg = 3  # 3 extreme, 2 , 1 low
-        if math.fabs(slope) > 3:
-            stg = 3
-        if 2.5 >= math.fabs(slope) > 0.4:
-            stg = 2
-        if math.fabs(slope) < 0.4:
-            stg = 1
-
-        if diff_x > 0 and diff_y > 0:  # Q1
-            if stg == 1:
-                location = "e"
-            elif stg == 2:
-                location = "ne"
-            elif stg == 3:
-                location = "n"
-        elif diff_x > 0 and diff_y < 0:  # Q2
-            if stg == 1:
-                location = "e"
-            elif stg == 2:
-                location = "se"
-            elif stg == 3:
-                location = "s"
-        elif diff_x < 0 and diff_y < 0:  # Q3
-            if stg == 1:
-                location = "w"
-            elif stg == 2:
-                location = "sw"
-            elif stg == 3:
-                location = "s"
-        elif diff_x < 0 and diff_y > 0:
-            if stg == 1:
-                location = "w"
-            elif stg == 2:
-                location = "nw"
-            elif stg == 3:
-                location = "n"
-
-        log(location, diff_y, diff_y, "slope", slope, "stg", stg, "direction", location)
-
-        blocked = True
-        mouse_to(int(x1), int(y1))
-
-        timer.cancel()
-
-        if args.durable:
-            start_reset_timer()
-
+        slope = math.fabs(diff_y / diff_x)
+
+        if slope < 0.4:
+            return "e" if diff_x > 0 else "w"
+        if slope <= 2.5:
+            vertical = "n" if diff_y > 0 else "s"
+            return vertical + ("e" if diff_x > 0 else "w")
+        return "n" if diff_y > 0 else "s"
+
+
+class GestureService:
+    """Reads pointer motion via XInput and dispatches recognized gestures"""
+
+    def __init__(self, args):
+        self.args = args
+        self.connection = XConnection.shared(verbose=args.verbose)
+        self.recognizer = GestureRecognizer(args.distance)
+        self.running = True
+        self.armed = False
+        self.deadline = None
+        self.trigger = None
+
+    def log(self, arg, *vargs):
+        if self.args.verbose:
+            print(arg, *vargs)
+
+    def run(self):
+        display = self.connection.display
+        version_info = display.xinput_query_version()
+        self.log('Found XInput version %u.%u' % (
+            version_info.major_version,
+            version_info.minor_version,
+        ))
+
+        if self.args.hotkey or self.args.button:
+            self._grab_trigger()
+        else:
+            # legacy mode: the gesture starts right away
+            self._arm()
+
+        while self.running:
+            if not display.pending_events():
+                readable, _, _ = select.select([display], [], [], self._time_left())
+                if not readable and not display.pending_events():
+                    self._on_timeout()
+                    continue
+            while self.running and display.pending_events():
+                self._handle_event(display.next_event())
+
+    def _grab_trigger(self):
+        """Install the passive XInput grab that arms recognition"""
+        root = self.connection.root
+        if self.args.hotkey:
+            key_name, modifiers = parse_accelerator(self.args.hotkey)
+            detail = lookup_keycode(self.connection.display, key_name)
+            grab_type = xinput.GrabtypeKeycode
+            mask = xinput.KeyPressMask | xinput.KeyReleaseMask
         else:
-            run(location)
-            if timer is not None:
-                timer.cancel()
-            sys.exit(0)
+            button_name, modifiers = parse_accelerator(self.args.button)
+            detail = int(button_name)
+            grab_type = xinput.GrabtypeButton
+            # an active button grab also delivers the motion of the gesture
+            mask = xinput.ButtonPressMask | xinput.ButtonReleaseMask | xinput.MotionMask
+
+        xinput.passive_grab_device(root, xinput.AllMasterDevices, X.CurrentTime, detail, grab_type,
+                                   xinput.GrabModeAsync, xinput.GrabModeAsync, False, mask,
+                                   modifier_variants(modifiers))
+        self.trigger = (grab_type, detail)
+        self.connection.flush()
+        self.log("grabbed trigger", self.args.hotkey or self.args.button)
+
+    def _arm(self, x=None, y=None):
+        self.armed = True
+        self.recognizer.reset()
+        if x is not None:
+            self.recognizer.start(x, y)
+        self.deadline = time.monotonic() + blocktime
+        if self.trigger is None or self.trigger[0] == xinput.GrabtypeKeycode:
+            self.connection.root.xinput_select_events([(xinput.AllDevices, xinput.MotionMask)])
+            self.connection.flush()
+        metrics.increment('gesture.armed')
+
+    def _disarm(self):
+        self.armed = False
+        self.recognizer.reset()
+        self.deadline = None
+        if self.trigger is not None and self.trigger[0] == xinput.GrabtypeKeycode:
+            self.connection.root.xinput_select_events([(xinput.AllDevices, 0)])
+            self.connection.flush()
+
+    def _time_left(self):
+        if self.deadline is None:
+            return None
+        return max(0, self.deadline - time.monotonic())
+
+    def _on_timeout(self):
+        self.log("gesture timed out")
+        self._finish_gesture()
+
+    def _finish_gesture(self):
+        """End the current gesture: stop, wait for the trigger, or start over right away"""
+        self._disarm()
+        if not self.args.durable:
+            self.running = False
+        elif self.trigger is None:
+            # resident without a trigger: every gesture starts right after the last one
+            self._arm()
+
+    def _handle_event(self, event):
+        evtype = getattr(event, 'evtype', None)
+        if self.trigger is not None and evtype in (xinput.KeyPress, xinput.ButtonPress):
+            if event.data.detail == self.trigger[1] and not self.armed:
+                self._arm(event.data.root_x, event.data.root_y)
+            return
+        if self.trigger is not None and evtype in (xinput.KeyRelease, xinput.ButtonRelease):
+            if event.data.detail == self.trigger[1]:
+                self._disarm()
+            return
+        if evtype == xinput.Motion and self.armed:
+            self._handle_motion(event.data.root_x, event.data.root_y)
+
+    def _handle_motion(self, x, y):
+        origin = self.recognizer.origin
+        location = self.recognizer.update(x, y)
+        if origin is None:
+            # first position of this gesture, restart the timeout
+            self.deadline = time.monotonic() + blocktime
+        if location is None:
+            return
+
+        self.log("direction", location, "from", origin, "to", (x, y))
+        metrics.increment('gesture.recognized')
+
+        self._mouse_to(int(origin[0]), int(origin[1]))
+        subprocess.Popen(cmd + [location])
+        self._finish_gesture()
+
+    def _mouse_to(self, xp, yp):
+        self.connection.root.warp_pointer(xp, yp)
+        self.connection.flush()
 
-args = read_args()
 
 def main(argv):
-    global timer, is_run_active, args, min_distance
-    with FileLock("mousy.lock", timeout=0.3):
-        log("Lock acquired.")  # avoid multiple runs  the same time
-
-        min_distance = args.distance
-
-        start_reset_timer()
-
-        display = Display()
-        try:
-            extension_info = display.query_extension('XInputExtension')
-
-            version_info = display.xinput_query_version()
-            log('Found XInput version %u.%u' % (
-                version_info.major_version,
-                version_info.minor_version,
-            ))
-
-            screen = display.screen()
-            screen.root.xinput_select_events([(xinput.AllDevices, xinput.MotionMask)])
-
-            while is_run_active:
-                try:
-                    event = display.next_event()
-                    x = event.data.root_x
-                    y = event.data.root_y
-                    handle(x, y)
-                except KeyboardInterrupt as e:
-                    log("interrupted")
-        finally:
-            display.close()
+    args = read_args()
+    lock = FileLock(get_runtime_path(Config.GESTURE_LOCK_FILE), timeout=0.3)
+    try:
+        lock.acquire()
+    except Timeout:
+        print("Another gesture reader is already running")
+        return 1
+
+    service = GestureService(args)
+    try:
+        service.log("Lock acquired.")  # avoid multiple runs  the same time
+        service.run()
+    except KeyboardInterrupt:
+        service.log("interrupted")
+    finally:
+        service.connection.close()
+        lock.release()
+        if args.verbose:
+            metrics.report()
+    return 0
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
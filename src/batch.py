@@ -0,0 +1,209 @@
+"""
+Batched application of window geometries
+"""
+
+import time
+
+import gi
+gi.require_version('Gdk', '3.0')
+gi.require_version("Wnck", "3.0")
+from gi.repository import Gdk, Wnck
+
+from .config import Config
+from .metrics import metrics
+from .xcb_backend import XcbBackend, xcb_available
+
+
+def client_target(frame, correction_x, correction_y, extents, gravity):
+    """
+    Geometry to send for a window to end up with a frame geometry
+    
+    _NET_MOVERESIZE_WINDOW positions and sizes the client window, so the
+    corrections are taken off the position and the decorations off the size.
+    
+    Args:
+        frame (tuple): Wanted frame geometry (x, y, width, height)
+        correction_x, correction_y: Corrections to subtract from the frame position
+        extents (tuple): Decoration sizes (left, right, top, bottom)
+        gravity: WNCK window gravity
+        
+    Returns:
+        tuple: Geometry to send (x, y, width, height, gravity)
+    """
+    left, right, top, bottom = extents
+    return (round(frame[0] - correction_x), round(frame[1] - correction_y),
+            max(1, round(frame[2]) - left - right), max(1, round(frame[3]) - top - bottom), gravity)
+
+
+def expected_frame(target, correction_x, correction_y, extents=(0, 0, 0, 0)):
+    """
+    Frame geometry a window ends up with after sending a target geometry
+    
+    Args:
+        target (tuple): Geometry to send (x, y, width, height, gravity), size of the client window
+        correction_x, correction_y: Corrections that were subtracted from the frame position
+        extents (tuple): Decoration sizes (left, right, top, bottom)
+        
+    Returns:
+        tuple: (x, y, width, height) of the frame
+    """
+    left, right, top, bottom = extents
+    return (round(target[0] + correction_x), round(target[1] + correction_y),
+            target[2] + left + right, target[3] + top + bottom)
+
+
+class GeometryBatch:
+    """
+    Collects geometry requests and sends them to the window manager together
+    
+    Requests are diffed against the current state first: windows that are
+    not maximized are not unmaximized and windows whose frame already has
+    the expected geometry are not configured again. The remaining requests
+    go through WNCK, or through the pipelined XCB backend if selected.
+    """
+    
+    # XID -> send time of geometries sent recently, to recognize our own configures
+    _sent = {}
+    
+    # XcbBackend used for sending, None sends through WNCK
+    backend = None
+    
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self._requests = []
+    
+    @classmethod
+    def recently_configured(cls, window):
+        """
+        Check whether geometry changes of a window are (likely) caused by a geometry we sent
+        
+        Args:
+            window: WNCK window object
+            
+        Returns:
+            bool: True within Config.SELF_CONFIGURE_GRACE_MS after sending the window a geometry
+        """
+        sent_at = cls._sent.get(window.get_xid())
+        if sent_at is None:
+            return False
+        if time.monotonic() - sent_at > Config.SELF_CONFIGURE_GRACE_MS / 1000:
+            del cls._sent[window.get_xid()]
+            return False
+        return True
+    
+    @classmethod
+    def use_backend(cls, name, verbose=False):
+        """
+        Select how geometries are sent (see Config.GEOMETRY_BACKENDS)
+        
+        Args:
+            name (str): 'wnck' or 'xcb'; 'xcb' falls back to WNCK if xcffib is missing
+            verbose (bool): Enable debug output
+            
+        Returns:
+            str: Name of the backend in use
+        """
+        cls.backend = None
+        if name == 'xcb':
+            if not xcb_available():
+                print("Warning: xcffib is not installed, using the wnck backend")
+                return 'wnck'
+            cls.backend = XcbBackend.shared(verbose=verbose)
+        if verbose:
+            print(f"Geometry backend: {name}")
+        return name
+    
+    def __len__(self):
+        return len(self._requests)
+    
+    def merge(self, other):
+        """Take over all queued requests of another batch"""
+        self._requests.extend(other._requests)
+        other._requests = []
+    
+    def add(self, window, target, frame=None):
+        """
+        Queue a geometry for a window
+        
+        Args:
+            window: WNCK window object
+            target (tuple): Final geometry (x, y, width, height, gravity)
+            frame (tuple): Expected frame geometry (see expected_frame()), enables diffing
+        """
+        self._requests.append((window, target, frame))
+    
+    @staticmethod
+    def needs_configure(window, frame):
+        """
+        Check whether a window has to be sent its target geometry
+        
+        Args:
+            window: WNCK window object
+            frame (tuple): Expected frame geometry or None (always configure)
+            
+        Returns:
+            bool: False if the window is already in place
+        """
+        if frame is None or window.is_maximized():
+            return True
+        return tuple(window.get_geometry()) != tuple(frame)
+    
+    def flush(self):
+        """
+        Send all queued geometries that change something and flush the connection once
+        
+        Returns:
+            int: Number of windows that were sent a geometry
+        """
+        flags = (Wnck.WindowMoveResizeMask.X | Wnck.WindowMoveResizeMask.Y |
+                 Wnck.WindowMoveResizeMask.WIDTH | Wnck.WindowMoveResizeMask.HEIGHT)
+        
+        requests, self._requests = self._requests, []
+        pipelined = []
+        sent = 0
+        for window, target, frame in requests:
+            if not self.needs_configure(window, frame):
+                metrics.increment('diff.skipped_configures')
+                if self.verbose:
+                    print(f"Batch: window {window.get_xid()} already at {frame}, skipped")
+                continue
+            
+            maximized = window.is_maximized()
+            if not maximized:
+                metrics.increment('diff.skipped_unmaximize')
+            if self.backend is not None:
+                pipelined.append((window.get_xid(), target, maximized))
+                GeometryBatch._sent[window.get_xid()] = time.monotonic()
+                sent += 1
+                if self.verbose:
+                    print(f"Batch: window {window.get_xid()} -> {target[:4]} (xcb)")
+                continue
+            
+            if maximized:
+                window.unmaximize()
+            window.set_geometry(
+                gravity=target[4],
+                geometry_mask=flags,
+                x=target[0],
+                y=target[1],
+                width=target[2],
+                height=target[3]
+            )
+            GeometryBatch._sent[window.get_xid()] = time.monotonic()
+            sent += 1
+            if self.verbose:
+                print(f"Batch: window {window.get_xid()} -> {target[:4]}")
+        
+        if pipelined:
+            failed = self.backend.move_resize(pipelined)
+            if failed and self.verbose:
+                print(f"Batch: {failed} of {len(pipelined)} requests failed")
+        elif sent:
+            display = Gdk.Display.get_default()
+            if display is not None:
+                display.flush()
+        if sent:
+            metrics.increment('batch.flushes')
+        
+        metrics.increment('batch.requests', sent)
+        return sent
@@ -3,7 +3,11 @@ Configuration and command-line argument parsing
 """
 
 import argparse
+import re
 from argparse import RawTextHelpFormatter
+from functools import lru_cache
+
+from .geometry import Screen
 
 
 class Config:
@@ -11,9 +15,9 @@ class Config:
     
     # Default screen configuration (fallback when auto-discovery fails)
     DEFAULT_SCREENS = [
-        {"name": "screen1", "x": 0, "y": 0, "width": 2560, "height": 1440 - 32},
-        {"name": "screen2", "x": 2560, "y": 0, "width": 2560, "height": 1440},
-        {"name": "screen3", "x": 2560 + 2560, "y": 0, "width": 1280, "height": 1024}
+        Screen.create("screen1", (0, 0, 2560, 1440 - 32)),
+        Screen.create("screen2", (2560, 0, 2560, 1440)),
+        Screen.create("screen3", (2560 + 2560, 0, 1280, 1024))
     ]
     
     # Enable automatic screen discovery
@@ -22,12 +26,143 @@ class Config:
     # Storage file for stateful window sizing
     STORAGE_FILE = "/tmp/pywin.json"
     
+    # Sub directory of $XDG_RUNTIME_DIR holding locks and other runtime files
+    RUNTIME_SUBDIR = "xfce-tile"
+    
+    # Singleton guard of the gesture reader (relative to the runtime directory)
+    GESTURE_LOCK_FILE = "mousy.lock"
+    
     # Valid positioning choices
-    POSITION_CHOICES = ['n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', 'center']
+    POSITION_CHOICES = ['n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', 'center', 'fill']
+    
+    # Grid positions: COLUMNSxROWS:COLUMN,ROW with 1-based cells, ranges like 1-2 span cells
+    GRID_POSITION_PATTERN = re.compile(r'^(\d+)x(\d+):(\d+)(?:-(\d+))?,(\d+)(?:-(\d+))?$')
+    
+    # Positions depending on other windows; they are not prefetched
+    DYNAMIC_POSITIONS = ['fill']
+    
+    # Criteria of --match (WM_CLASS, title words, process id)
+    MATCH_KEYS = ['class', 'title', 'pid']
+    
+    # Directions for focus/swap commands (west, east, north, south)
+    DIRECTION_CHOICES = ['w', 'e', 'n', 's']
+    
+    # Closed windows remembered per slot and class, so reopened windows keep their cycle order
+    SLOT_MAX_TOMBSTONES = 4
+    
+    # Cell size (px) of the spatial window index
+    SPATIAL_CELL_SIZE = 256
     
     # Default scaling factors for stateful mode
     DEFAULT_FACTORS = "1,1.334,1.5,2,3,4"
     
+    # Global shortcuts grabbed by the tiling daemon, mapped to command arguments.
+    # Mirrors the bindings created by xfce-setup-shortcuts.sh
+    SHORTCUTS = {
+        # Basic directional positioning (Alt + Numpad)
+        '<Alt>KP_1': '-p sw',
+        '<Alt>KP_2': '-p s',
+        '<Alt>KP_3': '-p se',
+        '<Alt>KP_4': '-p w',
+        '<Alt>KP_5': '-p center',
+        '<Alt>KP_6': '-p e',
+        '<Alt>KP_7': '-p nw',
+        '<Alt>KP_8': '-p n',
+        '<Alt>KP_9': '-p ne',
+        '<Alt>KP_0': '-p fill',
+        # Horizontal-only scaling (Ctrl+Super+Alt + Numpad)
+        '<Ctrl><Super><Alt>KP_1': '-p sw -o',
+        '<Ctrl><Super><Alt>KP_3': '-p se -o',
+        '<Ctrl><Super><Alt>KP_5': '-p center -o',
+        '<Ctrl><Super><Alt>KP_7': '-p nw -o',
+        '<Ctrl><Super><Alt>KP_9': '-p ne -o',
+        # Vertical-only scaling (Super+Alt + Numpad)
+        '<Super><Alt>KP_1': '-p sw -e',
+        '<Super><Alt>KP_3': '-p se -e',
+        '<Super><Alt>KP_5': '-p center -e',
+        '<Super><Alt>KP_7': '-p nw -e',
+        '<Super><Alt>KP_9': '-p ne -e',
+        # Directional focus (Super + Numpad)
+        '<Super>KP_4': '--focus w',
+        '<Super>KP_6': '--focus e',
+        '<Super>KP_8': '--focus n',
+        '<Super>KP_2': '--focus s',
+        # Swap with neighbour (Shift+Super + Numpad)
+        '<Shift><Super>KP_4': '--swap w',
+        '<Shift><Super>KP_6': '--swap e',
+        '<Shift><Super>KP_8': '--swap n',
+        '<Shift><Super>KP_2': '--swap s',
+        # Bring the next window of the active window's tile forward (Super + Numpad 5)
+        '<Super>KP_5': '--cycle',
+        # Move to adjacent screen (Ctrl+Super + Numpad)
+        '<Ctrl><Super>KP_4': '--monitor w',
+        '<Ctrl><Super>KP_6': '--monitor e',
+        '<Ctrl><Super>KP_8': '--monitor n',
+        '<Ctrl><Super>KP_2': '--monitor s',
+    }
+    
+    # Arguments added to every daemon shortcut (same as PARAMS of the setup script)
+    DAEMON_PARAMS = "-s --with-cursor"
+    
+    # Singleton guard of the tiling daemon (relative to the runtime directory)
+    DAEMON_LOCK_FILE = "tiled.lock"
+    
+    # Control socket of the daemon for scripted commands (relative to the runtime directory)
+    CONTROL_SOCKET = "tiled.sock"
+    
+    # Seconds a control connection may take to send its commands
+    CONTROL_TIMEOUT = 2
+    
+    # Upper bound (bytes) of the commands sent in one control connection
+    CONTROL_MAX_REQUEST = 1 << 20
+    
+    # Placement rules for newly opened windows (used by the daemon)
+    RULES_FILE = "~/.config/xfce-tile/rules.conf"
+    
+    # Learned placement per application (WM_CLASS + role), used by the daemon
+    PLACEMENT_MEMORY_FILE = "~/.cache/xfce-tile/placements.json"
+    
+    # Number of applications kept in the placement memory (least recently used are dropped)
+    PLACEMENT_MEMORY_SIZE = 256
+    
+    # New windows are collected this long (ms) before they are placed together
+    PLACEMENT_DEBOUNCE_MS = 15
+    
+    # Upper bound (ms) a new window waits while more windows keep arriving
+    PLACEMENT_MAX_DELAY_MS = 250
+    
+    # Geometry changes within this time (ms) after sending a window its geometry are not user resizes
+    SELF_CONFIGURE_GRACE_MS = 250
+    
+    # Edges of tiles closer than this (px) are linked when one of them is resized
+    LINKED_EDGE_TOLERANCE = 8
+    
+    # Linked tiles are not shrunk below this size (px)
+    LINKED_MIN_SIZE = 100
+    
+    # Resize propagation rate if the monitor refresh rate is unknown (Hz)
+    LINKED_FALLBACK_REFRESH_HZ = 60
+    
+    # Screen changes arrive in bursts; tracked tiles are re-applied once this long (ms) after the last
+    HOTPLUG_SETTLE_MS = 300
+    
+    # How geometries are sent: 'wnck', or 'xcb' to pipeline bulk operations (needs xcffib)
+    GEOMETRY_BACKEND = "wnck"
+    GEOMETRY_BACKENDS = ['wnck', 'xcb']
+    
+    # Screens and tiles published by the daemon for other processes (relative to the runtime directory)
+    SHARED_TABLE_FILE = "state.table"
+    
+    # Capacities of the shared table; tiles beyond the capacity are not published
+    SHARED_TABLE_MAX_SCREENS = 16
+    SHARED_TABLE_MAX_TILES = 1024
+    
+    # Attempts of a reader to copy the table while the daemon is writing it
+    SHARED_TABLE_READ_RETRIES = 100
+    
+    # Seconds a reader trusts an unchanged table before checking that its daemon still runs
+    SHARED_TABLE_LIVENESS_INTERVAL = 5
+    
     # Terminal application detection keywords
     TERMINAL_KEYWORDS = ['terminal', 'xterm', 'konsole', 'gnome-terminal']
     
@@ -38,10 +173,13 @@ class Config:
     }
 
 
-def parse_arguments():
+def parse_arguments(argv=None):
     """
     Parse command-line arguments
     
+    Args:
+        argv (list): Arguments to parse, defaults to sys.argv
+        
     Returns:
         argparse.Namespace: Parsed arguments
     """
@@ -50,13 +188,55 @@ def parse_arguments():
         formatter_class=RawTextHelpFormatter
     )
     
-    parser.add_argument(
+    action = parser.add_mutually_exclusive_group(required=True)
+    
+    action.add_argument(
         '-p', '--pos', 
         dest='position', 
         metavar="position", 
-        required=True, 
-        choices=Config.POSITION_CHOICES,
-        help=f'Direction to place window. Using abbreviations for directions like n=north ne=northeast and so on. Use one of: {",".join(Config.POSITION_CHOICES)}'
+        type=position_type,
+        help=f'Direction to place window. Using abbreviations for directions like n=north ne=northeast and so on. Use one of: {",".join(Config.POSITION_CHOICES)}\n'
+             'or a grid cell COLUMNSxROWS:COLUMN,ROW, e.g. 3x2:2,1 (spanning cells: 3x2:1-2,1)'
+    )
+    
+    action.add_argument(
+        '--focus',
+        dest='focus',
+        metavar="direction",
+        choices=Config.DIRECTION_CHOICES,
+        help=f'Focus the closest window in a direction. Use one of: {",".join(Config.DIRECTION_CHOICES)}'
+    )
+    
+    action.add_argument(
+        '--batch',
+        dest='batch',
+        metavar="file",
+        help="Execute one command per line from a file ('-' for stdin) and send all geometries together, e.g.\n"
+             "    --match class=firefox -p e\n"
+             "    --match class=xterm --all -p 2x2:1,2"
+    )
+    
+    action.add_argument(
+        '--cycle',
+        dest='cycle',
+        action='store_true',
+        help='Activate the least recently used other window tiled to the same slot as the active window'
+    )
+    
+    action.add_argument(
+        '--monitor',
+        dest='monitor',
+        metavar="direction",
+        choices=Config.DIRECTION_CHOICES,
+        help=f'Move the active window to the adjacent screen in a direction, keeping its tile. Use one of: {",".join(Config.DIRECTION_CHOICES)}'
+    )
+    
+    action.add_argument(
+        '--swap',
+        dest='swap',
+        metavar="direction",
+        choices=Config.DIRECTION_CHOICES,
+        help=f'Swap the active window with its closest neighbour in a direction. Use one of: {",".join(Config.DIRECTION_CHOICES)}'
     )
     
     parser.add_argument(
@@ -104,6 +284,14 @@ def parse_arguments():
         help='Place mouse cursor over moved window. Subsequent invocations should address same window if system activates windows on hover'
     )
     
+    parser.add_argument(
+        '-S', '--screen',
+        dest='screen',
+        metavar="name",
+        default=None,
+        help='Place window on this screen (e.g. screen-2) instead of the screen it is on'
+    )
+    
     parser.add_argument(
         '-m', '--my-factors', 
         dest='custom_factors', 
@@ -112,9 +300,200 @@ def parse_arguments():
         help='Comma delimited list of scale-factors to use. e.g. "1,1.5,2,3" This requires stateful option.'
     )
     
+    parser.add_argument(
+        '--match',
+        dest='match',
+        metavar="key=value",
+        type=match_type,
+        action='append',
+        default=None,
+        help='Apply the command to a window matching class=..., title=... (all words) or pid=...\n'
+             'instead of the active window. Repeat to combine criteria.'
+    )
+    
+    parser.add_argument(
+        '--all',
+        dest='all_matches',
+        action='store_true',
+        help='Apply the command to all windows matched by --match (positions only)'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        dest='backend',
+        choices=Config.GEOMETRY_BACKENDS,
+        default=Config.GEOMETRY_BACKEND,
+        help=f'How geometries are sent: wnck, or xcb to pipeline bulk operations (needs xcffib)\n'
+             f'Default: {Config.GEOMETRY_BACKEND}'
+    )
+    
+    return parser.parse_args(argv)
+
+
+def parse_daemon_arguments():
+    """
+    Parse command-line arguments of the tiling daemon
+    
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description='XFCE Window Tiling daemon - grabs the tiling shortcuts and tiles in-process',
+        formatter_class=RawTextHelpFormatter
+    )
+    
+    parser.add_argument(
+        '--params',
+        dest='params',
+        metavar="arguments",
+        default=Config.DAEMON_PARAMS,
+        help=f'Arguments added to every shortcut command. Default: "{Config.DAEMON_PARAMS}"'
+    )
+    
+    parser.add_argument(
+        '-r', '--rules',
+        dest='rules_file',
+        metavar="file",
+        default=Config.RULES_FILE,
+        help=f'Placement rules for new windows, one per line, e.g.\n'
+             f'    class=Terminal -> -p sw -f 2\n'
+             f'Default: {Config.RULES_FILE}'
+    )
+    
+    parser.add_argument(
+        '--send',
+        dest='send',
+        metavar="command",
+        default=None,
+        help='Execute a command in the running daemon and exit, e.g.\n'
+             '    tiled.py --send "--match class=firefox -p e"'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        dest='backend',
+        choices=Config.GEOMETRY_BACKENDS,
+        default=Config.GEOMETRY_BACKEND,
+        help=f'How geometries are sent: wnck, or xcb to pipeline bulk operations (needs xcffib)\n'
+             f'Default: {Config.GEOMETRY_BACKEND}'
+    )
+    
+    parser.add_argument(
+        '--no-memory',
+        dest='use_memory',
+        action='store_false',
+        help=f'Do not learn and restore placements per application ({Config.PLACEMENT_MEMORY_FILE})'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        dest='verbose',
+        action='store_true',
+        help='Print debugging output'
+    )
+    
     return parser.parse_args()
 
 
+def parse_layout_arguments():
+    """
+    Parse command-line arguments of the layout snapshot tool
+    
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description='XFCE Window Tiling - save and restore whole-desktop layouts',
+        formatter_class=RawTextHelpFormatter
+    )
+    
+    parser.add_argument(
+        'command',
+        choices=['save', 'restore'],
+        help='save: snapshot all windows into file\nrestore: move windows back to a snapshot'
+    )
+    
+    parser.add_argument(
+        'file',
+        help='Snapshot file'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        dest='verbose',
+        action='store_true',
+        help='Print debugging output'
+    )
+    
+    return parser.parse_args()
+
+
+@lru_cache(maxsize=256)
+def parse_grid_position(position):
+    """
+    Parse a grid position like '3x2:2,1' or '3x2:1-2,1'
+    
+    Args:
+        position (str): Position argument
+        
+    Returns:
+        tuple: (columns, rows, first_column, last_column, first_row, last_row) with
+               1-based cells, or None if the position is not a valid grid position
+    """
+    match = Config.GRID_POSITION_PATTERN.match(position)
+    if match is None:
+        return None
+    columns, rows, first_column, last_column, first_row, last_row = match.groups()
+    grid = (int(columns), int(rows),
+            int(first_column), int(last_column or first_column),
+            int(first_row), int(last_row or first_row))
+    if not (1 <= grid[2] <= grid[3] <= grid[0] and 1 <= grid[4] <= grid[5] <= grid[1]):
+        return None
+    return grid
+
+
+def grid_anchor(position):
+    """
+    Get the anchor equivalent of a position for edge dependent corrections
+    
+    Grid cells touching the right or bottom edge of the work area are
+    treated like e/s anchored tiles, cells in the middle like center.
+    
+    Args:
+        position (str): Anchor or grid position
+        
+    Returns:
+        str: Anchor position (n, ne, ..., center) or the position itself if it is not a grid
+    """
+    grid = parse_grid_position(position) if position else None
+    if grid is None:
+        return position
+    columns, rows, first_column, last_column, first_row, last_row = grid
+    vertical = 'n' if first_row == 1 else ('s' if last_row == rows else '')
+    horizontal = 'w' if first_column == 1 else ('e' if last_column == columns else '')
+    return (vertical + horizontal) or 'center'
+
+
+def match_type(value):
+    """argparse type of a --match criterion, returns (key, value)"""
+    key, separator, expected = value.partition('=')
+    key = key.strip().lower()
+    if not separator or key not in Config.MATCH_KEYS or not expected:
+        raise argparse.ArgumentTypeError(f"invalid match '{value}' (use {', '.join(k + '=...' for k in Config.MATCH_KEYS)})")
+    if key == 'pid' and not expected.isdigit():
+        raise argparse.ArgumentTypeError(f"invalid pid '{expected}'")
+    return key, expected
+
+
+def position_type(value):
+    """argparse type accepting anchor positions and grid positions"""
+    if value in Config.POSITION_CHOICES or parse_grid_position(value) is not None:
+        return value
+    raise argparse.ArgumentTypeError(
+        f"invalid position '{value}' (use one of {','.join(Config.POSITION_CHOICES)} or a grid cell like 3x2:1-2,1)"
+    )
+
+
 def get_factor_list(factor_string):
     """
     Parse factor string into list of floats
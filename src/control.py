@@ -0,0 +1,150 @@
+"""
+Control socket of the tiling daemon
+"""
+
+import os
+import socket
+
+from gi.repository import GLib
+
+from .config import Config
+
+
+class ControlServer:
+    """
+    Unix socket accepting command lines from scripts
+    
+    Every line of a connection is executed as a tiling command; the reply
+    holds one exit code per line.
+    """
+    
+    def __init__(self, path, handler, verbose=False):
+        """
+        Args:
+            path (str): Socket path
+            handler (callable): Executes a command string, returns its exit code
+            verbose (bool): Enable debug output
+        """
+        self.path = path
+        self.handler = handler
+        self.verbose = verbose
+        self._socket = None
+        self._source = None
+        # fd -> (connection, received data, watch source, timeout source)
+        self._connections = {}
+    
+    def start(self):
+        """Listen on the socket from the GLib main loop"""
+        # only one daemon runs (lock file), a left over socket is stale
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.path)
+        self._socket.listen(8)
+        self._socket.setblocking(False)
+        self._source = GLib.io_add_watch(self._socket.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN,
+                                         self._on_connection)
+        if self.verbose:
+            print(f"Listening for commands on {self.path}")
+    
+    def stop(self):
+        """Stop listening and remove the socket"""
+        if self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+        for fd in list(self._connections):
+            self._close(fd)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+    
+    def _on_connection(self, fd, condition):
+        try:
+            connection, _ = self._socket.accept()
+        except BlockingIOError:
+            return True
+        
+        # read from the main loop as data arrives, a slow client must not block other events
+        connection.setblocking(False)
+        source = GLib.io_add_watch(connection.fileno(), GLib.PRIORITY_DEFAULT,
+                                   GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR, self._on_readable)
+        timeout = GLib.timeout_add_seconds(Config.CONTROL_TIMEOUT, self._on_timeout, connection.fileno())
+        self._connections[connection.fileno()] = (connection, bytearray(), source, timeout)
+        return True
+    
+    def _on_readable(self, fd, condition):
+        connection, data = self._connections[fd][:2]
+        try:
+            while len(data) < Config.CONTROL_MAX_REQUEST:
+                chunk = connection.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        except BlockingIOError:
+            # clients close their sending side after the last command
+            return True
+        except OSError as e:
+            if self.verbose:
+                print(f"Control connection failed: {e}")
+            self._close(fd)
+            return False
+        
+        self._close(fd, reply=self._execute(data))
+        return False
+    
+    def _on_timeout(self, fd):
+        if self.verbose:
+            print("Control connection timed out")
+        self._close(fd)
+        return False
+    
+    def _execute(self, data):
+        results = [str(self.handler(line.strip()))
+                   for line in data.decode(errors='replace').splitlines() if line.strip()]
+        return ("\n".join(results) + "\n").encode()
+    
+    def _close(self, fd, reply=None):
+        """Send the reply (if any) and forget the connection"""
+        connection, _, source, timeout = self._connections.pop(fd)
+        # also called from the callbacks of these sources, removing them there is safe
+        GLib.source_remove(source)
+        GLib.source_remove(timeout)
+        with connection:
+            if reply is None:
+                return
+            try:
+                # the client waits for the reply, only a short one is sent
+                connection.settimeout(Config.CONTROL_TIMEOUT)
+                connection.sendall(reply)
+            except OSError as e:
+                if self.verbose:
+                    print(f"Control connection failed: {e}")
+
+
+def send_commands(path, commands, timeout=Config.CONTROL_TIMEOUT):
+    """
+    Execute commands in the running daemon
+    
+    Args:
+        path (str): Socket path of the daemon
+        commands (list): Command strings, e.g. ['--match class=firefox -p e']
+        timeout (float): Seconds to wait for each reply chunk
+        
+    Returns:
+        list: Exit code per command
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(path)
+        connection.sendall(("\n".join(commands) + "\n").encode())
+        connection.shutdown(socket.SHUT_WR)
+        
+        data = b""
+        while True:
+            chunk = connection.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+    return [int(line) for line in data.decode().split()]
@@ -0,0 +1,391 @@
+"""
+Resident tiling daemon: grabs the tiling shortcuts and tiles in-process
+"""
+
+import shlex
+import signal
+
+import gi
+gi.require_version('Gdk', '3.0')
+gi.require_version("Wnck", "3.0")
+from gi.repository import Gdk, GLib, Wnck
+
+from .config import Config, parse_arguments
+from .control import ControlServer
+from .hotkeys import HotkeyGrabber
+from .linked_edges import LinkedEdgeResizer
+from .metrics import metrics
+from .pending_layouts import PendingLayouts
+from .placement_queue import PlacementQueue
+from .prefetch import GeometryPrefetcher
+from .rules import RuleSet, window_properties
+from .screen_detection import find_screen_by_key, find_screen_by_name
+from .shared_table import SharedTableWriter
+from .spatial_index import SpatialIndex
+from .utils import get_runtime_path
+from .window_index import WindowIndex
+from .window_manager import ApplicationDetector, GeometryCorrector
+from .x_connection import XConnection
+
+
+class TilingDaemon:
+    """
+    Long running tiling service
+    
+    Key combinations are grabbed directly with XGrabKey and dispatched to the
+    tiling application without spawning a process per keypress.
+    """
+    
+    def __init__(self, app, params=Config.DAEMON_PARAMS, rules=None, memory=None, verbose=False):
+        """
+        Args:
+            app: XFCETilingApp instance executing the commands
+            params (str): Arguments added to every shortcut command
+            rules (RuleSet): Placement rules for newly opened windows
+            memory (PlacementMemory): Learned placements per application, None to disable
+            verbose (bool): Enable debug output
+        """
+        self.app = app
+        self.params = params
+        self.rules = rules or RuleSet()
+        self.memory = memory
+        self._memory_args = {}
+        self._save_source = None
+        self.verbose = verbose
+        self.connection = XConnection.shared(verbose=verbose)
+        self.grabber = HotkeyGrabber(self.connection, verbose=verbose)
+        self.loop = None
+        self.wnck_screen = None
+        self._commands = {}
+        self.prefetcher = GeometryPrefetcher(app, self._commands, verbose=verbose)
+        self._tracked_window = None
+        self._window_handlers = []
+        self._prefetch_source = None
+        self.placement_queue = PlacementQueue(app, verbose=verbose)
+        self.pending_layouts = PendingLayouts(verbose=verbose)
+        self.linked_edges = LinkedEdgeResizer(app, verbose=verbose)
+        self.placement_queue.deferred = self.pending_layouts
+        self.spatial_index = SpatialIndex()
+        app.spatial_index = self.spatial_index
+        self.window_index = WindowIndex()
+        app.window_index = self.window_index
+        self.control = ControlServer(get_runtime_path(Config.CONTROL_SOCKET), self.dispatch_control,
+                                     verbose=verbose)
+        self._screen_change_type = None
+        self._retile_source = None
+        self.shared_table = SharedTableWriter(get_runtime_path(Config.SHARED_TABLE_FILE), verbose=verbose)
+        self._published_screens = None
+        self._publish_source = None
+    
+    def run(self):
+        """Grab shortcuts and process events until terminated"""
+        # parse every shortcut once up front instead of per keypress
+        for accelerator, command in Config.SHORTCUTS.items():
+            self._commands[command] = self._parse_command(command)
+        
+        if self.grabber.grab_all(Config.SHORTCUTS) == 0:
+            print("Error: no shortcut could be grabbed")
+            return 1
+        
+        self._screen_change_type = self.connection.select_screen_changes()
+        
+        self.loop = GLib.MainLoop()
+        GLib.io_add_watch(self.connection.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self._on_x_readable)
+        self._connect_wnck_signals()
+        self.control.start()
+        self.shared_table.open()
+        self.app.tiles.on_change = self._schedule_publish
+        self._schedule_publish()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, self.stop)
+        
+        if self.verbose:
+            print("Tiling daemon running")
+        try:
+            self.loop.run()
+        finally:
+            if self.memory is not None:
+                self.memory.save()
+            self.control.stop()
+            self.shared_table.close()
+            self.grabber.ungrab_all()
+            self.connection.close()
+            if self.verbose:
+                metrics.report()
+        return 0
+    
+    def stop(self, *args):
+        """Leave the main loop"""
+        if self.loop is not None:
+            self.loop.quit()
+        return GLib.SOURCE_REMOVE
+    
+    def _connect_wnck_signals(self):
+        """Follow focus and topology changes to keep prefetched placements fresh"""
+        self.wnck_screen = Wnck.Screen.get_default()
+        self.wnck_screen.force_update()
+        self.wnck_screen.connect('active-window-changed', self._on_active_window_changed)
+        self.wnck_screen.connect('window-closed', self._on_window_closed)
+        self.wnck_screen.connect('window-opened', self._on_window_opened)
+        self.wnck_screen.connect('active-workspace-changed', self._on_active_workspace_changed)
+        for window in self.wnck_screen.get_windows():
+            self._track_window(window)
+        Gdk.Screen.get_default().connect('monitors-changed', self._on_monitors_changed)
+        self._on_active_window_changed(self.wnck_screen, None)
+    
+    def _on_active_window_changed(self, screen, previous_window):
+        for handler in self._window_handlers:
+            self._tracked_window.disconnect(handler)
+        self._window_handlers = []
+        
+        self._tracked_window = screen.get_active_window()
+        if self._tracked_window is not None:
+            self.app.slots.touch(self._tracked_window.get_xid())
+            self._window_handlers = [
+                self._tracked_window.connect('geometry-changed', self._schedule_prefetch),
+                self._tracked_window.connect('state-changed', self._schedule_prefetch),
+            ]
+        self._schedule_prefetch()
+    
+    def _track_window(self, window):
+        """Keep the spatial index current for a normal window"""
+        if window.get_window_type() != Wnck.WindowType.NORMAL:
+            return
+        for signal_name in ('geometry-changed', 'state-changed', 'workspace-changed'):
+            window.connect(signal_name, self._on_window_changed)
+        window.connect('geometry-changed', self.linked_edges.notify)
+        window.connect('state-changed', self._on_window_state_changed)
+        window.connect('name-changed', self.window_index.update_window)
+        self.spatial_index.update_window(window)
+        self.window_index.update_window(window)
+    
+    def _on_window_changed(self, window, *args):
+        self.spatial_index.update_window(window)
+    
+    def _on_window_state_changed(self, window, *args):
+        # (un)maximizing or fullscreen may add or remove decorations
+        GeometryCorrector.frame_extents.invalidate(window.get_xid())
+    
+    def _on_window_opened(self, screen, window):
+        """Tile a newly mapped window by rule or by its remembered placement"""
+        if window.get_window_type() != Wnck.WindowType.NORMAL:
+            return
+        self._track_window(window)
+        if len(self.rules) == 0 and not self.memory:
+            return
+        
+        properties = window_properties(window)
+        rule = self.rules.match(properties)
+        if rule is not None:
+            if self.verbose:
+                print(f"Rule {rule.index + 1} matches new window {window.get_xid()}: {rule.command}")
+            metrics.increment('rules.placements')
+            self.placement_queue.enqueue(window, rule.args)
+            return
+        
+        if self.memory is not None:
+            remembered = self.memory.recall(properties['class'], properties['role'])
+            if remembered is not None:
+                if self.verbose:
+                    print(f"Restoring remembered placement of {properties['class']}: {remembered}")
+                metrics.increment('memory.placements')
+                self.placement_queue.enqueue(window, self._args_for_memory(remembered))
+    
+    def _args_for_memory(self, remembered):
+        """Get (cached) tiling arguments for a remembered placement"""
+        position, factor, screen_key, horizontal_only, vertical_only = remembered
+        screen = self._resolve_screen(screen_key)
+        cache_key = (position, factor, screen, horizontal_only, vertical_only)
+        args = self._memory_args.get(cache_key)
+        if args is None:
+            argv = ['-p', position, '-f', str(factor)]
+            if screen is not None:
+                argv += ['--screen', screen]
+            if horizontal_only:
+                argv.append('-o')
+            if vertical_only:
+                argv.append('-e')
+            if self.verbose:
+                argv.append('--verbose')
+            args = self._memory_args[cache_key] = parse_arguments(argv)
+        return args
+    
+    def _resolve_screen(self, screen_key):
+        """Current name of a remembered screen, None (the window's screen) if that monitor is gone"""
+        if self._published_screens is None:
+            self._published_screens = self.app.discover_screens()
+        screen = find_screen_by_key(self._published_screens, screen_key)
+        if screen is None and isinstance(screen_key, str):
+            # memories written before screen keys hold the screen name
+            screen = find_screen_by_name(self._published_screens, screen_key)
+        return screen.name if screen is not None else None
+    
+    def _learn_placement(self):
+        """Remember the placement the last command made for its application"""
+        placement = self.app.last_placement
+        if self.memory is None or placement is None:
+            return
+        
+        properties = window_properties(placement['window'])
+        self.memory.remember(properties['class'], properties['role'], placement)
+        if self.memory.dirty and self._save_source is None:
+            self._save_source = GLib.timeout_add_seconds(2, self._save_memory)
+    
+    def _save_memory(self):
+        self._save_source = None
+        self.memory.save()
+        return GLib.SOURCE_REMOVE
+    
+    def _on_window_closed(self, screen, window):
+        self.placement_queue.discard(window)
+        self.pending_layouts.discard(window)
+        self.linked_edges.forget(window)
+        self.spatial_index.remove(window.get_xid())
+        self.window_index.remove(window.get_xid())
+        self.app.tiles.forget(window.get_xid())
+        self.app.slots.close(window.get_xid())
+        GeometryCorrector.frame_extents.invalidate(window.get_xid())
+        GeometryCorrector.size_hints.invalidate(window.get_xid())
+        ApplicationDetector.forget(window.get_xid())
+    
+    def _on_monitors_changed(self, *args):
+        """Screen topology changed (RandR or GDK), re-tile once the burst of change events settled"""
+        self._schedule_prefetch()
+        self._published_screens = None
+        if self._retile_source is not None:
+            GLib.source_remove(self._retile_source)
+        self._retile_source = GLib.timeout_add(Config.HOTPLUG_SETTLE_MS, self._on_retile_timeout)
+    
+    def _on_retile_timeout(self):
+        self._retile_source = None
+        try:
+            retiled = self.app.retile_all(deferred=self.pending_layouts)
+            if self.verbose:
+                print(f"Screens changed, re-tiled {retiled} windows")
+        except Exception as e:
+            if self.verbose:
+                print(f"Re-tiling failed: {e}")
+        self._schedule_prefetch()
+        self._published_screens = None
+        self._schedule_publish()
+        return GLib.SOURCE_REMOVE
+    
+    def _schedule_publish(self):
+        """Publish screens and tiles in the shared table once the main loop is idle"""
+        if self._publish_source is None:
+            self._publish_source = GLib.idle_add(self._publish)
+    
+    def _publish(self):
+        self._publish_source = None
+        try:
+            if self._published_screens is None:
+                self._published_screens = self.app.discover_screens()
+            self.shared_table.publish(self._published_screens, self.app.tiles.items())
+        except Exception as e:
+            if self.verbose:
+                print(f"Publishing the shared table failed: {e}")
+        return GLib.SOURCE_REMOVE
+    
+    def _on_active_workspace_changed(self, screen, previous_workspace):
+        """Apply placements deferred while the workspace was hidden"""
+        if len(self.pending_layouts) == 0:
+            return
+        entries = self.pending_layouts.take(screen.get_active_workspace(), self.app.tiles)
+        try:
+            self.app.apply_placements(entries)
+        except Exception as e:
+            if self.verbose:
+                print(f"Applying deferred placements failed: {e}")
+    
+    def _schedule_prefetch(self, *args):
+        """Recompute prefetched placements once the main loop is idle"""
+        self.prefetcher.clear()
+        if self._prefetch_source is None:
+            self._prefetch_source = GLib.idle_add(self._run_prefetch)
+    
+    def _run_prefetch(self):
+        self._prefetch_source = None
+        try:
+            self.prefetcher.prefetch(self._tracked_window)
+        except Exception as e:
+            if self.verbose:
+                print(f"Prefetch failed: {e}")
+        return GLib.SOURCE_REMOVE
+    
+    def _parse_command(self, command, with_params=True):
+        """Turn a command string into parsed tiling arguments"""
+        argv = (shlex.split(self.params) if with_params else []) + shlex.split(command)
+        if self.verbose:
+            argv.append('--verbose')
+        return parse_arguments(argv)
+    
+    def _on_x_readable(self, fd, condition):
+        self._process_x_events()
+        return True
+    
+    def _process_x_events(self):
+        """Dispatch all queued X events"""
+        display = self.connection.display
+        while display.pending_events():
+            event = display.next_event()
+            if event.type == self._screen_change_type:
+                self._on_monitors_changed()
+                continue
+            command = self.grabber.lookup(event)
+            if command is not None:
+                self.app.event_time = event.time
+                self.dispatch(command)
+    
+    def dispatch_control(self, command):
+        """
+        Execute a command received on the control socket
+        
+        Unlike shortcuts, scripted commands do not get the daemon parameters added.
+        
+        Args:
+            command (str): Command arguments, e.g. '--match class=firefox -p e'
+            
+        Returns:
+            int: Exit code of the command (2 for unparsable commands)
+        """
+        try:
+            args = self._parse_command(command, with_params=False)
+        except SystemExit:
+            return 2
+        
+        metrics.increment('daemon.control_commands')
+        self.app.event_time = 0
+        with metrics.timer('daemon.command'):
+            result = self.app.execute(args)
+        self._schedule_prefetch()
+        return result
+    
+    def dispatch(self, command):
+        """
+        Execute a command string in-process
+        
+        Args:
+            command (str): Command arguments, e.g. '-p sw -o'
+            
+        Returns:
+            int: Exit code of the command
+        """
+        args = self._commands.get(command)
+        if args is None:
+            args = self._commands[command] = self._parse_command(command)
+        
+        placement = None
+        if self.wnck_screen is not None:
+            placement = self.prefetcher.take(self.wnck_screen.get_active_window(), command)
+        
+        metrics.increment('daemon.commands')
+        self.app.last_placement = None
+        with metrics.timer('daemon.command'):
+            result = self.app.execute(args, placement=placement)
+        
+        if result == 0:
+            self._learn_placement()
+        
+        # the factor cycle advanced, the next prediction differs
+        self._schedule_prefetch()
+        return result
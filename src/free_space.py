@@ -0,0 +1,113 @@
+"""
+Search for free (uncovered) space of a work area
+"""
+
+from bisect import bisect_right
+
+
+def largest_free_rectangle(area, obstacles, anchor=None):
+    """
+    Find the largest rectangle of an area not covered by any obstacle
+    
+    Sweep over candidate top edges (area top and obstacle bottoms). For each
+    top the free x-intervals are narrowed by obstacles in order of their top
+    edge, emitting a maximal rectangle whenever an interval gets blocked.
+    Tops and intervals that cannot beat the best rectangle found so far are
+    pruned, which keeps the search fast for many obstacles.
+    
+    Args:
+        area (tuple): Work area (x, y, width, height)
+        obstacles (list): Rectangles (x, y, width, height) covering the area
+        anchor (tuple): Optional rectangle; free rectangles overlapping it are preferred
+        
+    Returns:
+        tuple: (x, y, width, height) of the free rectangle, or None if the area is fully covered
+    """
+    area_left, area_top = area[0], area[1]
+    area_right, area_bottom = area[0] + area[2], area[1] + area[3]
+    
+    # obstacles as clipped edges (left, top, right, bottom), sorted by top
+    boxes = []
+    for x, y, width, height in obstacles:
+        left, top = max(x, area_left), max(y, area_top)
+        right, bottom = min(x + width, area_right), min(y + height, area_bottom)
+        if left < right and top < bottom:
+            boxes.append((top, left, right, bottom))
+    boxes.sort()
+    
+    if anchor is not None:
+        anchor_left, anchor_top = anchor[0], anchor[1]
+        anchor_right, anchor_bottom = anchor[0] + anchor[2], anchor[1] + anchor[3]
+    
+    best = [0, None]
+    best_anchored = [0, None]
+    
+    def emit(left, top, right, bottom):
+        size = (right - left) * (bottom - top)
+        if size > best[0]:
+            best[0], best[1] = size, (left, top, right - left, bottom - top)
+        if (anchor is not None and size > best_anchored[0] and
+                left < anchor_right and right > anchor_left and
+                top < anchor_bottom and bottom > anchor_top):
+            best_anchored[0], best_anchored[1] = size, (left, top, right - left, bottom - top)
+    
+    def worth_keeping(left, right, top):
+        bound = (right - left) * (area_bottom - top)
+        if bound > best[0]:
+            return True
+        return (anchor is not None and bound > best_anchored[0] and
+                left < anchor_right and right > anchor_left and top < anchor_bottom)
+    
+    tops = sorted({area_top} | {box[3] for box in boxes if box[3] < area_bottom})
+    first_below = 0
+    covering = []
+    
+    for top in tops:
+        if not worth_keeping(area_left, area_right, top):
+            break
+        
+        # boxes[first_below:] start below this top, covering holds those crossing it
+        covering = [box for box in covering if box[3] > top]
+        while first_below < len(boxes) and boxes[first_below][0] <= top:
+            if boxes[first_below][3] > top:
+                covering.append(boxes[first_below])
+            first_below += 1
+        covering.sort(key=lambda box: box[1])
+        
+        # free intervals of the row at 'top'
+        lefts, rights = [], []
+        cursor = area_left
+        for _, left, right, _ in covering:
+            if left > cursor and worth_keeping(cursor, left, top):
+                lefts.append(cursor)
+                rights.append(left)
+            cursor = max(cursor, right)
+        if cursor < area_right and worth_keeping(cursor, area_right, top):
+            lefts.append(cursor)
+            rights.append(area_right)
+        
+        # intervals stay sorted and disjoint, so the ones a box blocks are found by bisection
+        for box_top, box_left, box_right, box_bottom in boxes[first_below:]:
+            if not lefts:
+                break
+            first = bisect_right(rights, box_left)
+            last = first
+            pieces_left, pieces_right = [], []
+            while last < len(lefts) and lefts[last] < box_right:
+                left, right = lefts[last], rights[last]
+                emit(left, top, right, box_top)
+                if box_left > left and worth_keeping(left, box_left, top):
+                    pieces_left.append(left)
+                    pieces_right.append(box_left)
+                if box_right < right and worth_keeping(box_right, right, top):
+                    pieces_left.append(box_right)
+                    pieces_right.append(right)
+                last += 1
+            if last > first:
+                lefts[first:last] = pieces_left
+                rights[first:last] = pieces_right
+        
+        for left, right in zip(lefts, rights):
+            emit(left, top, right, area_bottom)
+    
+    return best_anchored[1] or best[1]
@@ -0,0 +1,99 @@
+"""
+Compact geometry model: rectangles, screens and tile records
+"""
+
+from collections import namedtuple
+
+
+class Rect(namedtuple('Rect', ['x', 'y', 'width', 'height'])):
+    """
+    Rectangle (x, y, width, height)
+    
+    A plain tuple underneath, so it unpacks and compares like the geometry
+    tuples WNCK returns.
+    """
+    
+    __slots__ = ()
+
+
+class Screen(namedtuple('Screen', ['name', 'x', 'y', 'width', 'height',
+                                   'monitor_x', 'monitor_y', 'monitor_width', 'monitor_height', 'connector'],
+                         defaults=(None,))):
+    """
+    Monitor with its work area
+    
+    x, y, width and height describe the work area (monitor minus panels),
+    the monitor_* fields the physical monitor. Screens are immutable and
+    hashable, a list of them describes the whole topology.
+    
+    Names (screen-N) follow the monitor order and change when a monitor is
+    unplugged; key identifies the physical monitor across such changes.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def create(cls, name, work_area, monitor=None, connector=None):
+        """
+        Build a screen from rectangles
+        
+        Args:
+            name (str): Screen name, e.g. 'screen-1'
+            work_area (tuple): (x, y, width, height) available for windows
+            monitor (tuple): (x, y, width, height) of the monitor, defaults to the work area
+            connector (str): Output name, e.g. 'DP-1', if known
+        
+        Returns:
+            Screen: New screen
+        """
+        if monitor is None:
+            monitor = work_area
+        return cls(name, work_area[0], work_area[1], work_area[2], work_area[3],
+                   monitor[0], monitor[1], monitor[2], monitor[3], connector)
+    
+    @property
+    def key(self):
+        """Stable identity of the monitor: its connector, or its rectangle if unknown"""
+        return self.connector or self.monitor
+    
+    @property
+    def work_area(self):
+        return Rect(self.x, self.y, self.width, self.height)
+    
+    @property
+    def monitor(self):
+        return Rect(self.monitor_x, self.monitor_y, self.monitor_width, self.monitor_height)
+
+
+class WindowRecord:
+    """
+    Tile of a window: how it was placed and the frame it got
+    
+    Mutable (the frame follows linked resizes) and without a per instance
+    dict, so the daemon can hold many of them cheaply.
+    """
+    
+    __slots__ = ('position', 'factor', 'screen', 'horizontal_only', 'vertical_only', 'frame', 'screen_key')
+    
+    def __init__(self, position, factor, screen, horizontal_only=False, vertical_only=False, frame=None,
+                 screen_key=None):
+        """
+        Args:
+            position (str): Position argument the window was placed with
+            factor (float): Scaling factor used
+            screen (str): Name of the screen the window was placed on
+            horizontal_only, vertical_only (bool): Placement was restricted to one axis
+            frame (tuple): Frame geometry (x, y, width, height) or None if unknown
+            screen_key: Screen.key of that screen, survives renamed screens
+        """
+        self.position = position
+        self.factor = factor
+        self.screen = screen
+        self.horizontal_only = horizontal_only
+        self.vertical_only = vertical_only
+        self.frame = Rect(*frame[:4]) if frame is not None else None
+        self.screen_key = screen_key
+    
+    def __repr__(self):
+        return (f"WindowRecord(position={self.position!r}, factor={self.factor!r}, screen={self.screen!r}, "
+                f"frame={tuple(self.frame) if self.frame is not None else None})")
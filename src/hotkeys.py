@@ -0,0 +1,167 @@
+"""
+Keyboard accelerator parsing for X key and button grabs
+"""
+
+from Xlib import X, XK, error
+
+
+# Modifier names as used by xfce4-keyboard-shortcuts accelerators
+MODIFIER_MASKS = {
+    'shift': X.ShiftMask,
+    'ctrl': X.ControlMask,
+    'control': X.ControlMask,
+    'primary': X.ControlMask,
+    'alt': X.Mod1Mask,
+    'mod1': X.Mod1Mask,
+    'super': X.Mod4Mask,
+    'mod4': X.Mod4Mask,
+}
+
+# Lock modifiers that must not prevent a grab from matching (CapsLock, NumLock)
+LOCK_MASKS = (X.LockMask, X.Mod2Mask)
+
+
+def parse_accelerator(accelerator):
+    """
+    Split an accelerator like '<Ctrl><Super><Alt>KP_1' into key and modifiers
+    
+    Args:
+        accelerator (str): Accelerator string in GTK/xfconf notation
+        
+    Returns:
+        tuple: (key_name, modifier_mask)
+    """
+    modifiers = 0
+    rest = accelerator.strip()
+    while rest.startswith('<'):
+        end = rest.find('>')
+        if end < 0:
+            raise ValueError(f"Invalid accelerator: {accelerator}")
+        name = rest[1:end].lower()
+        if name not in MODIFIER_MASKS:
+            raise ValueError(f"Unknown modifier '{name}' in accelerator: {accelerator}")
+        modifiers |= MODIFIER_MASKS[name]
+        rest = rest[end + 1:]
+    
+    if not rest:
+        raise ValueError(f"Accelerator without key: {accelerator}")
+    
+    return rest, modifiers
+
+
+def lookup_keycode(display, key_name):
+    """
+    Resolve a key name (e.g. 'KP_1') to a keycode of the current keymap
+    
+    Args:
+        display: Xlib display
+        key_name (str): X keysym name
+        
+    Returns:
+        int: Keycode
+    """
+    keysym = XK.string_to_keysym(key_name)
+    if keysym == X.NoSymbol:
+        raise ValueError(f"Unknown key: {key_name}")
+    keycode = display.keysym_to_keycode(keysym)
+    if not keycode:
+        raise ValueError(f"Key not present in keymap: {key_name}")
+    return keycode
+
+
+def modifier_variants(modifiers):
+    """
+    Get modifier masks to grab so that CapsLock/NumLock state is ignored
+    
+    Args:
+        modifiers (int): Modifier mask of the accelerator
+        
+    Returns:
+        list: Modifier masks including all lock combinations
+    """
+    variants = [modifiers]
+    for lock in LOCK_MASKS:
+        variants += [variant | lock for variant in variants]
+    return variants
+
+
+def clean_modifiers(state):
+    """Strip lock modifiers and mouse button state from an event state"""
+    relevant = 0
+    for mask in MODIFIER_MASKS.values():
+        relevant |= mask
+    return state & relevant
+
+
+class HotkeyGrabber:
+    """Grabs global key combinations on the root window (XGrabKey)"""
+    
+    def __init__(self, connection, verbose=False):
+        self.connection = connection
+        self.verbose = verbose
+        self.bindings = {}
+    
+    def grab_all(self, shortcuts):
+        """
+        Grab all accelerators of a shortcut table
+        
+        Args:
+            shortcuts (dict): Accelerator string -> action
+            
+        Returns:
+            int: Number of successfully grabbed accelerators
+        """
+        display = self.connection.display
+        root = self.connection.root
+        pending = []
+        
+        for accelerator, action in shortcuts.items():
+            try:
+                key_name, modifiers = parse_accelerator(accelerator)
+                keycode = lookup_keycode(display, key_name)
+            except ValueError as e:
+                print(f"Warning: skipping shortcut {accelerator}: {e}")
+                continue
+            
+            catcher = error.CatchError(error.BadAccess)
+            for variant in modifier_variants(modifiers):
+                root.grab_key(keycode, variant, False, X.GrabModeAsync, X.GrabModeAsync,
+                              onerror=catcher)
+            pending.append((accelerator, keycode, modifiers, action, catcher))
+        
+        # a single round trip reports all failed grabs
+        self.connection.sync()
+        
+        for accelerator, keycode, modifiers, action, catcher in pending:
+            if catcher.get_error():
+                print(f"Warning: {accelerator} is already grabbed by another client "
+                      f"(remove the xfce4 custom command for it)")
+                continue
+            self.bindings[(keycode, modifiers)] = action
+            if self.verbose:
+                print(f"Grabbed {accelerator} -> {action}")
+        
+        return len(self.bindings)
+    
+    def ungrab_all(self):
+        """Release all grabs made by this grabber"""
+        root = self.connection.root
+        for keycode, modifiers in self.bindings:
+            for variant in modifier_variants(modifiers):
+                root.ungrab_key(keycode, variant)
+        self.bindings.clear()
+        self.connection.flush()
+    
+    def lookup(self, event):
+        """
+        Find the action bound to a key press event
+        
+        Args:
+            event: Xlib KeyPress event
+            
+        Returns:
+            Bound action or None
+        """
+        if event.type != X.KeyPress:
+            return None
+        return self.bindings.get((event.detail, clean_modifiers(event.state)))
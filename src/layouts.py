@@ -0,0 +1,213 @@
+"""
+Snapshots of whole-desktop layouts
+"""
+
+import json
+import os
+
+import gi
+gi.require_version("Wnck", "3.0")
+from gi.repository import Wnck
+
+from .batch import GeometryBatch, client_target, expected_frame
+from .metrics import metrics
+from .screen_detection import find_window_screen
+from .window_manager import ApplicationDetector, GeometryCorrector
+
+
+# Version of the snapshot file format
+LAYOUT_VERSION = 1
+
+# Column order of a window row in the snapshot file
+LAYOUT_FIELDS = ['xid', 'class', 'role', 'title', 'workspace', 'screen',
+                 'x', 'y', 'width', 'height', 'maximized', 'position', 'factor']
+
+# Workspace number stored for windows shown on all workspaces
+PINNED = -1
+
+
+def is_managed(window):
+    """True for windows a layout covers (normal, listed in the tasklist)"""
+    return (window.get_window_type() == Wnck.WindowType.NORMAL and
+            not window.is_skip_tasklist())
+
+
+def capture_layout(wnck_screen, screens, tiles=None):
+    """
+    Capture geometry, workspace, screen and tile state of all managed windows
+    
+    Args:
+        wnck_screen: WNCK screen
+        screens (list): Current screens
+        tiles (dict): Optional XID -> (position, factor) of known tiles
+        
+    Returns:
+        dict: Snapshot
+    """
+    tiles = tiles or {}
+    rows = []
+    for window in wnck_screen.get_windows():
+        if not is_managed(window):
+            continue
+        
+        xid = window.get_xid()
+        app_info = ApplicationDetector.analyze_window(window)
+        x, y, width, height = window.get_geometry()
+        workspace = window.get_workspace()
+        screen = find_window_screen(max(0, x), max(0, y), width, height, screens)
+        position, factor = tiles.get(xid, (None, None))
+        
+        rows.append([
+            xid, app_info['window_class'], (window.get_role() or "").lower(), app_info['window_name'],
+            workspace.get_number() if workspace is not None and not window.is_pinned() else PINNED,
+            screen.name, x, y, width, height, int(window.is_maximized()), position, factor
+        ])
+    
+    return {'version': LAYOUT_VERSION, 'fields': LAYOUT_FIELDS, 'windows': rows}
+
+
+def save_layout(path, snapshot):
+    """Write a snapshot as compact JSON"""
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+
+
+def load_layout(path):
+    """
+    Read a snapshot file
+    
+    Returns:
+        list: Window records as dicts keyed by LAYOUT_FIELDS
+    """
+    with open(os.path.expanduser(path), 'r') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version') != LAYOUT_VERSION:
+        raise ValueError(f"Unsupported layout version: {snapshot.get('version')}")
+    fields = snapshot['fields']
+    return [dict(zip(fields, row)) for row in snapshot['windows']]
+
+
+class LayoutRestorer:
+    """Matches snapshot records to current windows and applies only the differences"""
+    
+    def __init__(self, wnck_screen, verbose=False):
+        self.wnck_screen = wnck_screen
+        self.verbose = verbose
+        self.matched = []
+    
+    def match(self, records):
+        """
+        Pair snapshot records with current windows
+        
+        Windows are matched by XID first, then by class and title, then by class.
+        
+        Args:
+            records (list): Snapshot records
+            
+        Returns:
+            list: (window, record) pairs
+        """
+        windows = [window for window in self.wnck_screen.get_windows() if is_managed(window)]
+        by_xid = {window.get_xid(): window for window in windows}
+        pairs = []
+        unmatched = []
+        
+        for record in records:
+            window = by_xid.pop(record['xid'], None)
+            if window is not None:
+                pairs.append((window, record))
+            else:
+                unmatched.append(record)
+        
+        if unmatched:
+            # remaining windows indexed by class and by (class, title)
+            by_title = {}
+            by_class = {}
+            for window in by_xid.values():
+                app_info = ApplicationDetector.analyze_window(window)
+                by_title.setdefault((app_info['window_class'], app_info['window_name']), []).append(window)
+                by_class.setdefault(app_info['window_class'], []).append(window)
+            
+            used = set()
+            for key_name, index in (('title', by_title), ('class', by_class)):
+                still_unmatched = []
+                for record in unmatched:
+                    key = (record['class'], record['title']) if key_name == 'title' else record['class']
+                    candidates = [window for window in index.get(key, ()) if window.get_xid() not in used]
+                    if candidates:
+                        used.add(candidates[0].get_xid())
+                        pairs.append((candidates[0], record))
+                    else:
+                        still_unmatched.append(record)
+                unmatched = still_unmatched
+        
+        if self.verbose:
+            print(f"Matched {len(pairs)} of {len(records)} snapshot windows")
+        return pairs
+    
+    def restore(self, records):
+        """
+        Restore a snapshot in one batched pass
+        
+        Args:
+            records (list): Snapshot records
+            
+        Returns:
+            int: Number of windows that were changed
+        """
+        with metrics.timer('layout.restore'):
+            batch = GeometryBatch(verbose=self.verbose)
+            changed = 0
+            self.matched = self.match(records)
+            if GeometryBatch.backend is not None:
+                GeometryCorrector.prime_caches([window for window, _ in self.matched], GeometryBatch.backend)
+            for window, record in self.matched:
+                if self._restore_window(window, record, batch):
+                    changed += 1
+            batch.flush()
+        
+        if self.verbose:
+            print(f"Restored layout: {changed} windows changed")
+        return changed
+    
+    def _restore_window(self, window, record, batch):
+        """Queue the changes of one window, returns True if anything differs"""
+        changed = False
+        
+        workspace = window.get_workspace()
+        if record['workspace'] == PINNED:
+            if not window.is_pinned():
+                window.pin()
+                changed = True
+        else:
+            if window.is_pinned():
+                window.unpin()
+                changed = True
+            if workspace is None or workspace.get_number() != record['workspace']:
+                target_workspace = self.wnck_screen.get_workspace(record['workspace'])
+                if target_workspace is not None:
+                    window.move_to_workspace(target_workspace)
+                    changed = True
+        
+        if record['maximized']:
+            if not window.is_maximized():
+                window.maximize()
+                changed = True
+            return changed
+        
+        frame = (record['x'], record['y'], record['width'], record['height'])
+        if tuple(window.get_geometry()) != frame or window.is_maximized():
+            app_info = ApplicationDetector.analyze_window(window)
+            correction_x, correction_y = GeometryCorrector.calculate_window_corrections(
+                window, app_info, record['position']
+            )
+            extents = GeometryCorrector.decoration_sizes(window, app_info['window_class'])
+            target = client_target(frame, correction_x, correction_y, extents, Wnck.WindowGravity.NORTHWEST)
+            batch.add(window, target, expected_frame(target, correction_x, correction_y, extents))
+            changed = True
+        
+        return changed
@@ -0,0 +1,180 @@
+"""
+Linked-edge resizing of adjacent tiles
+"""
+
+import gi
+gi.require_version('Gdk', '3.0')
+gi.require_version("Wnck", "3.0")
+from gi.repository import Gdk, GLib, Wnck
+
+from .batch import GeometryBatch
+from .config import Config
+from .metrics import metrics
+from .pending_layouts import is_shown
+
+
+def refresh_interval_ms():
+    """Frame interval (ms) of the primary monitor, falls back to Config.LINKED_FALLBACK_REFRESH_HZ"""
+    rate_hz = Config.LINKED_FALLBACK_REFRESH_HZ
+    display = Gdk.Display.get_default()
+    if display is not None:
+        monitor = display.get_primary_monitor() or display.get_monitor(0)
+        if monitor is not None and monitor.get_refresh_rate() > 0:
+            # GDK reports millihertz
+            rate_hz = monitor.get_refresh_rate() / 1000
+    return max(1, int(1000 / rate_hz))
+
+
+def linked_frames(old, new, neighbours, tolerance=Config.LINKED_EDGE_TOLERANCE,
+                  min_size=Config.LINKED_MIN_SIZE):
+    """
+    Follow the resized edges of a tile with the tiles sharing them
+    
+    A neighbour shares an edge if its opposite edge lies on the old edge
+    (within tolerance) and both overlap along it.
+    
+    Args:
+        old (tuple): Frame (x, y, width, height) before the resize
+        new (tuple): Frame after the resize
+        neighbours (dict): Key -> frame of the other tiles
+        tolerance (int): Maximum distance (px) of linked edges
+        min_size (int): Neighbours are not shrunk below this size
+    
+    Returns:
+        dict: Key -> new frame of the neighbours that change
+    """
+    old_left, old_top, old_right, old_bottom = old[0], old[1], old[0] + old[2], old[1] + old[3]
+    new_left, new_top, new_right, new_bottom = new[0], new[1], new[0] + new[2], new[1] + new[3]
+    
+    changed = {}
+    for key, frame in neighbours.items():
+        left, top, right, bottom = frame[0], frame[1], frame[0] + frame[2], frame[1] + frame[3]
+        overlaps_vertically = min(bottom, old_bottom) > max(top, old_top)
+        overlaps_horizontally = min(right, old_right) > max(left, old_left)
+        
+        if overlaps_vertically:
+            if new_right != old_right and abs(left - old_right) <= tolerance:
+                left = new_right
+            elif new_left != old_left and abs(right - old_left) <= tolerance:
+                right = new_left
+        if overlaps_horizontally:
+            if new_bottom != old_bottom and abs(top - old_bottom) <= tolerance:
+                top = new_bottom
+            elif new_top != old_top and abs(bottom - old_top) <= tolerance:
+                bottom = new_top
+        
+        resized = (left, top, right - left, bottom - top)
+        if resized != tuple(frame) and resized[2] >= min_size and resized[3] >= min_size:
+            changed[key] = resized
+    return changed
+
+
+class LinkedEdgeResizer:
+    """
+    Propagates user resizes of a tile to the tiles sharing its edges
+    
+    Geometry changes are only noted when they arrive; at most once per
+    monitor frame the latest geometry of every changed tile is examined and
+    the resulting neighbour geometries are sent in one batch. Changes caused
+    by geometries we sent ourselves are ignored.
+    """
+    
+    def __init__(self, app, verbose=False):
+        """
+        Args:
+            app: XFCETilingApp holding the tile registry
+            verbose (bool): Enable debug output
+        """
+        self.app = app
+        self.verbose = verbose
+        self.interval_ms = None
+        self._changed = {}
+        self._source = None
+    
+    def notify(self, window):
+        """
+        Note a geometry change of a window (called for every ConfigureNotify)
+        
+        Args:
+            window: WNCK window object
+        """
+        if self.app.tiles.get(window.get_xid()) is None:
+            return
+        metrics.increment('linked_edges.events')
+        self._changed[window.get_xid()] = window
+        if self._source is None:
+            if self.interval_ms is None:
+                self.interval_ms = refresh_interval_ms()
+            self._source = GLib.timeout_add(self.interval_ms, self._on_frame)
+    
+    def forget(self, window):
+        """Drop pending changes of a window (e.g. the window was closed)"""
+        self._changed.pop(window.get_xid(), None)
+    
+    def _on_frame(self):
+        self._source = None
+        changed, self._changed = self._changed, {}
+        try:
+            self.propagate(changed.values())
+        except Exception as e:
+            if self.verbose:
+                print(f"Linked resize failed: {e}")
+        return GLib.SOURCE_REMOVE
+    
+    def propagate(self, windows):
+        """
+        Resize the neighbours of user-resized tiles
+        
+        Args:
+            windows (iterable): WNCK windows whose geometry changed
+        
+        Returns:
+            int: Number of reconfigured neighbours
+        """
+        tiles = self.app.tiles
+        latest = {}
+        for window in windows:
+            xid = window.get_xid()
+            tile = tiles.get(xid)
+            if tile is None or tile.frame is None or window.is_maximized() or window.is_minimized():
+                continue
+            if GeometryBatch.recently_configured(window):
+                # our own configure, the tile now has the frame the window manager gave it
+                metrics.increment('linked_edges.own_configures')
+                tiles.update_frame(xid, window.get_geometry())
+                continue
+            
+            old, new = tile.frame, tuple(window.get_geometry())
+            if new == old:
+                continue
+            if (new[2], new[3]) == (old[2], old[3]):
+                # moved away by hand, not part of the tiling anymore
+                tiles.forget(xid)
+                continue
+            tiles.update_frame(xid, new)
+            
+            workspace = window.get_workspace()
+            neighbours = {}
+            for other_xid, other_tile in tiles.items():
+                if other_xid == xid or other_tile.frame is None:
+                    continue
+                other = Wnck.Window.get(other_xid)
+                if other is None or other.is_minimized() or other.is_maximized() or not is_shown(other, workspace):
+                    continue
+                neighbours[other] = latest[other][1] if other in latest else other_tile.frame
+            
+            for other, frame in linked_frames(old, new, neighbours).items():
+                latest[other] = self.app.target_for_frame(other, frame)
+                tiles.update_frame(other.get_xid(), latest[other][1])
+        
+        if not latest:
+            return 0
+        
+        batch = GeometryBatch(verbose=self.verbose)
+        for other, (target, frame) in latest.items():
+            batch.add(other, target, frame)
+        resized = batch.flush()
+        metrics.increment('linked_edges.resizes', resized)
+        if self.verbose:
+            print(f"Linked resize: moved {resized} neighbouring tiles")
+        return resized
@@ -0,0 +1,82 @@
+"""
+Lightweight runtime instrumentation (counters and timings)
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Collects named counters and timings for the running process"""
+    
+    def __init__(self):
+        self.counters = {}
+        self.timings = {}
+        self.values = {}
+    
+    def increment(self, name, amount=1):
+        """
+        Increase a named counter
+        
+        Args:
+            name (str): Counter name, e.g. 'x.round_trips'
+            amount (int): Value to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def get(self, name):
+        """Return current value of a counter (0 if never incremented)"""
+        return self.counters.get(name, 0)
+    
+    def record_time(self, name, seconds):
+        """
+        Record a single duration sample
+        
+        Args:
+            name (str): Timing name
+            seconds (float): Measured duration in seconds
+        """
+        count, total, maximum = self.timings.get(name, (0, 0.0, 0.0))
+        self.timings[name] = (count + 1, total + seconds, max(maximum, seconds))
+    
+    def observe(self, name, value):
+        """
+        Record a sample of a unitless value (e.g. a queue depth)
+        
+        Args:
+            name (str): Value name
+            value (float): Observed value
+        """
+        count, total, maximum = self.values.get(name, (0, 0.0, value))
+        self.values[name] = (count + 1, total + value, max(maximum, value))
+    
+    @contextmanager
+    def timer(self, name):
+        """Context manager measuring the duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, time.perf_counter() - start)
+    
+    def reset(self):
+        """Drop all collected values"""
+        self.counters.clear()
+        self.timings.clear()
+        self.values.clear()
+    
+    def report(self):
+        """Print all counters and timings"""
+        print("Metrics:")
+        for name in sorted(self.counters):
+            print(f"  {name}: {self.counters[name]}")
+        for name in sorted(self.timings):
+            count, total, maximum = self.timings[name]
+            print(f"  {name}: n={count} avg={total / count * 1000:.2f}ms max={maximum * 1000:.2f}ms")
+        for name in sorted(self.values):
+            count, total, maximum = self.values[name]
+            print(f"  {name}: n={count} avg={total / count:.1f} max={maximum}")
+
+
+# Process-wide instance shared by all modules
+metrics = Metrics()
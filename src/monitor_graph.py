@@ -0,0 +1,115 @@
+"""
+Adjacency of monitors for moving windows between screens
+"""
+
+from .spatial_index import DIRECTIONS
+
+
+def monitor_rect(screen):
+    """Get (left, top, right, bottom) of a screen's monitor"""
+    return (screen.monitor_x, screen.monitor_y,
+            screen.monitor_x + screen.monitor_width, screen.monitor_y + screen.monitor_height)
+
+
+def topology_signature(screens):
+    """Hashable description of the screen setup, changes whenever a graph must be rebuilt"""
+    return tuple(screens)
+
+
+def map_to_screen(rect, source, target):
+    """
+    Map a rectangle proportionally from one work area to another
+    
+    Args:
+        rect (tuple): (x, y, width, height) on the source screen
+        source (Screen): Screen the rectangle is on
+        target (Screen): Screen to map it to
+        
+    Returns:
+        tuple: (x, y, width, height) on the target screen
+    """
+    scale_x = target.width / source.width
+    scale_y = target.height / source.height
+    return (round(target.x + (rect[0] - source.x) * scale_x),
+            round(target.y + (rect[1] - source.y) * scale_y),
+            round(rect[2] * scale_x),
+            round(rect[3] * scale_y))
+
+
+class MonitorGraph:
+    """
+    Neighbouring screen of every screen in each direction
+    
+    Built once per topology (O(n^2) over the monitors), so lookups are a
+    single dict access even for video walls with many outputs.
+    """
+    
+    def __init__(self, screens):
+        """
+        Args:
+            screens (list): Screens as returned by ScreenDetector.discover_screens()
+        """
+        self.signature = topology_signature(screens)
+        self._neighbours = {}
+        for screen in screens:
+            for direction in DIRECTIONS:
+                self._neighbours[(screen.name, direction)] = self._find_neighbour(screen, direction, screens)
+    
+    def neighbour(self, name, direction):
+        """
+        Get the adjacent screen in a direction
+        
+        Args:
+            name (str): Screen name, e.g. 'screen-1'
+            direction (str): One of w, e, n, s
+            
+        Returns:
+            Screen: Adjacent screen or None at the edge of the setup
+        """
+        return self._neighbours.get((name, direction))
+    
+    @staticmethod
+    def _find_neighbour(screen, direction, screens):
+        """
+        Find the closest screen beyond an edge
+        
+        Screens sharing a stretch of the edge win (smallest gap, then largest
+        shared stretch); otherwise the closest center lying more in that
+        direction than to the side is used.
+        """
+        step_x, step_y = DIRECTIONS[direction]
+        horizontal = step_x != 0
+        left, top, right, bottom = monitor_rect(screen)
+        center_x, center_y = (left + right) / 2, (top + bottom) / 2
+        
+        best, best_score = None, None
+        for other in screens:
+            if other is screen:
+                continue
+            other_left, other_top, other_right, other_bottom = monitor_rect(other)
+            delta_x = (other_left + other_right) / 2 - center_x
+            delta_y = (other_top + other_bottom) / 2 - center_y
+            distance = delta_x * step_x + delta_y * step_y
+            if distance <= 0:
+                continue
+            
+            if horizontal:
+                gap = other_left - right if step_x > 0 else left - other_right
+                shared = min(bottom, other_bottom) - max(top, other_top)
+                offset = abs(delta_y)
+            else:
+                gap = other_top - bottom if step_y > 0 else top - other_bottom
+                shared = min(right, other_right) - max(left, other_left)
+                offset = abs(delta_x)
+            
+            if shared > 0:
+                score = (0, max(0, gap), -shared, offset)
+            elif distance >= offset:
+                score = (1, distance + 2 * offset, 0, 0)
+            else:
+                # mostly off to the side, not in this direction
+                continue
+            if best_score is None or score < best_score:
+                best, best_score = other, score
+        
+        return best
@@ -0,0 +1,85 @@
+"""
+Deferred placements of windows on hidden workspaces
+"""
+
+from .metrics import metrics
+
+
+def is_shown(window, workspace):
+    """True if a window is visible on a workspace (or the workspace is unknown)"""
+    return workspace is None or window.is_pinned() or window.is_on_workspace(workspace)
+
+
+class PendingLayouts:
+    """
+    Placements waiting until their workspace becomes active
+    
+    Windows on hidden workspaces are not reconfigured right away (no X
+    traffic, no application relayout for something nobody sees). Their
+    placement is kept per window and applied when the user switches to the
+    workspace. Entries that became stale meanwhile are dropped.
+    """
+    
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self._pending = {}
+    
+    def __len__(self):
+        return len(self._pending)
+    
+    def defer(self, window, args, factor=None, tile=None):
+        """
+        Keep a placement for later
+        
+        A later placement of the same window replaces (drops) the earlier one.
+        
+        Args:
+            window: WNCK window object
+            args (argparse.Namespace): Tiling arguments
+            factor (float): Scaling factor, None for the window's next factor
+            tile (WindowRecord): Tile the placement re-applies; the entry is stale
+                                 once the window got another tile. Without a tile, the
+                                 entry is stale once the window was moved or resized.
+        """
+        xid = window.get_xid()
+        if xid in self._pending:
+            metrics.increment('pending_layouts.dropped')
+        geometry = tuple(window.get_geometry()) if tile is None else None
+        self._pending[xid] = (window, args, factor, tile, geometry)
+        metrics.increment('pending_layouts.deferred')
+    
+    def discard(self, window):
+        """Drop the placement of a window (e.g. the window was closed)"""
+        if self._pending.pop(window.get_xid(), None) is not None:
+            metrics.increment('pending_layouts.dropped')
+    
+    def take(self, workspace, tiles):
+        """
+        Remove the placements of windows shown on a workspace
+        
+        Args:
+            workspace: WNCK workspace that became active
+            tiles (TileRegistry): Current tiles, to detect superseded entries
+            
+        Returns:
+            list: Still valid (window, args, factor) entries
+        """
+        ready = []
+        for xid, (window, args, factor, tile, geometry) in list(self._pending.items()):
+            if not is_shown(window, workspace):
+                continue
+            del self._pending[xid]
+            
+            if tile is not None:
+                stale = tiles.get(xid) is not tile
+            else:
+                stale = tuple(window.get_geometry()) != geometry
+            if stale:
+                metrics.increment('pending_layouts.dropped')
+                continue
+            ready.append((window, args, factor))
+        
+        metrics.increment('pending_layouts.applied', len(ready))
+        if self.verbose and ready:
+            print(f"Applying {len(ready)} deferred placements, {len(self._pending)} still pending")
+        return ready
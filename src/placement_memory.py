@@ -0,0 +1,122 @@
+"""
+Learned placement per application with LRU eviction
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+from .config import Config
+
+
+class PlacementMemory:
+    """
+    Remembers the last tile of each application (WM_CLASS + role)
+    
+    Entries are kept in least-recently-used order and bounded in number.
+    On disk the memory is a compact JSON list of rows, oldest first:
+    [class, role, position, factor, screen, horizontal_only, vertical_only]
+    
+    The screen is stored by its stable key (Screen.key: the connector, or
+    the monitor rectangle), since screen-N names are renumbered when a
+    monitor is unplugged. Rows written before hold the screen name.
+    """
+    
+    def __init__(self, path=None, capacity=Config.PLACEMENT_MEMORY_SIZE, verbose=False):
+        self.path = os.path.expanduser(path or Config.PLACEMENT_MEMORY_FILE)
+        self.capacity = capacity
+        self.verbose = verbose
+        self.dirty = False
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def remember(self, window_class, role, placement):
+        """
+        Store the placement of an application
+        
+        Args:
+            window_class (str): Lower case WM_CLASS group name
+            role (str): Lower case WM_WINDOW_ROLE (may be empty)
+            placement (dict): 'position', 'factor', 'screen', 'screen_key', 'horizontal_only', 'vertical_only'
+        """
+        if not window_class:
+            return
+        key = (window_class, role or "")
+        screen = placement.get('screen_key') or placement['screen']
+        value = (placement['position'], placement['factor'], screen if isinstance(screen, str) else tuple(screen),
+                 bool(placement['horizontal_only']), bool(placement['vertical_only']))
+        
+        if self._entries.get(key) != value:
+            self.dirty = True
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+    
+    def recall(self, window_class, role=""):
+        """
+        Look up the last placement of an application
+        
+        Windows with a role fall back to the entry of their class without role.
+        
+        Args:
+            window_class (str): Lower case WM_CLASS group name
+            role (str): Lower case WM_WINDOW_ROLE
+            
+        Returns:
+            tuple: (position, factor, screen key, horizontal_only, vertical_only) or None
+        """
+        for key in ((window_class, role or ""), (window_class, "")):
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        return None
+    
+    def load(self):
+        """Load the memory from disk (missing or broken files give an empty memory)"""
+        self._entries.clear()
+        if not os.path.isfile(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r') as f:
+                rows = json.load(f)
+            for window_class, role, position, factor, screen, horizontal, vertical in rows[-self.capacity:]:
+                # monitor rectangles come back as JSON lists
+                if isinstance(screen, list):
+                    screen = tuple(screen)
+                self._entries[(window_class, role)] = (position, float(factor), screen,
+                                                       bool(horizontal), bool(vertical))
+        except (json.JSONDecodeError, IOError, ValueError, TypeError) as e:
+            if self.verbose:
+                print(f"Warning: Could not load placement memory: {e}")
+            self._entries.clear()
+        
+        self.dirty = False
+        if self.verbose:
+            print(f"Loaded {len(self._entries)} remembered placements from {self.path}")
+    
+    def save(self):
+        """Write the memory to disk if it changed"""
+        if not self.dirty:
+            return
+        
+        rows = [[window_class, role, position, factor, screen, int(horizontal), int(vertical)]
+                for (window_class, role), (position, factor, screen, horizontal, vertical)
+                in self._entries.items()]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(rows, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self.dirty = False
+            if self.verbose:
+                print(f"Saved placement memory to: {self.path}")
+        except IOError as e:
+            if self.verbose:
+                print(f"Warning: Could not save placement memory: {e}")
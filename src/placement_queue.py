@@ -0,0 +1,111 @@
+"""
+Debounced, batched placement of newly opened windows
+"""
+
+import time
+
+import gi
+gi.require_version("Wnck", "3.0")
+from gi.repository import GLib, Wnck
+
+from .config import Config
+from .metrics import metrics
+from .pending_layouts import is_shown
+
+
+class PlacementQueue:
+    """
+    Collects placement requests and applies them in one layout pass
+    
+    During a session restore dozens of windows appear within a few
+    milliseconds. Instead of discovering screens and placing per window,
+    requests are collected for a short debounce interval, screens are
+    discovered once and all geometries are sent in a single batch.
+    """
+    
+    def __init__(self, app, debounce_ms=Config.PLACEMENT_DEBOUNCE_MS,
+                 max_delay_ms=Config.PLACEMENT_MAX_DELAY_MS, verbose=False):
+        """
+        Args:
+            app: XFCETilingApp providing screen discovery and placement planning
+            debounce_ms (int): Quiet time after the last request before flushing
+            max_delay_ms (int): Longest time the first request may wait
+            verbose (bool): Enable debug output
+        """
+        self.app = app
+        self.debounce_ms = debounce_ms
+        self.max_delay_ms = max_delay_ms
+        self.verbose = verbose
+        self.deferred = None
+        self._pending = {}
+        self._source = None
+        self._first_enqueued = None
+    
+    def __len__(self):
+        return len(self._pending)
+    
+    def enqueue(self, window, args):
+        """
+        Request placement of a window
+        
+        A later request for the same window replaces the earlier one.
+        
+        Args:
+            window: WNCK window object
+            args (argparse.Namespace): Tiling arguments
+        """
+        now = time.monotonic()
+        xid = window.get_xid()
+        enqueued = self._pending[xid][2] if xid in self._pending else now
+        self._pending[xid] = (window, args, enqueued)
+        
+        if self._first_enqueued is None:
+            self._first_enqueued = now
+        
+        # restart the debounce timer unless the first request waited long enough
+        waited_ms = (now - self._first_enqueued) * 1000
+        delay = max(0, min(self.debounce_ms, self.max_delay_ms - waited_ms))
+        if self._source is not None:
+            GLib.source_remove(self._source)
+        self._source = GLib.timeout_add(int(delay), self._on_timeout)
+    
+    def discard(self, window):
+        """Forget a pending request (e.g. the window was closed)"""
+        self._pending.pop(window.get_xid(), None)
+    
+    def _on_timeout(self):
+        self._source = None
+        self.flush()
+        return GLib.SOURCE_REMOVE
+    
+    def flush(self):
+        """
+        Place all pending windows now
+        
+        Returns:
+            int: Number of placed windows
+        """
+        pending, self._pending = self._pending, {}
+        self._first_enqueued = None
+        if not pending:
+            return 0
+        
+        metrics.observe('placement_queue.depth', len(pending))
+        
+        with metrics.timer('placement_queue.flush'):
+            entries = []
+            active_workspace = Wnck.Screen.get_default().get_active_workspace()
+            for window, args, enqueued in pending.values():
+                if self.deferred is not None and not is_shown(window, active_workspace):
+                    self.deferred.defer(window, args)
+                else:
+                    entries.append((window, args, None))
+            placed = self.app.apply_placements(entries)
+        
+        now = time.monotonic()
+        for window, args, enqueued in pending.values():
+            metrics.record_time('placement_queue.latency', now - enqueued)
+        
+        if self.verbose:
+            print(f"Placed {placed} queued windows")
+        return placed
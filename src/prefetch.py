@@ -0,0 +1,85 @@
+"""
+Prefetching of placements for the focused window
+"""
+
+from .config import Config
+from .metrics import metrics
+
+
+class GeometryPrefetcher:
+    """
+    Precomputes the placement of every shortcut command for one window
+    
+    The next placement of the focused window is predictable (position from
+    the shortcut, factor from the stateful cycle), so geometry calculation
+    and decoration lookups can happen on focus change instead of on keypress.
+    """
+    
+    def __init__(self, app, commands, verbose=False):
+        """
+        Args:
+            app: XFCETilingApp providing the placement planning
+            commands (dict): Command string -> parsed arguments
+            verbose (bool): Enable debug output
+        """
+        self.app = app
+        self.commands = commands
+        self.verbose = verbose
+        self._xid = None
+        self._geometry = None
+        self._entries = {}
+    
+    def clear(self):
+        """Drop all prefetched placements"""
+        self._xid = None
+        self._geometry = None
+        self._entries = {}
+    
+    def prefetch(self, window):
+        """
+        Compute placements of all commands for a window
+        
+        Args:
+            window: WNCK window object (usually the newly focused window)
+        """
+        self.clear()
+        if window is None or window.is_maximized() or window.is_minimized():
+            return
+        
+        with metrics.timer('prefetch.compute'):
+            screens = self.app.discover_screens()
+            factors = {}
+            entries = {}
+            for command, args in self.commands.items():
+                if args.position is None or args.position in Config.DYNAMIC_POSITIONS:
+                    continue
+                factor_key = (args.stateful, args.custom_factors, args.factor)
+                if factor_key not in factors:
+                    factors[factor_key] = self.app.peek_scaling_factor(window, args)
+                entries[command] = self.app.plan_placement(window, args, screens, factors[factor_key])
+        
+        self._xid = window.get_xid()
+        self._geometry = tuple(window.get_geometry())
+        self._entries = entries
+        
+        if self.verbose:
+            print(f"Prefetched {len(entries)} placements for window {self._xid}")
+    
+    def take(self, window, command):
+        """
+        Get the prefetched placement of a command if it is still valid
+        
+        Args:
+            window: WNCK window object the command applies to
+            command (str): Command string
+            
+        Returns:
+            dict: Placement or None if nothing valid was prefetched
+        """
+        entry = None
+        if (window is not None and window.get_xid() == self._xid and
+                tuple(window.get_geometry()) == self._geometry and not window.is_maximized()):
+            entry = self._entries.get(command)
+        
+        metrics.increment('prefetch.hits' if entry is not None else 'prefetch.misses')
+        return entry
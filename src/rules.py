@@ -0,0 +1,243 @@
+"""
+Rule based placement of newly opened windows
+"""
+
+import os
+import re
+import shlex
+
+from .config import Config, parse_arguments
+from .window_manager import ApplicationDetector, KeywordMatcher
+
+
+class PlacementRule:
+    """Single rule: window properties to match and the command to run"""
+    
+    # Properties a rule can match on
+    KEYS = ('class', 'role', 'title')
+    
+    def __init__(self, index, conditions, command):
+        """
+        Args:
+            index (int): Position in the rules file (earlier rules win)
+            conditions (dict): Property -> exact lower case string or compiled regex
+            command (str): Tiling command arguments, e.g. '-p sw -f 2'
+        """
+        self.index = index
+        self.conditions = conditions
+        self.command = command
+        self.args = None
+    
+    def matches(self, properties):
+        """
+        Check the rule against window properties
+        
+        Args:
+            properties (dict): Lower case 'class', 'role' and 'title' of a window
+            
+        Returns:
+            bool: True if all conditions match
+        """
+        for key, expected in self.conditions.items():
+            value = properties.get(key) or ""
+            if isinstance(expected, str):
+                if value != expected:
+                    return False
+            elif not expected.search(value):
+                return False
+        return True
+
+
+class RuleSet:
+    """
+    Compiled placement rules
+    
+    Rules with an exact class are stored in a hash by class. All others are
+    fallbacks, compiled into one KeywordMatcher alternation over the window
+    properties (one property per line) in file order, so the group that
+    matches is the first matching fallback. If a pattern cannot be combined
+    (backreferences, inline flags), the fallbacks are checked one by one
+    instead. The first matching rule of the file wins.
+    """
+    
+    # Lookahead per property, finding a value on its line of rule_text()
+    _SCOPES = {
+        'class': (r'(?=', r'\n)', r'(?=[^\n]*?(?:', r')[^\n]*\n[^\n]*\n[^\n]*\Z)'),
+        'role': (r'(?=[^\n]*\n', r'\n)', r'(?=[^\n]*\n[^\n]*?(?:', r')[^\n]*\n[^\n]*\Z)'),
+        'title': (r'(?=[^\n]*\n[^\n]*\n', r'\Z)', r'(?=[^\n]*\n[^\n]*\n[^\n]*?(?:', r')[^\n]*\Z)'),
+    }
+    
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self._by_class = {}
+        self._fallbacks = []
+        for rule in self.rules:
+            window_class = rule.conditions.get('class')
+            if isinstance(window_class, str):
+                self._by_class.setdefault(window_class, []).append(rule)
+            else:
+                self._fallbacks.append(rule)
+        
+        self.matcher = None
+        if self._fallbacks:
+            try:
+                # labelled by index, rules with equal conditions stay separate alternatives
+                self.matcher = KeywordMatcher([(self._rule_pattern(rule), index)
+                                               for index, rule in enumerate(self._fallbacks)],
+                                              patterns=True, flags=re.IGNORECASE | re.MULTILINE)
+            except re.error:
+                pass
+    
+    def __len__(self):
+        return len(self.rules)
+    
+    @classmethod
+    def _rule_pattern(cls, rule):
+        """Pattern matching rule_text() of the windows the rule matches"""
+        lookaheads = []
+        for key, expected in rule.conditions.items():
+            exact_prefix, exact_suffix, search_prefix, search_suffix = cls._SCOPES[key]
+            if isinstance(expected, str):
+                lookaheads.append(exact_prefix + re.escape(expected) + exact_suffix)
+            elif re.search(r'\\[1-9]|\(\?[aiLmsux]+\)', expected.pattern):
+                raise re.error(f"pattern '{expected.pattern}' cannot be combined")
+            else:
+                lookaheads.append(search_prefix + expected.pattern + search_suffix)
+        return r'\A' + ''.join(lookaheads)
+    
+    @staticmethod
+    def rule_text(properties):
+        """The 'class', 'role' and 'title' properties, one per line"""
+        return '\n'.join((properties.get(key) or "").replace('\n', ' ') for key in PlacementRule.KEYS)
+    
+    def match(self, properties):
+        """
+        Find the first rule matching the window properties
+        
+        Args:
+            properties (dict): Lower case 'class', 'role' and 'title' of a window
+            
+        Returns:
+            PlacementRule: Matching rule or None
+        """
+        best = None
+        for rule in self._by_class.get(properties.get('class') or "", ()):
+            if rule.matches(properties):
+                best = rule
+                break
+        if not self._fallbacks or (best is not None and best.index < self._fallbacks[0].index):
+            return best
+        
+        if self.matcher is not None:
+            index = self.matcher.match(self.rule_text(properties))
+            fallback = self._fallbacks[index] if index is not None else None
+        else:
+            fallback = next((rule for rule in self._fallbacks if rule.matches(properties)), None)
+        if fallback is not None and (best is None or fallback.index < best.index):
+            best = fallback
+        return best
+
+
+def window_properties(window):
+    """
+    Collect the properties rules match on
+    
+    Args:
+        window: WNCK window object
+        
+    Returns:
+        dict: Lower case 'class', 'role' and 'title'
+    """
+    app_info = ApplicationDetector.analyze_window(window)
+    return {
+        'class': app_info['window_class'],
+        'role': (window.get_role() or "").lower(),
+        'title': app_info['window_name'].lower(),
+    }
+
+
+def parse_rule_line(line, index):
+    """
+    Parse one line of the rules file
+    
+    Format: 'class=Terminal role=/pattern/ -> -p sw -f 2'
+    Values in slashes are regular expressions, all others match exactly.
+    Matching ignores case.
+    
+    Args:
+        line (str): Rule line without comment
+        index (int): Rule index
+        
+    Returns:
+        PlacementRule: Parsed rule
+    """
+    separator = '->' if '->' in line else '→'
+    if separator not in line:
+        raise ValueError("missing '->' between match and command")
+    match_part, command = line.split(separator, 1)
+    
+    conditions = {}
+    for token in shlex.split(match_part):
+        key, _, value = token.partition('=')
+        key = key.strip().lower()
+        if key not in PlacementRule.KEYS or not value:
+            raise ValueError(f"invalid condition '{token}', use one of {', '.join(PlacementRule.KEYS)}")
+        if len(value) > 1 and value.startswith('/') and value.endswith('/'):
+            conditions[key] = re.compile(value[1:-1], re.IGNORECASE)
+        else:
+            conditions[key] = value.lower()
+    
+    if not conditions:
+        raise ValueError("rule without conditions")
+    
+    rule = PlacementRule(index, conditions, command.strip())
+    rule.args = parse_rule_command(rule.command)
+    return rule
+
+
+def parse_rule_command(command):
+    """Parse the command of a rule into tiling arguments"""
+    try:
+        return parse_arguments(shlex.split(command))
+    except SystemExit:
+        raise ValueError(f"invalid command '{command}'")
+
+
+def load_rules(path=None, verbose=False):
+    """
+    Load placement rules from a file
+    
+    Invalid lines are reported and skipped.
+    
+    Args:
+        path (str): Rules file, defaults to Config.RULES_FILE
+        verbose (bool): Enable debug output
+        
+    Returns:
+        RuleSet: Compiled rules (empty if the file does not exist)
+    """
+    path = os.path.expanduser(path or Config.RULES_FILE)
+    if not os.path.isfile(path):
+        if verbose:
+            print(f"No rules file found at {path}")
+        return RuleSet()
+    
+    rules = []
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            try:
+                rule = parse_rule_line(line, len(rules))
+            except ValueError as e:
+                print(f"Warning: {path}:{line_number}: {e}")
+                continue
+            if verbose:
+                rule.args.verbose = True
+            rules.append(rule)
+    
+    if verbose:
+        print(f"Loaded {len(rules)} placement rules from {path}")
+    
+    return RuleSet(rules)
@@ -8,15 +8,7 @@ gi.require_version("Wnck", "3.0")
 
 from gi.repository import Gdk, Wnck
 from .config import Config
-
-
-class WorkArea:
-    """Simple work area representation"""
-    def __init__(self, x, y, width, height):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
+from .geometry import Rect, Screen
 
 
 class ScreenDetector:
@@ -30,7 +22,7 @@ class ScreenDetector:
         Discover all screens and their work areas (excluding panels)
         
         Returns:
-            list: List of screen dictionaries with work area information
+            list: Screens with their work areas
         """
         screens = []
         display = Gdk.Display.get_default()
@@ -63,7 +55,7 @@ class ScreenDetector:
             monitor_idx (int): Monitor index
             
         Returns:
-            dict: Screen information with work area
+            Screen: Screen with work area and monitor geometry
         """
         # Get physical monitor geometry
         monitor_geometry = monitor.get_geometry()
@@ -97,19 +89,14 @@ class ScreenDetector:
         
         name = f"screen-{monitor_idx + 1}"
         
-        # Create screen info with both work area and monitor geometry
-        screen_info = {
-            "name": name,
-            "x": work_area.x,
-            "y": work_area.y, 
-            "width": work_area.width,
-            "height": work_area.height,
-            # Store original geometry for intersection detection
-            "monitor_x": monitor_geometry.x,
-            "monitor_y": monitor_geometry.y,
-            "monitor_width": monitor_geometry.width,
-            "monitor_height": monitor_geometry.height
-        }
+        # Keep the monitor geometry besides the work area for intersection detection;
+        # on X11 GDK reports the RandR output name (e.g. DP-1) as model
+        screen_info = Screen.create(
+            name,
+            (work_area.x, work_area.y, work_area.width, work_area.height),
+            (monitor_geometry.x, monitor_geometry.y, monitor_geometry.width, monitor_geometry.height),
+            monitor.get_model()
+        )
         
         if self.verbose:
             self._log_screen_info(screen_info, monitor_geometry, work_area)
@@ -124,7 +111,7 @@ class ScreenDetector:
             monitor_geometry: GTK rectangle with monitor dimensions
             
         Returns:
-            WorkArea: Calculated work area excluding detected panels
+            Rect: Calculated work area excluding detected panels
         """
         # Start with full monitor as work area
         work_x = monitor_geometry.x
@@ -159,7 +146,7 @@ class ScreenDetector:
             else:
                 print(f"    No panels found - using full monitor: {work_x}x{work_y} {work_width}x{work_height}")
         
-        return WorkArea(work_x, work_y, work_width, work_height)
+        return Rect(work_x, work_y, work_width, work_height)
     
     def _scan_for_panels(self, wnck_screen, monitor_geometry, work_x, work_y, work_width, work_height):
         """Scan for panel windows and count them"""
@@ -258,7 +245,7 @@ class ScreenDetector:
     
     def _log_screen_info(self, screen_info, monitor_geometry, work_area):
         """Log detailed screen information"""
-        print(f"  {screen_info['name']}:")
+        print(f"  {screen_info.name}:")
         print(f"    Physical: {monitor_geometry.x}x{monitor_geometry.y} {monitor_geometry.width}x{monitor_geometry.height}")
         print(f"    Work area: {work_area.x}x{work_area.y} {work_area.width}x{work_area.height}")
         
@@ -285,11 +272,11 @@ def find_window_screen(window_x, window_y, window_width, window_height, screens,
     
     Args:
         window_x, window_y, window_width, window_height: Window geometry
-        screens (list): List of screen dictionaries
+        screens (list): Screens to choose from
         verbose (bool): Enable debug output
         
     Returns:
-        dict: Best matching screen information
+        Screen: Best matching screen
     """
     if verbose:
         print("Find best matching screen for window:")
@@ -297,47 +284,76 @@ def find_window_screen(window_x, window_y, window_width, window_height, screens,
     best_match = screens[0]  # Always use a default
     best_percentage = -1000
     
+    window_right = window_x + window_width
+    window_bottom = window_y + window_height
+    
     for screen in screens:
-        # Use monitor coordinates for intersection detection (not work area)
-        monitor_x = screen.get('monitor_x', screen['x'])
-        monitor_y = screen.get('monitor_y', screen['y']) 
-        monitor_width = screen.get('monitor_width', screen['width'])
-        monitor_height = screen.get('monitor_height', screen['height'])
-        
-        # Check for intersection
-        if not _box_intersects(window_x, window_y, window_x + window_width, window_y + window_height,
-                              monitor_x, monitor_y, monitor_x + monitor_width, monitor_y + monitor_height):
+        # Use monitor coordinates for intersection detection (not work area);
+        # unpacking the tuple is cheaper than one attribute lookup per field
+        name, _, _, _, _, monitor_x, monitor_y, monitor_width, monitor_height, _ = screen
+        monitor_right = monitor_x + monitor_width
+        monitor_bottom = monitor_y + monitor_height
+        
+        # Check for intersection (touching edges count)
+        if (window_x > monitor_right or window_right < monitor_x or
+                window_y > monitor_bottom or window_bottom < monitor_y):
             if verbose:
-                print(f"  No intersection with: {screen['name']}")
+                print(f"  No intersection with: {name}")
             continue
 
         # Calculate intersection area
         x1 = max(window_x, monitor_x)
         y1 = max(window_y, monitor_y)
-        x2 = min(window_x + window_width, monitor_x + monitor_width)
-        y2 = min(window_y + window_height, monitor_y + monitor_height)
+        x2 = min(window_right, monitor_right)
+        y2 = min(window_bottom, monitor_bottom)
 
         window_area = window_width * window_height
         intersection_area = (x2 - x1) * (y2 - y1)
         percentage_on_screen = intersection_area * 100 / window_area
 
         if verbose:
-            print(f"  {percentage_on_screen:.1f}% are on: {screen['name']}")
+            print(f"  {percentage_on_screen:.1f}% are on: {name}")
 
         if best_percentage < percentage_on_screen:
             best_percentage = percentage_on_screen
             best_match = screen
 
     if verbose:
-        print(f"  Using: {best_match['name']} as best match")
-        print(f"  Screen work area: {best_match['x']}x{best_match['y']} {best_match['width']}x{best_match['height']}")
+        print(f"  Using: {best_match.name} as best match")
+        print(f"  Screen work area: {best_match.x}x{best_match.y} {best_match.width}x{best_match.height}")
 
     return best_match
 
 
-def _box_intersects(left_a, top_a, right_a, bottom_a, left_b, top_b, right_b, bottom_b):
-    """Check if two boxes intersect"""
-    return not (left_a > right_b or
-                right_a < left_b or
-                top_a > bottom_b or
-                bottom_a < top_b)
+def find_screen_by_name(screens, name):
+    """
+    Find a screen by its name
+    
+    Args:
+        screens (list): Screens to search
+        name (str): Screen name, e.g. 'screen-2'
+        
+    Returns:
+        Screen: Screen or None if no screen has that name
+    """
+    for screen in screens:
+        if screen.name == name:
+            return screen
+    return None
+
+
+def find_screen_by_key(screens, key):
+    """
+    Find a screen by its stable key (see Screen.key)
+    
+    Args:
+        screens (list): Screens to search
+        key: Connector name or monitor rectangle
+        
+    Returns:
+        Screen: Screen or None if that monitor is gone
+    """
+    for screen in screens:
+        if screen.key == key:
+            return screen
+    return None
@@ -0,0 +1,291 @@
+"""
+Screens and tiles of the daemon published in a shared memory file
+"""
+
+import mmap
+import os
+import struct
+import time
+
+from .config import Config
+from .geometry import Screen, WindowRecord
+from .metrics import metrics
+from .utils import get_runtime_path
+
+
+MAGIC = b'XFTS'
+LAYOUT_VERSION = 2
+
+# magic, layout version, generation, screen capacity, tile capacity, screen count, tile count, writer pid
+HEADER = struct.Struct('<4sIQIIIII')
+GENERATION = struct.Struct('<Q')
+GENERATION_OFFSET = 8
+PID = struct.Struct('<I')
+PID_OFFSET = 32
+
+# name, work area (x, y, width, height), monitor (x, y, width, height)
+SCREEN = struct.Struct('<32s8i')
+
+# xid, screen name, position, factor (NaN if none), frame (width 0 if none), horizontal only, vertical only
+TILE = struct.Struct('<Q32s24sd4iBB6x')
+
+
+def table_size(max_screens, max_tiles):
+    """Size (bytes) of a table with the given capacities"""
+    return HEADER.size + max_screens * SCREEN.size + max_tiles * TILE.size
+
+
+def _encode(text, size):
+    return (text or '').encode('utf-8')[:size]
+
+
+def _decode(raw):
+    return raw.rstrip(b'\0').decode('utf-8', 'replace') or None
+
+
+def _process_alive(pid):
+    """Check whether a process exists (also if it belongs to another user)"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedTableWriter:
+    """
+    Publishes screens and tiles into a fixed layout memory mapped file
+    
+    Updates follow a seqlock: the generation counter is odd while a write
+    is in progress and even once the table is consistent again, so readers
+    copy the table lock-free and retry if the generation changed meanwhile.
+    The header carries the writer's PID, so readers can tell a table left
+    behind by a crashed daemon.
+    """
+    
+    def __init__(self, path, max_screens=Config.SHARED_TABLE_MAX_SCREENS,
+                 max_tiles=Config.SHARED_TABLE_MAX_TILES, verbose=False):
+        """
+        Args:
+            path (str): Table file, usually below $XDG_RUNTIME_DIR
+            max_screens (int): Screen capacity
+            max_tiles (int): Tile capacity, further tiles are not published
+            verbose (bool): Enable debug output
+        """
+        self.path = path
+        self.max_screens = max_screens
+        self.max_tiles = max_tiles
+        self.verbose = verbose
+        self._map = None
+        self._generation = 0
+    
+    def open(self):
+        """Create or reuse the table file and map it"""
+        size = table_size(self.max_screens, self.max_tiles)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # keep the inode, readers that mapped an earlier table see the new content
+            os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        
+        version, generation = HEADER.unpack_from(self._map)[1:3]
+        # continue the generation of a previous daemon so readers notice the change
+        self._generation = generation + (generation & 1) if version == LAYOUT_VERSION else 0
+        if self.verbose:
+            print(f"Publishing screens and tiles in {self.path}")
+    
+    def publish(self, screens, tiles):
+        """
+        Replace the table content
+        
+        Args:
+            screens (list): Screens
+            tiles (iterable): (xid, tile) pairs as returned by TileRegistry.items()
+        
+        Returns:
+            int: Generation of the published table
+        """
+        if self._map is None:
+            return self._generation
+        
+        screens = list(screens)[:self.max_screens]
+        tiles = list(tiles)[:self.max_tiles]
+        
+        self._generation += 1
+        GENERATION.pack_into(self._map, GENERATION_OFFSET, self._generation)
+        
+        offset = HEADER.size
+        for screen in screens:
+            SCREEN.pack_into(
+                self._map, offset, _encode(screen.name, 32),
+                screen.x, screen.y, screen.width, screen.height,
+                screen.monitor_x, screen.monitor_y, screen.monitor_width, screen.monitor_height
+            )
+            offset += SCREEN.size
+        
+        offset = HEADER.size + self.max_screens * SCREEN.size
+        for xid, tile in tiles:
+            frame = tile.frame or (0, 0, 0, 0)
+            TILE.pack_into(
+                self._map, offset, xid, _encode(tile.screen, 32), _encode(tile.position, 24),
+                float('nan') if tile.factor is None else tile.factor,
+                frame[0], frame[1], frame[2], frame[3],
+                bool(tile.horizontal_only), bool(tile.vertical_only)
+            )
+            offset += TILE.size
+        
+        self._generation += 1
+        HEADER.pack_into(self._map, 0, MAGIC, LAYOUT_VERSION, self._generation,
+                         self.max_screens, self.max_tiles, len(screens), len(tiles), os.getpid())
+        metrics.increment('shared_table.publishes')
+        return self._generation
+    
+    def close(self):
+        """Mark the table as stale (no daemon running) and unmap it"""
+        if self._map is None:
+            return
+        self._generation += 1
+        GENERATION.pack_into(self._map, GENERATION_OFFSET, self._generation)
+        HEADER.pack_into(self._map, 0, b'\0' * 4, LAYOUT_VERSION, self._generation + 1, 0, 0, 0, 0, 0)
+        self._map.close()
+        self._map = None
+
+
+class SharedTableReader:
+    """
+    Lock-free reader of the table published by the daemon
+    
+    After mapping the file once, snapshots are plain memory copies; the
+    last snapshot is reused while the generation is unchanged. Whether the
+    writing daemon is alive is checked when mapping, and again only once
+    the generation stood still for SHARED_TABLE_LIVENESS_INTERVAL.
+    """
+    
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): Table file, defaults to Config.SHARED_TABLE_FILE in the runtime directory
+        """
+        self.path = path or get_runtime_path(Config.SHARED_TABLE_FILE)
+        self._map = None
+        self._snapshot = None
+        # generation at the last sign of a live writer and when it was seen
+        self._live_generation = None
+        self._live_since = 0
+    
+    def generation(self):
+        """Current generation of the table, None if it cannot be mapped"""
+        if not self._ensure_mapped():
+            return None
+        return GENERATION.unpack_from(self._map, GENERATION_OFFSET)[0]
+    
+    def snapshot(self):
+        """
+        Get a consistent copy of the table
+        
+        Returns:
+            dict: {'generation': int, 'screens': [Screen], 'tiles': {xid: WindowRecord}}
+                  or None if no daemon publishes a table
+        """
+        if not self._ensure_mapped():
+            return None
+        
+        if not self._writer_alive():
+            # left behind by a daemon that did not shut down cleanly
+            metrics.increment('shared_table.stale_reads')
+            return None
+        
+        for _ in range(Config.SHARED_TABLE_READ_RETRIES):
+            before = GENERATION.unpack_from(self._map, GENERATION_OFFSET)[0]
+            if before & 1:
+                continue
+            if self._snapshot is not None and self._snapshot['generation'] == before:
+                metrics.increment('shared_table.cached_reads')
+                return self._snapshot
+            data = self._map[:]
+            if GENERATION.unpack_from(self._map, GENERATION_OFFSET)[0] == before:
+                self._snapshot = self._parse(data, before)
+                return self._snapshot
+        
+        metrics.increment('shared_table.read_conflicts')
+        return None
+    
+    def _ensure_mapped(self):
+        if self._map is not None:
+            return True
+        try:
+            with open(self.path, 'rb') as table_file:
+                self._map = mmap.mmap(table_file.fileno(), 0, mmap.MAP_SHARED, mmap.PROT_READ)
+        except (OSError, ValueError):
+            return False
+        if len(self._map) < HEADER.size:
+            self.close()
+            return False
+        self._live_generation = None
+        return True
+    
+    def _writer_alive(self):
+        """Check the writer's PID, unless the generation changed recently (no syscall then)"""
+        generation = GENERATION.unpack_from(self._map, GENERATION_OFFSET)[0]
+        now = time.monotonic()
+        if self._live_generation is not None:
+            if generation != self._live_generation:
+                self._live_generation, self._live_since = generation, now
+                return True
+            if now - self._live_since < Config.SHARED_TABLE_LIVENESS_INTERVAL:
+                return True
+        if not _process_alive(PID.unpack_from(self._map, PID_OFFSET)[0]):
+            return False
+        self._live_generation, self._live_since = generation, now
+        return True
+    
+    @staticmethod
+    def _parse(data, generation):
+        if len(data) < HEADER.size:
+            return None
+        magic, version, _, max_screens, max_tiles, screen_count, tile_count, _ = HEADER.unpack_from(data)
+        if magic != MAGIC or version != LAYOUT_VERSION or len(data) < table_size(max_screens, max_tiles):
+            return None
+        
+        screens = [Screen(_decode(name), *fields) for name, *fields in
+                   SCREEN.iter_unpack(data[HEADER.size:HEADER.size + screen_count * SCREEN.size])]
+        
+        tiles = {}
+        start = HEADER.size + max_screens * SCREEN.size
+        for xid, screen, position, factor, x, y, width, height, horizontal_only, vertical_only in \
+                TILE.iter_unpack(data[start:start + tile_count * TILE.size]):
+            tiles[xid] = WindowRecord(
+                _decode(position), None if factor != factor else factor, _decode(screen),
+                bool(horizontal_only), bool(vertical_only), (x, y, width, height) if width else None
+            )
+        
+        return {'generation': generation, 'screens': screens, 'tiles': tiles}
+    
+    def close(self):
+        """Unmap the table"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def read_shared_table(path=None):
+    """
+    Get one snapshot of the daemon's screens and tiles
+    
+    Args:
+        path (str): Table file, defaults to the daemon's
+    
+    Returns:
+        dict: Snapshot (see SharedTableReader.snapshot()) or None if the daemon is not running
+    """
+    reader = SharedTableReader(path)
+    try:
+        return reader.snapshot()
+    finally:
+        reader.close()
@@ -0,0 +1,109 @@
+"""
+Most recently used windows per tile slot
+"""
+
+from collections import OrderedDict
+from itertools import count
+
+from .config import Config
+
+
+class SlotCycler:
+    """
+    MRU list of the windows tiled to the same slot (workspace, screen, position)
+    
+    Each slot is an OrderedDict from entry key to XID, least recently used
+    first. Cycling activates the first live entry, which then moves to the
+    end, so repeated presses visit every window of the slot. Closed windows
+    leave a tombstone (XID None) that a reopened window of the same
+    WM_CLASS takes over, keeping its place in the order.
+    """
+    
+    def __init__(self, max_tombstones=Config.SLOT_MAX_TOMBSTONES):
+        self.max_tombstones = max_tombstones
+        self._slots = {}
+        self._entries = {}
+        self._tombstones = {}
+        self._keys = count()
+    
+    def slot_of(self, xid):
+        """Get the slot of a window or None"""
+        entry = self._entries.get(xid)
+        return entry[0] if entry is not None else None
+    
+    def add(self, xid, slot, window_class):
+        """
+        Put a window into a slot (it was tiled there)
+        
+        A window already in the slot keeps its place. A new window takes the
+        place of a closed window of the same class, otherwise it becomes the
+        most recently used entry.
+        
+        Args:
+            xid (int): Window XID
+            slot (tuple): (workspace, screen name, position)
+            window_class (str): Lower case WM_CLASS group name
+        """
+        entry = self._entries.get(xid)
+        if entry is not None:
+            if entry[0] == slot:
+                return
+            self.remove(xid)
+        
+        entries = self._slots.setdefault(slot, OrderedDict())
+        tombstones = self._tombstones.get((slot, window_class))
+        if tombstones:
+            key = tombstones.pop(0)
+        else:
+            key = (window_class, next(self._keys))
+        entries[key] = xid
+        self._entries[xid] = (slot, key)
+    
+    def touch(self, xid):
+        """Mark a window as most recently used in its slot (it got the focus)"""
+        entry = self._entries.get(xid)
+        if entry is not None:
+            self._slots[entry[0]].move_to_end(entry[1])
+    
+    def remove(self, xid):
+        """Take a window out of its slot (moved away from the tile)"""
+        entry = self._entries.pop(xid, None)
+        if entry is None:
+            return
+        slot, key = entry
+        entries = self._slots[slot]
+        del entries[key]
+        if not entries:
+            del self._slots[slot]
+    
+    def close(self, xid):
+        """Replace a closed window by a tombstone its class can take over"""
+        entry = self._entries.pop(xid, None)
+        if entry is None:
+            return
+        slot, key = entry
+        self._slots[slot][key] = None
+        
+        tombstones = self._tombstones.setdefault((slot, key[0]), [])
+        tombstones.append(key)
+        if len(tombstones) > self.max_tombstones:
+            del self._slots[slot][tombstones.pop(0)]
+    
+    def next(self, xid):
+        """
+        Get the least recently used other window of a window's slot
+        
+        Args:
+            xid (int): Window XID (usually the active window)
+            
+        Returns:
+            int: XID to activate or None if the slot holds no other window
+        """
+        entry = self._entries.get(xid)
+        if entry is None:
+            return None
+        # usually the first entry; only tombstones are skipped
+        for candidate in self._slots[entry[0]].values():
+            if candidate is not None and candidate != xid:
+                return candidate
+        return None
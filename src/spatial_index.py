@@ -0,0 +1,213 @@
+"""
+Spatial index of visible windows for directional queries
+"""
+
+from .config import Config
+
+
+# Unit steps of the directions (screen coordinates, y grows downwards)
+DIRECTIONS = {
+    'w': (-1, 0),
+    'e': (1, 0),
+    'n': (0, -1),
+    's': (0, 1),
+}
+
+# Workspace key of windows shown on all workspaces
+PINNED = -1
+
+
+def window_entry(window):
+    """
+    Get rectangle and workspace of a visible window
+    
+    Args:
+        window: WNCK window object
+        
+    Returns:
+        tuple: ((x, y, width, height), workspace) or None if the window is not visible
+    """
+    if window.is_minimized() or window.is_skip_tasklist():
+        return None
+    if window.is_pinned():
+        workspace = PINNED
+    else:
+        workspace = window.get_workspace()
+        if workspace is None:
+            return None
+        workspace = workspace.get_number()
+    return tuple(window.get_geometry()), workspace
+
+
+class SpatialIndex:
+    """
+    Uniform grid of window centers per workspace
+    
+    Updates touch a single cell. Directional queries walk cells outward from
+    the source window and stop as soon as no closer window can exist, so
+    they do not rescan every window.
+    """
+    
+    def __init__(self, cell_size=Config.SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self._entries = {}
+        self._cells = {}
+        self._bounds = {}
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, xid):
+        return xid in self._entries
+    
+    def get(self, xid):
+        """Get (rect, workspace) of an indexed window or None"""
+        entry = self._entries.get(xid)
+        return entry[:2] if entry is not None else None
+    
+    def update(self, xid, rect, workspace):
+        """
+        Insert or move a window
+        
+        Args:
+            xid (int): Window XID
+            rect (tuple): Frame geometry (x, y, width, height)
+            workspace (int): Workspace number or PINNED
+        """
+        cell = (workspace,
+                int((rect[0] + rect[2] / 2) // self.cell_size),
+                int((rect[1] + rect[3] / 2) // self.cell_size))
+        
+        old = self._entries.get(xid)
+        if old is not None and old[2] != cell:
+            self._discard_from_cell(xid, old[2])
+        if old is None or old[2] != cell:
+            self._cells.setdefault(cell, set()).add(xid)
+            self._extend_bounds(cell)
+        self._entries[xid] = (tuple(rect), workspace, cell)
+    
+    def remove(self, xid):
+        """Remove a window (closed, minimized, ...)"""
+        old = self._entries.pop(xid, None)
+        if old is not None:
+            self._discard_from_cell(xid, old[2])
+    
+    def rects(self, workspace, exclude=None):
+        """
+        Get geometries of windows visible on a workspace
+        
+        Args:
+            workspace (int): Workspace number (pinned windows are included)
+            exclude (int): XID to leave out, usually the source window
+            
+        Returns:
+            list: Rectangles (x, y, width, height)
+        """
+        return [entry[0] for xid, entry in self._entries.items()
+                if entry[1] in (workspace, PINNED) and xid != exclude]
+    
+    def update_window(self, window):
+        """Update the index from a WNCK window (removes it if no longer visible)"""
+        entry = window_entry(window)
+        if entry is None:
+            self.remove(window.get_xid())
+        else:
+            self.update(window.get_xid(), entry[0], entry[1])
+    
+    def rebuild(self, windows):
+        """Replace the index content with the given WNCK windows"""
+        self._entries.clear()
+        self._cells.clear()
+        self._bounds.clear()
+        for window in windows:
+            self.update_window(window)
+    
+    def nearest(self, xid, direction, workspace=None):
+        """
+        Find the closest window in a direction
+        
+        Closeness is the distance of the centers along the direction plus
+        twice the offset across it, so aligned windows are preferred.
+        
+        Args:
+            xid (int): Source window XID (must be indexed)
+            direction (str): One of w, e, n, s
+            workspace (int): Workspace to search, defaults to the source's workspace
+            
+        Returns:
+            int: XID of the neighbour or None
+        """
+        entry = self._entries.get(xid)
+        if entry is None:
+            return None
+        rect, source_workspace, cell = entry
+        if workspace is None:
+            workspace = source_workspace
+        
+        step_x, step_y = DIRECTIONS[direction]
+        horizontal = step_x != 0
+        step = step_x or step_y
+        center_x = rect[0] + rect[2] / 2
+        center_y = rect[1] + rect[3] / 2
+        
+        best = None
+        best_score = float('inf')
+        
+        for searched in {workspace, PINNED}:
+            bounds = self._bounds.get(searched)
+            if bounds is None:
+                continue
+            min_x, min_y, max_x, max_y = bounds
+            if horizontal:
+                primary, perpendicular = cell[1], cell[2]
+                primary_range, perpendicular_range = (min_x, max_x), (min_y, max_y)
+            else:
+                primary, perpendicular = cell[2], cell[1]
+                primary_range, perpendicular_range = (min_y, max_y), (min_x, max_x)
+            
+            # the source may lie outside this workspace's cells (e.g. pinned windows elsewhere),
+            # start at the first line of the bounds ahead of it
+            k = max(0, (primary_range[0] - primary) if step > 0 else (primary - primary_range[1]))
+            while primary_range[0] <= primary + k * step <= primary_range[1]:
+                lower = max(0, k - 1) * self.cell_size
+                if lower > best_score:
+                    break
+                line = primary + k * step
+                for offset_cell in range(perpendicular_range[0], perpendicular_range[1] + 1):
+                    offset_lower = 2 * max(0, abs(offset_cell - perpendicular) - 1) * self.cell_size
+                    if lower + offset_lower > best_score:
+                        continue
+                    key = (searched, line, offset_cell) if horizontal else (searched, offset_cell, line)
+                    for candidate in self._cells.get(key, ()):
+                        if candidate == xid:
+                            continue
+                        other = self._entries[candidate][0]
+                        delta_x = other[0] + other[2] / 2 - center_x
+                        delta_y = other[1] + other[3] / 2 - center_y
+                        distance = delta_x * step_x + delta_y * step_y
+                        if distance <= 0:
+                            continue
+                        score = distance + 2 * abs(delta_y if horizontal else delta_x)
+                        if score < best_score or (score == best_score and candidate < best):
+                            best, best_score = candidate, score
+                k += 1
+        
+        return best
+    
+    def _discard_from_cell(self, xid, cell):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(xid)
+            if not members:
+                del self._cells[cell]
+    
+    def _extend_bounds(self, cell):
+        workspace, cell_x, cell_y = cell
+        bounds = self._bounds.get(workspace)
+        if bounds is None:
+            self._bounds[workspace] = [cell_x, cell_y, cell_x, cell_y]
+        else:
+            bounds[0] = min(bounds[0], cell_x)
+            bounds[1] = min(bounds[1], cell_y)
+            bounds[2] = max(bounds[2], cell_x)
+            bounds[3] = max(bounds[3], cell_y)
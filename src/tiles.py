@@ -0,0 +1,77 @@
+"""
+Tile state of windows placed by the running process
+"""
+
+from .geometry import Rect, WindowRecord
+
+
+class TileRegistry:
+    """
+    Remembers position, factor and screen of tiled windows by XID
+    
+    A tile is only valid while the window still has the frame it was placed
+    with; once the user moves or resizes it the record is ignored.
+    """
+    
+    def __init__(self):
+        self._tiles = {}
+        # called without arguments after every change, e.g. to publish the tiles
+        self.on_change = None
+    
+    def __len__(self):
+        return len(self._tiles)
+    
+    def record(self, xid, placement, frame):
+        """
+        Store the tile of a window
+        
+        Args:
+            xid (int): Window XID
+            placement (dict): Placement with 'position', 'factor', 'screen', 'screen_key',
+                              'horizontal_only' and 'vertical_only'
+            frame (tuple): Frame geometry (x, y, width, height) the window was placed with
+        """
+        self._tiles[xid] = WindowRecord(
+            placement['position'], placement['factor'], placement['screen'],
+            placement['horizontal_only'], placement['vertical_only'], frame, placement.get('screen_key')
+        )
+        self._changed()
+    
+    def get(self, xid, geometry=None):
+        """
+        Get the tile of a window
+        
+        Args:
+            xid (int): Window XID
+            geometry (tuple): Current frame geometry; the tile is dropped if it differs
+            
+        Returns:
+            WindowRecord: Tile or None
+        """
+        tile = self._tiles.get(xid)
+        if tile is not None and geometry is not None and tile.frame is not None:
+            if tuple(geometry[:4]) != tile.frame:
+                del self._tiles[xid]
+                self._changed()
+                return None
+        return tile
+    
+    def update_frame(self, xid, frame):
+        """Keep a tile but note that its window now has another frame (e.g. resized with a linked edge)"""
+        tile = self._tiles.get(xid)
+        if tile is not None:
+            tile.frame = Rect(*frame[:4])
+            self._changed()
+    
+    def items(self):
+        """Iterate (xid, tile) pairs"""
+        return list(self._tiles.items())
+    
+    def forget(self, xid):
+        """Drop the tile of a window (closed, moved by hand, ...)"""
+        if self._tiles.pop(xid, None) is not None:
+            self._changed()
+    
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
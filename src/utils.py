@@ -4,25 +4,25 @@ Mouse positioning and stateful window management
 
 import json
 import os
-from Xlib import display
+import tempfile
 from .config import Config
+from .x_connection import XConnection
 
 
 class MouseController:
     """Handles mouse cursor positioning"""
     
     @staticmethod
-    def place_cursor_over_window(window_rect, verbose=False):
+    def place_cursor_over_window(window_rect, verbose=False, connection=None):
         """
         Place mouse cursor over the center of a window
         
         Args:
             window_rect (tuple): Window rectangle (x, y, width, height)
             verbose (bool): Enable debug output
+            connection (XConnection): Connection to use, defaults to the shared one
         """
-        d = display.Display()
-        s = d.screen()
-        root = s.root
+        connection = connection or XConnection.shared()
         
         x = round(window_rect[0] + window_rect[2] / 2)
         y = round(window_rect[1] + window_rect[3] / 2)
@@ -30,8 +30,8 @@ class MouseController:
         if verbose:
             print(f"Moving cursor to window center: {x}, {y}")
         
-        root.warp_pointer(x, y)
-        d.sync()
+        connection.root.warp_pointer(x, y)
+        connection.flush()
 
 
 class StatefulWindowManager:
@@ -57,12 +57,36 @@ class StatefulWindowManager:
         
         # Load existing state
         data = self._load_state()
+        next_factor = self.peek_next_factor(window_id, factors, data)
         
-        # Get current factor for this window
-        current_factor = data.get(str(window_id), 1.0)
+        if self.verbose:
+            print(f"  Current factor: {data.get(str(window_id), 1.0)}")
+            print(f"  Next factor: {next_factor}")
+        
+        # Store new factor
+        data[str(window_id)] = str(next_factor)
+        self._save_state(data)
+        
+        return next_factor
+    
+    def peek_next_factor(self, window_id, factors, data=None):
+        """
+        Get the factor get_next_factor() would return, without storing it
         
+        Args:
+            window_id: Unique window identifier
+            factors (list): List of available scaling factors
+            data (dict): Already loaded state, read from the storage file if None
+            
+        Returns:
+            float: Next scaling factor
+        """
+        if data is None:
+            data = self._load_state()
+        
+        # Get current factor for this window
         try:
-            current_factor = float(current_factor)
+            current_factor = float(data.get(str(window_id), 1.0))
         except (ValueError, TypeError):
             current_factor = 1.0
         
@@ -73,18 +97,36 @@ class StatefulWindowManager:
             current_index = 0  # Default to first factor if not found
         
         # Calculate next factor (cycle through list)
-        next_index = (current_index + 1) % len(factors)
-        next_factor = factors[next_index]
+        return factors[(current_index + 1) % len(factors)]
+    
+    def known_factors(self):
+        """
+        Get the stored factor of every window
         
-        if self.verbose:
-            print(f"  Current factor: {current_factor}")
-            print(f"  Next factor: {next_factor}")
+        Returns:
+            dict: Window XID -> factor
+        """
+        factors = {}
+        for window_id, factor in self._load_state().items():
+            try:
+                factors[int(window_id)] = float(factor)
+            except (ValueError, TypeError):
+                continue
+        return factors
+    
+    def store_factors(self, factors):
+        """
+        Store factors of several windows at once
         
-        # Store new factor
-        data[str(window_id)] = str(next_factor)
+        Args:
+            factors (dict): Window XID -> factor
+        """
+        if not factors:
+            return
+        data = self._load_state()
+        for window_id, factor in factors.items():
+            data[str(window_id)] = str(factor)
         self._save_state(data)
-        
-        return next_factor
     
     def _load_state(self):
         """Load state from storage file"""
@@ -122,3 +164,21 @@ def get_window_id(window):
         int: Window XID
     """
     return window.get_xid()
+
+
+def get_runtime_path(filename):
+    """
+    Get path of a runtime file (locks, sockets) below $XDG_RUNTIME_DIR
+    
+    Falls back to the system temp directory if $XDG_RUNTIME_DIR is not set.
+    
+    Args:
+        filename (str): File name inside the runtime directory
+        
+    Returns:
+        str: Absolute path, the containing directory is created if missing
+    """
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    directory = os.path.join(base, Config.RUNTIME_SUBDIR)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return os.path.join(directory, filename)
@@ -0,0 +1,105 @@
+"""
+Index of managed windows by WM_CLASS, title token and PID
+"""
+
+import re
+
+import gi
+gi.require_version("Wnck", "3.0")
+from gi.repository import Wnck
+
+from .window_manager import ApplicationDetector
+
+
+def title_tokens(title):
+    """Split a title into lower case word tokens"""
+    return set(re.findall(r'\w+', title.lower()))
+
+
+class WindowIndex:
+    """
+    Finds windows by class, title words and PID without scanning all windows
+    
+    Titles are indexed by word, so 'title=mozilla firefox' matches windows
+    whose title contains both words.
+    """
+    
+    def __init__(self):
+        self._windows = {}
+        self._by_class = {}
+        self._by_token = {}
+        self._by_pid = {}
+    
+    def __len__(self):
+        return len(self._windows)
+    
+    def update_window(self, window):
+        """Insert or refresh a window (opened, title changed)"""
+        xid = window.get_xid()
+        self.remove(xid)
+        if window.get_window_type() != Wnck.WindowType.NORMAL:
+            return
+        
+        window_class = ApplicationDetector.analyze_window(window)['window_class']
+        tokens = title_tokens(window.get_name() or "")
+        pid = window.get_pid()
+        
+        self._windows[xid] = (window, window_class, tokens, pid)
+        self._by_class.setdefault(window_class, set()).add(xid)
+        for token in tokens:
+            self._by_token.setdefault(token, set()).add(xid)
+        self._by_pid.setdefault(pid, set()).add(xid)
+    
+    def remove(self, xid):
+        """Remove a window (closed)"""
+        entry = self._windows.pop(xid, None)
+        if entry is None:
+            return
+        window, window_class, tokens, pid = entry
+        self._discard(self._by_class, window_class, xid)
+        for token in tokens:
+            self._discard(self._by_token, token, xid)
+        self._discard(self._by_pid, pid, xid)
+    
+    def rebuild(self, windows):
+        """Replace the index content with the given WNCK windows"""
+        for xid in list(self._windows):
+            self.remove(xid)
+        for window in windows:
+            self.update_window(window)
+    
+    def find(self, criteria):
+        """
+        Find windows matching all criteria
+        
+        Args:
+            criteria (list): (key, value) pairs with key in Config.MATCH_KEYS
+            
+        Returns:
+            list: WNCK windows, newest (highest XID) first
+        """
+        matches = None
+        for key, value in criteria:
+            if key == 'class':
+                found = self._by_class.get(value.lower(), set())
+            elif key == 'pid':
+                found = self._by_pid.get(int(value), set())
+            else:
+                found = None
+                for token in title_tokens(value):
+                    token_matches = self._by_token.get(token, set())
+                    found = token_matches if found is None else found & token_matches
+                found = found or set()
+            matches = set(found) if matches is None else matches & found
+            if not matches:
+                return []
+        
+        return [self._windows[xid][0] for xid in sorted(matches or (), reverse=True)]
+    
+    @staticmethod
+    def _discard(index, key, xid):
+        members = index.get(key)
+        if members is not None:
+            members.discard(xid)
+            if not members:
+                del index[key]
@@ -2,15 +2,78 @@
 Application detection and window management
 """
 
+import re
 import gi
 gi.require_version("Wnck", "3.0")
 from gi.repository import Wnck
-from .config import Config
+from Xlib import X, Xutil, error
+from .config import Config, parse_grid_position, grid_anchor
+from .metrics import metrics
+from .x_connection import XConnection
+from .free_space import largest_free_rectangle
+
+
+class KeywordMatcher:
+    """
+    Matcher for many keywords or patterns compiled into a single regex
+    
+    Every alternative ends in an empty named group, so the group that matched
+    resolves to its label directly and matching cost does not grow with a
+    linear scan over the keyword list.
+    """
+    
+    def __init__(self, keywords, patterns=False, flags=0):
+        """
+        Args:
+            keywords (dict): Keyword -> label (an iterable of keywords labels them True)
+            patterns (bool): Keywords are (pattern, label) pairs of regular expressions,
+                             tried in the given order; equal patterns keep a label each
+            flags (int): re flags for the compiled pattern
+        """
+        if patterns:
+            alternatives = list(keywords.items() if isinstance(keywords, dict) else keywords)
+        else:
+            if not isinstance(keywords, dict):
+                keywords = {keyword: True for keyword in keywords}
+            # longest first, so overlapping keywords prefer the most specific one
+            alternatives = [(re.escape(keyword.lower()), label) for keyword, label in
+                            sorted(keywords.items(), key=lambda item: len(item[0]), reverse=True)]
+        self.labels = [label for _, label in alternatives]
+        self.pattern = re.compile('|'.join(f'(?:{source})(?P<k{index}>)'
+                                           for index, (source, _) in enumerate(alternatives)),
+                                  flags) if alternatives else None
+    
+    def match(self, *texts):
+        """
+        Find the label of the first keyword contained in any of the texts
+        
+        Args:
+            texts (str): Lower case texts to search
+            
+        Returns:
+            Label of the matched keyword or None
+        """
+        if self.pattern is None:
+            return None
+        for text in texts:
+            found = self.pattern.search(text)
+            if found:
+                return self.labels[int(found.lastgroup[1:])]
+        return None
 
 
 class ApplicationDetector:
     """Detects application types for specific handling"""
     
+    # Compiled terminal keyword matcher
+    terminal_matcher = KeywordMatcher(Config.TERMINAL_KEYWORDS)
+    
+    # Memoized classification per XID: (app_name, window_class, is_terminal)
+    _by_xid = {}
+    
+    # Memoized terminal detection per (app_name, class group)
+    _by_class = {}
+    
     @staticmethod
     def analyze_window(window):
         """
@@ -22,6 +85,31 @@ class ApplicationDetector:
         Returns:
             dict: Window analysis results
         """
+        xid = window.get_xid()
+        cached = ApplicationDetector._by_xid.get(xid)
+        if cached is None:
+            metrics.increment('app_detector.misses')
+            cached = ApplicationDetector._classify(window)
+            ApplicationDetector._by_xid[xid] = cached
+        else:
+            metrics.increment('app_detector.hits')
+        
+        app_name, window_class, is_terminal = cached
+        return {
+            'app_name': app_name,
+            'window_class': window_class,
+            'is_terminal': is_terminal,
+            'window_name': window.get_name() or "Unknown"
+        }
+    
+    @staticmethod
+    def forget(xid):
+        """Drop the memoized classification of a closed window"""
+        ApplicationDetector._by_xid.pop(xid, None)
+    
+    @staticmethod
+    def _classify(window):
+        """Query application and class names and classify them"""
         app_name = ""
         window_class = ""
         
@@ -33,15 +121,13 @@ class ApplicationDetector:
         except:
             pass
         
-        is_terminal = any(term in app_name or term in window_class 
-                         for term in Config.TERMINAL_KEYWORDS)
+        class_key = (app_name, window_class)
+        is_terminal = ApplicationDetector._by_class.get(class_key)
+        if is_terminal is None:
+            is_terminal = ApplicationDetector.terminal_matcher.match(app_name, window_class) is not None
+            ApplicationDetector._by_class[class_key] = is_terminal
         
-        return {
-            'app_name': app_name,
-            'window_class': window_class,
-            'is_terminal': is_terminal,
-            'window_name': window.get_name() or "Unknown"
-        }
+        return app_name, window_class, is_terminal
 
 
 class WindowPositioner:
@@ -49,30 +135,39 @@ class WindowPositioner:
     
     def __init__(self, verbose=False):
         self.verbose = verbose
+        self._grid_edges = {}
     
     def calculate_position(self, screen, position, factor, current_geometry, 
-                          vertical_only=False, horizontal_only=False):
+                          vertical_only=False, horizontal_only=False, obstacles=None):
         """
         Calculate new window position and size
         
         Args:
-            screen (dict): Screen information with work area
-            position (str): Target position (n, ne, e, se, s, sw, w, nw, center)
+            screen (Screen): Screen with work area
+            position (str): Target position (n, ne, e, se, s, sw, w, nw, center, fill or a grid cell like 3x2:1-2,1)
             factor (float): Scaling factor
             current_geometry (tuple): Current window geometry (x, y, width, height)
             vertical_only (bool): Scale only vertically
             horizontal_only (bool): Scale only horizontally
+            obstacles (list): Geometries of other visible windows (used by 'fill')
             
         Returns:
             tuple: (x, y, width, height, gravity)
         """
         gravity = Wnck.WindowGravity.NORTHWEST
         
+        if position == 'fill':
+            return self._position_fill(screen, current_geometry, obstacles or []) + (gravity,)
+        
+        grid = parse_grid_position(position)
+        if grid is not None:
+            return self._position_grid(screen, grid, current_geometry, horizontal_only, vertical_only) + (gravity,)
+        
         # Work area coordinates (already exclude panels)
-        work_x = screen["x"]
-        work_y = screen["y"] 
-        work_width = screen["width"]
-        work_height = screen["height"]
+        work_x = screen.x
+        work_y = screen.y 
+        work_width = screen.width
+        work_height = screen.height
         
         if self.verbose:
             print(f"calcNewPos: Using work area {work_x}x{work_y} {work_width}x{work_height} "
@@ -117,6 +212,47 @@ class WindowPositioner:
         
         return (x, y, width, height, gravity)
     
+    def _position_grid(self, screen, grid, current_geometry, horizontal_only, vertical_only):
+        """Place window on (a span of) grid cells, cell edges are computed once per work area"""
+        columns, rows, first_column, last_column, first_row, last_row = grid
+        key = (screen.x, screen.y, screen.width, screen.height, columns, rows)
+        edges = self._grid_edges.get(key)
+        if edges is None:
+            # rounded edges, so neighbouring cells touch without gaps on any work area size
+            edges = self._grid_edges[key] = (
+                [screen.x + round(i * screen.width / columns) for i in range(columns + 1)],
+                [screen.y + round(i * screen.height / rows) for i in range(rows + 1)],
+            )
+        x_edges, y_edges = edges
+        
+        x, width = x_edges[first_column - 1], x_edges[last_column] - x_edges[first_column - 1]
+        y, height = y_edges[first_row - 1], y_edges[last_row] - y_edges[first_row - 1]
+        
+        # like the anchors: -o keeps the vertical extent, -e the horizontal one
+        if horizontal_only:
+            y, height = current_geometry[1], current_geometry[3]
+        if vertical_only:
+            x, width = current_geometry[0], current_geometry[2]
+        
+        if self.verbose:
+            print(f"calcNewPos: Grid {columns}x{rows} cells {first_column}-{last_column},{first_row}-{last_row}: "
+                  f"x={x}, y={y}, w={width}, h={height}")
+        return x, y, width, height
+    
+    def _position_fill(self, screen, current_geometry, obstacles):
+        """Grow window into the largest free rectangle of the work area, preferring one it overlaps"""
+        area = screen.work_area
+        with metrics.timer('free_space.search'):
+            free = largest_free_rectangle(area, obstacles, anchor=tuple(current_geometry[:4]))
+        
+        if free is None:
+            # work area fully covered, keep the window where it is
+            free = tuple(current_geometry[:4])
+        
+        if self.verbose:
+            print(f"calcNewPos: Largest free rectangle among {len(obstacles)} windows: {free}")
+        return free
+    
     def _position_north(self, work_x, work_y, work_width, work_height, 
                        calc_width, calc_height, current_geometry, horizontal_only, vertical_only):
         """Position window at top, full width"""
@@ -232,9 +368,338 @@ class WindowPositioner:
         return x, y, width, height
 
 
+class FrameExtentsCache:
+    """
+    Window decoration sizes read from _NET_FRAME_EXTENTS
+    
+    Extents are cached per XID and per WM_CLASS, so a window is queried at
+    most once and new windows of a known class need no X round trip at all.
+    Maximized and fullscreen windows often lose their decorations, their
+    extents are neither taken from nor stored for their class.
+    """
+    
+    def __init__(self, connection=None):
+        self.connection = connection
+        self._atom = None
+        self._by_xid = {}
+        self._by_class = {}
+    
+    def get(self, xid, window_class=None, shared=True):
+        """
+        Get frame extents of a window
+        
+        Args:
+            xid (int): Client window XID
+            window_class (str): WM_CLASS group name used as secondary cache key
+            shared (bool): The window is in its usual state (not maximized or fullscreen),
+                           so the class entry applies to it
+            
+        Returns:
+            tuple: (left, right, top, bottom) or None if the WM does not publish them
+        """
+        extents = self._by_xid.get(xid)
+        if extents is not None:
+            metrics.increment('frame_extents.xid_hits')
+            return extents
+        
+        if window_class and shared:
+            extents = self._by_class.get(window_class)
+            if extents is not None:
+                metrics.increment('frame_extents.class_hits')
+                self._by_xid[xid] = extents
+                return extents
+        
+        extents = self._read(xid)
+        self.store(xid, extents, window_class if shared else None)
+        return extents
+    
+    def __contains__(self, xid):
+        return xid in self._by_xid
+    
+    def store(self, xid, extents, window_class=None):
+        """Cache extents read elsewhere (e.g. in bulk by the XCB backend)"""
+        if extents is not None:
+            self._by_xid[xid] = tuple(extents)
+            if window_class:
+                self._by_class[window_class] = tuple(extents)
+    
+    def invalidate(self, xid):
+        """Forget cached extents of a window (e.g. after it was closed or (un)maximized)"""
+        self._by_xid.pop(xid, None)
+    
+    def _read(self, xid):
+        """Read _NET_FRAME_EXTENTS from the server (one round trip)"""
+        connection = self.connection or XConnection.shared()
+        display = connection.display
+        if self._atom is None:
+            self._atom = display.intern_atom('_NET_FRAME_EXTENTS')
+        
+        metrics.increment('x.round_trips')
+        metrics.increment('frame_extents.reads')
+        try:
+            prop = display.create_resource_object('window', xid).get_full_property(
+                self._atom, X.AnyPropertyType
+            )
+        except error.XError:
+            return None
+        
+        if prop is None or len(prop.value) != 4:
+            return None
+        return tuple(int(value) for value in prop.value)
+
+
+class SizeHintsCache:
+    """
+    Size constraints read once per window from WM_NORMAL_HINTS
+    
+    Terminals and other cell based applications only accept sizes of
+    base + n * increment; knowing these lets us send a size they accept.
+    """
+    
+    def __init__(self, connection=None):
+        self.connection = connection
+        self._by_xid = {}
+    
+    def get(self, xid):
+        """
+        Get size hints of a window
+        
+        Args:
+            xid (int): Client window XID
+            
+        Returns:
+            tuple: (base_w, base_h, inc_w, inc_h, min_w, min_h, max_w, max_h) or None
+        """
+        if xid in self._by_xid:
+            metrics.increment('size_hints.hits')
+            return self._by_xid[xid]
+        
+        hints = self._read(xid)
+        self._by_xid[xid] = hints
+        return hints
+    
+    def __contains__(self, xid):
+        return xid in self._by_xid
+    
+    def store(self, xid, hints):
+        """Cache hints read elsewhere (e.g. in bulk by the XCB backend)"""
+        self._by_xid[xid] = hints
+    
+    def invalidate(self, xid):
+        """Forget cached hints of a window"""
+        self._by_xid.pop(xid, None)
+    
+    def _read(self, xid):
+        """Read WM_NORMAL_HINTS from the server (one round trip)"""
+        connection = self.connection or XConnection.shared()
+        metrics.increment('x.round_trips')
+        metrics.increment('size_hints.reads')
+        try:
+            hints = connection.display.create_resource_object('window', xid).get_wm_normal_hints()
+        except error.XError:
+            return None
+        if hints is None:
+            return None
+        
+        return SizeHintsCache.hints_tuple(
+            hints.flags, (hints.min_width, hints.min_height), (hints.max_width, hints.max_height),
+            (hints.width_inc, hints.height_inc), (hints.base_width, hints.base_height)
+        )
+    
+    @staticmethod
+    def hints_tuple(flags, min_size, max_size, increments, base_size):
+        """
+        Reduce WM_NORMAL_HINTS fields to the tuple returned by get()
+        
+        Args:
+            flags (int): WM_NORMAL_HINTS flags
+            min_size, max_size, increments, base_size (tuple): (width, height) fields
+            
+        Returns:
+            tuple: (base_w, base_h, inc_w, inc_h, min_w, min_h, max_w, max_h)
+        """
+        min_w, min_h = min_size if flags & Xutil.PMinSize else (0, 0)
+        max_w, max_h = max_size if flags & Xutil.PMaxSize else (0, 0)
+        inc_w, inc_h = increments if flags & Xutil.PResizeInc else (1, 1)
+        # ICCCM: base size defaults to the minimum size
+        base_w, base_h = base_size if flags & Xutil.PBaseSize else (min_w, min_h)
+        
+        return (base_w, base_h, max(1, inc_w), max(1, inc_h), min_w, min_h, max_w, max_h)
+
+
 class GeometryCorrector:
     """Handles window decoration corrections"""
     
+    # Shared cache of decoration sizes
+    frame_extents = FrameExtentsCache()
+    
+    # Shared cache of WM_NORMAL_HINTS
+    size_hints = SizeHintsCache()
+    
+    @staticmethod
+    def prime_caches(windows, backend):
+        """
+        Read decorations and size hints of many windows in one pipelined pass
+        
+        Only windows missing from the caches are read, so placing them
+        afterwards needs no further round trips.
+        
+        Args:
+            windows (iterable): WNCK window objects
+            backend: XcbBackend reading the properties
+            
+        Returns:
+            int: Number of windows read
+        """
+        xids = [window.get_xid() for window in windows]
+        missing = [xid for xid in xids
+                   if xid not in GeometryCorrector.frame_extents or xid not in GeometryCorrector.size_hints]
+        for xid, (extents, hints) in backend.read_window_properties(missing).items():
+            GeometryCorrector.frame_extents.store(xid, extents)
+            GeometryCorrector.size_hints.store(
+                xid, SizeHintsCache.hints_tuple(*hints) if hints is not None else None
+            )
+        return len(missing)
+    
+    @staticmethod
+    def has_usual_state(window):
+        """Check that a window is neither maximized nor fullscreen (decorations as usual)"""
+        return not (window.is_maximized() or window.is_fullscreen())
+    
+    @staticmethod
+    def decoration_sizes(window, window_class=None):
+        """
+        Get the decoration sizes around the client window
+        
+        Uses the cached _NET_FRAME_EXTENTS, or compares client and frame
+        geometry if the window manager does not publish them.
+        
+        Args:
+            window: WNCK window object
+            window_class (str): WM_CLASS group name used as secondary cache key
+            
+        Returns:
+            tuple: (left, right, top, bottom)
+        """
+        extents = GeometryCorrector.frame_extents.get(window.get_xid(), window_class,
+                                                      GeometryCorrector.has_usual_state(window))
+        if extents is not None:
+            return extents
+        
+        client_x, client_y, client_width, client_height = window.get_client_window_geometry()
+        frame_x, frame_y, frame_width, frame_height = window.get_geometry()
+        left, top = client_x - frame_x, client_y - frame_y
+        return (left, frame_width - client_width - left, top, frame_height - client_height - top)
+    
+    @staticmethod
+    def fit_size_hints(window, target, position, verbose=False, extents=None):
+        """
+        Round a frame geometry so its client size is one the application accepts
+        
+        WM_NORMAL_HINTS constrain the client window, so the decorations are
+        taken off before rounding and added back afterwards. The window is
+        shrunk to the next valid size; edges anchored by the position
+        (right, bottom, center) are kept in place.
+        
+        Args:
+            window: WNCK window object
+            target (tuple): Frame geometry (x, y, width, height, gravity)
+            position (str): Target position
+            verbose (bool): Enable debug output
+            extents (tuple): Decoration sizes (left, right, top, bottom), looked up if not given
+            
+        Returns:
+            tuple: Adjusted frame geometry (x, y, width, height, gravity)
+        """
+        hints = GeometryCorrector.size_hints.get(window.get_xid())
+        if hints is None:
+            return target
+        if extents is None:
+            extents = GeometryCorrector.decoration_sizes(window)
+        left, right, top, bottom = extents
+        
+        x, y, width, height, gravity = target
+        client_width, client_height = GeometryCorrector.round_to_size_hints(
+            width - left - right, height - top - bottom, hints
+        )
+        new_width, new_height = client_width + left + right, client_height + top + bottom
+        position = grid_anchor(position)
+        
+        if position in ['e', 'ne', 'se']:
+            x += width - new_width
+        elif position == 'center':
+            x += (width - new_width) // 2
+        if position in ['s', 'sw', 'se']:
+            y += height - new_height
+        
+        if verbose and (new_width, new_height) != (width, height):
+            print(f"Size hints: {width}x{height} rounded to {new_width}x{new_height}")
+        
+        return (x, y, new_width, new_height, gravity)
+    
+    @staticmethod
+    def round_to_size_hints(width, height, hints):
+        """
+        Round a size down to base + n * increment within min/max size
+        
+        Args:
+            width, height (int): Requested size
+            hints (tuple): Size hints as returned by SizeHintsCache.get()
+            
+        Returns:
+            tuple: (width, height)
+        """
+        base_w, base_h, inc_w, inc_h, min_w, min_h, max_w, max_h = hints
+        
+        if max_w > 0:
+            width = min(width, max_w)
+        if max_h > 0:
+            height = min(height, max_h)
+        
+        if width > base_w:
+            width = base_w + (width - base_w) // inc_w * inc_w
+        if height > base_h:
+            height = base_h + (height - base_h) // inc_h * inc_h
+        
+        return max(width, min_w), max(height, min_h)
+    
+    @staticmethod
+    def has_resize_increments(window):
+        """True if the window snaps its size to increments larger than a pixel"""
+        hints = GeometryCorrector.size_hints.get(window.get_xid())
+        return hints is not None and (hints[2] > 1 or hints[3] > 1)
+    
+    @staticmethod
+    def calculate_window_corrections(window, app_info, position, verbose=False):
+        """
+        Calculate geometry corrections using cached frame extents
+        
+        Falls back to comparing client and frame geometry if the window
+        manager does not publish _NET_FRAME_EXTENTS.
+        
+        Args:
+            window: WNCK window object
+            app_info (dict): Application analysis results
+            position (str): Target position
+            verbose (bool): Enable debug output
+            
+        Returns:
+            tuple: (correction_x, correction_y)
+        """
+        # applications with resize increments get exact sizes, no fixed fudges
+        if app_info['is_terminal'] and GeometryCorrector.has_resize_increments(window):
+            app_info = dict(app_info, is_terminal=False)
+        
+        extents = GeometryCorrector.frame_extents.get(window.get_xid(), app_info['window_class'],
+                                                      GeometryCorrector.has_usual_state(window))
+        if extents is None:
+            return GeometryCorrector.calculate_corrections(
+                window.get_client_window_geometry(), window.get_geometry(), app_info, position, verbose
+            )
+        
+        left, right, top, bottom = extents
+        return GeometryCorrector._add_application_corrections(left, top, app_info, position, verbose)
+    
     @staticmethod
     def calculate_corrections(geometry_raw, current_geometry, app_info, position, verbose=False):
         """
@@ -254,6 +719,13 @@ class GeometryCorrector:
         correction_x = geometry_raw[0] - current_geometry[0]
         correction_y = geometry_raw[1] - current_geometry[1]
         
+        return GeometryCorrector._add_application_corrections(
+            correction_x, correction_y, app_info, position, verbose
+        )
+    
+    @staticmethod
+    def _add_application_corrections(correction_x, correction_y, app_info, position, verbose=False):
+        """Add app-specific corrections to the decoration corrections"""
         # Apply terminal-specific corrections
         if app_info['is_terminal']:
             terminal_correction_x, terminal_correction_y = GeometryCorrector._get_terminal_corrections(position)
@@ -282,6 +754,7 @@ class GeometryCorrector:
         """
         correction_x = 0
         correction_y = 0
+        position = grid_anchor(position)
         
         # For bottom-aligned positions, terminals often need adjustment
         if position in ['s', 'sw', 'se']:
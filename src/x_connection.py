@@ -0,0 +1,109 @@
+"""
+Shared X display connection
+"""
+
+import atexit
+from Xlib import display
+from Xlib.ext import randr
+
+from .metrics import metrics
+
+
+class XConnection:
+    """
+    Lazily opened python-xlib display connection shared within a process
+    
+    Screen detection, cursor control and the gesture reader all use the
+    same connection instead of opening a new socket per operation.
+    """
+    
+    _shared = None
+    
+    def __init__(self, display_name=None, verbose=False):
+        self.display_name = display_name
+        self.verbose = verbose
+        self._display = None
+    
+    @classmethod
+    def shared(cls, verbose=False):
+        """
+        Get the process-wide connection, creating it on first use
+        
+        Returns:
+            XConnection: Shared connection manager
+        """
+        if cls._shared is None:
+            cls._shared = cls(verbose=verbose)
+            atexit.register(cls._shared.close)
+        return cls._shared
+    
+    @property
+    def display(self):
+        """Xlib display, opened on first access"""
+        if self._display is None:
+            self._display = display.Display(self.display_name)
+            metrics.increment('x.connections_opened')
+            if self.verbose:
+                print(f"Opened X connection to {self._display.get_display_name()}")
+        return self._display
+    
+    @property
+    def is_open(self):
+        """True if the underlying display has been opened and not closed"""
+        return self._display is not None
+    
+    @property
+    def root(self):
+        """Root window of the default screen"""
+        return self.display.screen().root
+    
+    def select_screen_changes(self):
+        """
+        Request RandR ScreenChangeNotify events on the root window
+        
+        Returns:
+            int: Event type of ScreenChangeNotify, or None if RandR is not available
+        """
+        if not self.display.has_extension('RANDR'):
+            if self.verbose:
+                print("RandR extension not available, screen changes are not followed")
+            return None
+        # python-xlib only decodes the RandR events for servers speaking RandR 1.5
+        event_type = getattr(self.display.extension_event, 'ScreenChangeNotify', None)
+        if event_type is not None:
+            self.root.xrandr_select_input(randr.RRScreenChangeNotifyMask)
+            self.flush()
+        return event_type
+    
+    def fileno(self):
+        """File descriptor of the connection, for use in event loops"""
+        return self.display.fileno()
+    
+    def flush(self):
+        """Send all queued requests without waiting for a reply"""
+        if self._display is not None:
+            self._display.flush()
+    
+    def sync(self):
+        """Flush and wait until the server processed all requests (one round trip)"""
+        self.display.sync()
+        metrics.increment('x.round_trips')
+    
+    def close(self):
+        """Close the connection if it is open"""
+        if self._display is None:
+            return
+        try:
+            self._display.close()
+        finally:
+            self._display = None
+            metrics.increment('x.connections_closed')
+            if self.verbose:
+                print("Closed X connection")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
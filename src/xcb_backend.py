@@ -0,0 +1,208 @@
+"""
+Optional pipelined XCB backend (xcffib) for bulk window operations
+"""
+
+import atexit
+import struct
+
+try:
+    import xcffib
+    import xcffib.xproto
+except ImportError:
+    xcffib = None
+
+from .metrics import metrics
+
+
+# _NET_MOVERESIZE_WINDOW: x, y, width and height present, source indication 2 (pager)
+MOVERESIZE_FLAGS = (1 << 8) | (1 << 9) | (1 << 10) | (1 << 11) | (2 << 12)
+
+# _NET_WM_STATE action
+STATE_REMOVE = 0
+
+# WM_NORMAL_HINTS is 18 CARD32 values (ICCCM 4.1.2.3)
+NORMAL_HINTS_LENGTH = 18
+
+ATOM_NAMES = ['_NET_FRAME_EXTENTS', '_NET_MOVERESIZE_WINDOW', '_NET_WM_STATE',
+              '_NET_WM_STATE_MAXIMIZED_VERT', '_NET_WM_STATE_MAXIMIZED_HORZ']
+
+
+def xcb_available():
+    """True if xcffib is installed"""
+    return xcffib is not None
+
+
+def parse_normal_hints(values):
+    """
+    Split raw WM_NORMAL_HINTS values into the fields of SizeHintsCache.hints_tuple()
+    
+    Args:
+        values (tuple): CARD32 values of the property
+    
+    Returns:
+        tuple: (flags, min_size, max_size, increments, base_size) or None if too short
+    """
+    if len(values) < 11:
+        return None
+    # pre-ICCCM clients write 15 values without base size and gravity
+    base_size = (values[15], values[16]) if len(values) >= 17 else (0, 0)
+    return (values[0], (values[5], values[6]), (values[7], values[8]), (values[9], values[10]), base_size)
+
+
+class XcbBackend:
+    """
+    Window property reads and geometry requests pipelined over one xcffib connection
+    
+    Every request of an operation is written before the first reply is
+    read, so reading or configuring N windows costs about one round trip
+    instead of N. Errors are collected per window and checked at the end.
+    """
+    
+    _shared = None
+    
+    def __init__(self, display_name=None, verbose=False):
+        """
+        Args:
+            display_name (str): X display, defaults to $DISPLAY
+            verbose (bool): Enable debug output
+        """
+        if xcffib is None:
+            raise RuntimeError("xcffib is not installed")
+        self.verbose = verbose
+        self.connection = xcffib.connect(display=display_name)
+        self.root = self.connection.get_setup().roots[self.connection.pref_screen].root
+        self._atoms = {}
+        metrics.increment('x.connections_opened')
+    
+    @classmethod
+    def shared(cls, verbose=False):
+        """
+        Get the process-wide backend, connecting on first use
+        
+        Returns:
+            XcbBackend: Shared backend
+        """
+        if cls._shared is None:
+            cls._shared = cls(verbose=verbose)
+            atexit.register(cls._shared.close)
+        return cls._shared
+    
+    def atom(self, name):
+        """Get an atom interned by intern_atoms()"""
+        return self._atoms[name]
+    
+    def intern_atoms(self, names=ATOM_NAMES):
+        """Intern all missing atoms with one round trip"""
+        cookies = [(name, self.connection.core.InternAtom(False, len(name), name))
+                   for name in names if name not in self._atoms]
+        if not cookies:
+            return
+        for name, cookie in cookies:
+            self._atoms[name] = cookie.reply().atom
+        metrics.increment('x.round_trips')
+    
+    def read_window_properties(self, xids):
+        """
+        Read _NET_FRAME_EXTENTS and WM_NORMAL_HINTS of many windows
+        
+        Args:
+            xids (list): Client window XIDs
+        
+        Returns:
+            dict: XID -> (extents, hints) with extents (left, right, top, bottom) and
+                  hints as returned by parse_normal_hints(), each None if not set
+        """
+        xids = list(xids)
+        if not xids:
+            return {}
+        self.intern_atoms()
+        core = self.connection.core
+        extents_atom = self.atom('_NET_FRAME_EXTENTS')
+        
+        cookies = [(xid,
+                    core.GetProperty(False, xid, extents_atom, xcffib.xproto.Atom.CARDINAL, 0, 4),
+                    core.GetProperty(False, xid, xcffib.xproto.Atom.WM_NORMAL_HINTS,
+                                     xcffib.xproto.Atom.WM_SIZE_HINTS, 0, NORMAL_HINTS_LENGTH))
+                   for xid in xids]
+        
+        properties = {}
+        for xid, extents_cookie, hints_cookie in cookies:
+            try:
+                extents = self._cardinals(extents_cookie.reply())
+                hints = self._cardinals(hints_cookie.reply())
+            except xcffib.ProtocolException:
+                # window is gone
+                properties[xid] = (None, None)
+                continue
+            properties[xid] = (extents if extents is not None and len(extents) == 4 else None,
+                               parse_normal_hints(hints) if hints is not None else None)
+        
+        metrics.increment('x.round_trips')
+        metrics.increment('xcb.property_reads', len(xids))
+        return properties
+    
+    def move_resize(self, requests):
+        """
+        Send geometries to the window manager and check for errors once
+        
+        Args:
+            requests (list): (xid, target, unmaximize) with target (x, y, width, height, gravity)
+        
+        Returns:
+            int: Number of requests the server rejected
+        """
+        if not requests:
+            return 0
+        self.intern_atoms()
+        
+        cookies = []
+        for xid, target, unmaximize in requests:
+            if unmaximize:
+                cookies.append(self._send_client_message(xid, '_NET_WM_STATE', [
+                    STATE_REMOVE, self.atom('_NET_WM_STATE_MAXIMIZED_VERT'),
+                    self.atom('_NET_WM_STATE_MAXIMIZED_HORZ'), 2, 0
+                ]))
+            x, y, width, height, gravity = target
+            cookies.append(self._send_client_message(xid, '_NET_MOVERESIZE_WINDOW', [
+                int(gravity) | MOVERESIZE_FLAGS, int(x), int(y), int(width), int(height)
+            ]))
+        self.connection.flush()
+        
+        failures = 0
+        for cookie in cookies:
+            try:
+                cookie.check()
+            except xcffib.ProtocolException as e:
+                failures += 1
+                if self.verbose:
+                    print(f"XCB: request failed: {e}")
+        
+        metrics.increment('x.round_trips')
+        metrics.increment('xcb.configures', len(requests))
+        return failures
+    
+    def _send_client_message(self, xid, message_type, data):
+        """Send a 32 bit client message about a window to the root window (checked)"""
+        event = xcffib.xproto.ClientMessageEvent.synthetic(
+            format=32, window=xid, type=self.atom(message_type),
+            data=xcffib.xproto.ClientMessageData.synthetic(data, "I" * 5)
+        )
+        mask = xcffib.xproto.EventMask.SubstructureNotify | xcffib.xproto.EventMask.SubstructureRedirect
+        return self.connection.core.SendEventChecked(False, self.root, mask, event.pack())
+    
+    @staticmethod
+    def _cardinals(reply):
+        """Values of a 32 bit property reply, None if the property is not set"""
+        if reply.format != 32 or reply.value_len == 0:
+            return None
+        return struct.unpack(f'={reply.value_len}I', reply.value.buf()[:4 * reply.value_len])
+    
+    def close(self):
+        """Disconnect if connected"""
+        if self.connection is None:
+            return
+        try:
+            self.connection.disconnect()
+        finally:
+            self.connection = None
+            metrics.increment('x.connections_closed')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+XFCE Window Tiling daemon
+
+Grabs the tiling shortcuts (see Config.SHORTCUTS) and tiles in-process,
+replacing the xfce4 custom commands that spawn a process per keypress.
+
+Usage:
+    python tiled.py [--params "-s --with-cursor"] [--rules file] [--no-memory] [-v]
+    python tiled.py --send "--match class=firefox --all -p e"
+"""
+
+import sys
+from filelock import FileLock, Timeout
+
+from main import XFCETilingApp
+from src.batch import GeometryBatch
+from src.config import Config, parse_daemon_arguments
+from src.control import send_commands
+from src.daemon import TilingDaemon
+from src.placement_memory import PlacementMemory
+from src.rules import load_rules
+from src.utils import get_runtime_path
+
+
+def main():
+    """Daemon entry point"""
+    args = parse_daemon_arguments()
+    
+    if args.send is not None:
+        try:
+            return send_commands(get_runtime_path(Config.CONTROL_SOCKET), [args.send])[0]
+        except (OSError, IndexError, ValueError) as e:
+            print(f"Error: could not reach the tiling daemon: {e}")
+            return 1
+    
+    lock = FileLock(get_runtime_path(Config.DAEMON_LOCK_FILE), timeout=0.3)
+    try:
+        lock.acquire()
+    except Timeout:
+        print("Error: tiling daemon is already running")
+        return 1
+    
+    try:
+        GeometryBatch.use_backend(args.backend, verbose=args.verbose)
+        rules = load_rules(args.rules_file, verbose=args.verbose)
+        memory = None
+        if args.use_memory:
+            memory = PlacementMemory(verbose=args.verbose)
+            memory.load()
+        daemon = TilingDaemon(XFCETilingApp(), params=args.params, rules=rules, memory=memory,
+                              verbose=args.verbose)
+        return daemon.run()
+    finally:
+        lock.release()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
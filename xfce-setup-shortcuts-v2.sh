@@ -11,6 +11,12 @@ BASE=`dirname "$(readlink -f "$0")"`
 # Use the new modular main.py entry point
 MAIN_SCRIPT="${BASE}/main.py"
 
+# With --daemon the bindings are only removed: tiled.py grabs them itself
+DAEMON_MODE=0
+if [ "$1" = "--daemon" ]; then
+    DAEMON_MODE=1
+fi
+
 # Fallback to legacy pywin.py if main.py doesn't exist
 if [ ! -f "$MAIN_SCRIPT" ]; then
     MAIN_SCRIPT="${BASE}/pywin.py"
@@ -39,6 +45,7 @@ done<<'EOF'
 /commands/custom/<Alt>KP_7
 /commands/custom/<Alt>KP_8
 /commands/custom/<Alt>KP_9
+/commands/custom/<Alt>KP_0
 /commands/custom/<Ctrl><Super><Alt>KP_1
 /commands/custom/<Ctrl><Super><Alt>KP_3
 /commands/custom/<Ctrl><Super><Alt>KP_5
@@ -51,6 +58,14 @@ done<<'EOF'
 /commands/custom/<Super><Alt>KP_9
 EOF
 
+if [ "$DAEMON_MODE" = "1" ]; then
+    echo
+    echo "Custom commands removed. Start the tiling daemon to grab the shortcuts:"
+    echo "   python3 ${BASE}/tiled.py --params \"${PARAMS}\" &"
+    echo "Add this command to Session and Startup > Application Autostart to keep it running."
+    exit 0
+fi
+
 echo
 echo "Setting up new keyboard shortcuts..."
 
@@ -64,6 +79,7 @@ xfconf-query -c xfce4-keyboard-shortcuts -p "/commands/custom/<Alt>KP_6" -s "pyt
 xfconf-query -c xfce4-keyboard-shortcuts -p "/commands/custom/<Alt>KP_7" -s "python3 ${MAIN_SCRIPT} ${PARAMS} -p nw" --create -t string
 xfconf-query -c xfce4-keyboard-shortcuts -p "/commands/custom/<Alt>KP_8" -s "python3 ${MAIN_SCRIPT} ${PARAMS} -p n" --create -t string
 xfconf-query -c xfce4-keyboard-shortcuts -p "/commands/custom/<Alt>KP_9" -s "python3 ${MAIN_SCRIPT} ${PARAMS} -p ne" --create -t string
+xfconf-query -c xfce4-keyboard-shortcuts -p "/commands/custom/<Alt>KP_0" -s "python3 ${MAIN_SCRIPT} ${PARAMS} -p fill" --create -t string
 
 # Horizontal-only scaling (Ctrl+Super+Alt + Numpad)
 xfconf-query -c xfce4-keyboard-shortcuts -p "/commands/custom/<Ctrl><Super><Alt>KP_1" -s "python3 ${MAIN_SCRIPT} ${PARAMS} -p sw -o" --create -t string
@@ -86,6 +102,7 @@ echo "📋 Shortcut Layout (Numpad):"
 echo "   7 (NW)  8 (N)   9 (NE)"
 echo "   4 (W)   5 (C)   6 (E) "
 echo "   1 (SW)  2 (S)   3 (SE)"
+echo "   0 (fill free space)"
 echo
 echo "🎮 Key Combinations:"
 echo "   Alt + Numpad           = Basic positioning"